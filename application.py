@@ -19,6 +19,8 @@ Notes
 - The `authorize` function is used as a callback to dynamically update the application layout
   based on the user's authorization status.
 - The application layout is updated dynamically without page reloads, providing a seamless user experience.
+- There is no polling interval in the layout; browsers learn about dataset updates through the
+  server-sent event stream registered by `components.utils.live_update`.
 - The index HTML template includes JavaScript code to adjust the height of the application layout
   dynamically based on the window size.  You can find accomp. javascript over in assets/js
 - Error handling for database connections, user authorization, and server initialization is essential
@@ -32,6 +34,13 @@ configparser : Parses configuration files to read data server configuration sett
 components.main_container : Provides the layout for the main content container of the Dash application.
 components.utils.login : Contains functions for user authorization and authentication.
 components.utils.constants : Contains application-specific constants such as application_title and repo_title.
+components.utils.live_update : Pushes dataset version changes to connected browsers.
+components.utils.metrics : Times every callback and figure request and serves the Prometheus `/metrics` page.
+components.utils.profiling : Profiles slow figure builds on request and lists them on an admin page.
+components.utils.background : The background callback manager that builds heavy figures outside the web worker.
+components.utils.figure_cache : Caches built figures and warms the cache with common views when a worker starts.
+components.utils.figure_endpoint : Serves figure JSON with strong ETags so browsers and proxies can revalidate.
+components.content_display.display_container : Provides `figure_for` and `resolve_view`, used by the figure cache warm-up and the figure endpoint.
 os : Provides access to operating system functionalities, used for environment variable detection.
 
 See Also
@@ -74,6 +83,13 @@ import secrets
 import configparser
 import components.main_container as mc
 import components.utils.login as login
+import components.utils.live_update as live_update
+import components.utils.metrics as metrics
+import components.utils.profiling as profiling
+import components.utils.background as background
+import components.utils.figure_cache as figure_cache
+import components.utils.figure_endpoint as figure_endpoint
+import components.content_display.display_container as display_container
 from components.utils.constants import application_title, repo_title
 
 # Read data server configuration
@@ -81,6 +97,9 @@ cfg = configparser.ConfigParser()
 cfg.read('/etc/rieee/rieee.conf')
 cfg.read('rieee.conf')
 
+# Every route of this application lives under this prefix
+url_prefix = cfg.get('app', 'url_prefix', fallback='/')
+
 # CSS Styles
 external_stylesheets = {
     'datadash_template_css' : [
@@ -94,7 +113,9 @@ app = dash.Dash(
     external_stylesheets = external_stylesheets['datadash_template_css'],
     title = application_title,
     update_title = None,
-    url_base_pathname=cfg.get('app', 'url_prefix', fallback='/'),
+    url_base_pathname=url_prefix,
+    # Heavy figures are built by background callbacks (components/utils/background.py)
+    background_callback_manager=background.manager,
     # / DEVELOPER NOTE
     # /
     # /  We have to supress callback exceptions
@@ -118,13 +139,9 @@ app.layout = dash.html.Div(
         dash.dcc.Store(data = secrets.token_hex(), id='memory'),
         # Secure container
         dash.html.Div(id='secure-div'),
-        # Interval for live update data
-        dash.dcc.Interval(
-            id='interval-component',
-            # in milliseconds
-            interval=1000, # (1 second)
-            n_intervals=0
-        )
+        # NOTE: Live dataset updates are pushed to the browser over a
+        # server-sent event stream (components/utils/live_update.py and
+        # assets/js/live_update.js) instead of a polling dcc.Interval.
     ],
     id='main-content'  # Ensure this matches the ID used in js/adjust_height.js
 )
@@ -180,7 +197,7 @@ def authorize(pathname, hash):
     # Application Authorization Token (for preventing memorization)
     authorizationToken = secrets.token_hex()
 
-    if login.userIsAuthorized() or LOCAL_DEVELOPMENT:
+    if LOCAL_DEVELOPMENT or login.userIsAuthorized():
         # If the user is authorized, or this is for local development:
         return mc.layout, authorizationToken
     else :
@@ -225,6 +242,30 @@ app.index_string = '''
 # Corresponds to application:server (thisScript:app.server) in the docker file
 server = app.server
 
+# Server-sent dataset version events (replaces interval polling)
+live_update.register_routes(server, url_prefix)
+
+# Callback and figure timing, payload size and exception counters (Prometheus /metrics)
+metrics.register_routes(server, url_prefix)
+
+def adminIsSignedIn():
+    # Admin pages are open during local development only
+    return LOCAL_DEVELOPMENT or login.userIsAdmin()
+
+# Captured profiles of slow figure builds (admin only)
+profiling.register_routes(server, url_prefix, adminIsSignedIn)
+
+def userIsSignedIn():
+    # Figures are served to the same users as the application (checked
+    # once per user every few minutes, not on every figure)
+    return LOCAL_DEVELOPMENT or login.userIsAuthorizedCached()
+
+# Cacheable figure JSON (the browser fetches every figure from here)
+figure_endpoint.register_routes(server, url_prefix, userIsSignedIn, display_container.resolve_view)
+
+# Build the most common figures in the background as each worker starts
+figure_cache.start_warmup(display_container.figure_for)
+
 # Main script execution (for local development)
 if __name__ == '__main__' and LOCAL_DEVELOPMENT:
     # True for hot reloading (leave True)
@@ -0,0 +1,65 @@
+// Control panel logic evaluated in the browser (see components/control_panel/controls_container.py).
+
+// Number of settle_state calls so far; only the latest one may write the control state
+let settleCalls = 0;
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    controls: {
+        // Navigation option -> hidden state of every control in the visibility table,
+        // then the political geography selector's multi flag and value
+        apply_visibility: function (nav_opt, table) {
+            const hidden = table.visible_for.map(function (views) {
+                return views.indexOf(nav_opt) === -1;
+            });
+            const nation = table.nation_selection[nav_opt] || [false, []];
+            return hidden.concat(nation);
+        },
+
+        // Navigation option, fuel type and source -> the source dropdown's hidden state,
+        // options and value (components/control_panel/controls/source_dropdown.py)
+        update_source: function (nav_opt, fuel_type, value, table) {
+            const sheet = fuel_type === 'totals' ? 'totals' : 'fuels';
+            const options = table.options[sheet][
+                table.no_stat_difference_for.indexOf(nav_opt) === -1 ? 'all' : 'no_stat_difference'
+            ];
+
+            if (table.shown_for.indexOf(nav_opt) === -1) {
+                return [true, options, value];
+            }
+
+            if (nav_opt !== 'source-time-series' && value === 'Stat Difference (Supplied - Consumed)') {
+                return [false, options, 'Fossil Fuel Energy (Supplied)'];
+            }
+
+            // If coming from a different fuel type, change to the best match source
+            const remap = table.remap[nav_opt === 'type-ternary' ? 'solids' : sheet];
+            return [false, options, value in remap ? remap[value] : value];
+        },
+
+        // Control values -> the control state, once no control has changed for settle_ms
+        // and only if a value differs from the current state
+        settle_state: function (nav_opt, theme, source, fuel_type, nation, source_a, source_b,
+                                grouping, table, current) {
+            const state = {
+                nav_opt: nav_opt, theme: theme, source: source, fuel_type: fuel_type,
+                nation: nation, source_a: source_a, source_b: source_b, grouping: grouping
+            };
+            const call = ++settleCalls;
+
+            // First render of the page: nothing to wait for
+            if (!current) {
+                return state;
+            }
+
+            return new Promise(function (resolve) {
+                setTimeout(function () {
+                    if (call !== settleCalls || JSON.stringify(state) === JSON.stringify(current)) {
+                        resolve(window.dash_clientside.no_update);
+                    } else {
+                        resolve(state);
+                    }
+                }, table.settle_ms);
+            });
+        }
+    }
+});
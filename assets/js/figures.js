@@ -0,0 +1,56 @@
+// Fetches figures from the figure endpoint (see components/utils/figure_endpoint.py).
+// Figure responses carry a strong ETag, so a figure the browser has already downloaded
+// is revalidated with a 304 instead of being downloaded again.
+
+// Typed array constructors of the encoded array types (components/utils/typed_arrays.py)
+const typedArrays = {
+    i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+    i4: Int32Array, u4: Uint32Array, f4: Float32Array, f8: Float64Array
+};
+
+// Replaces every {dtype, bdata} object in a parsed figure with its typed array, which every
+// version of plotly.js accepts (the dashboard's does not read the encoding itself)
+function decodeTypedArrays(value) {
+    if (Array.isArray(value)) {
+        for (let i = 0; i < value.length; i++) {
+            value[i] = decodeTypedArrays(value[i]);
+        }
+        return value;
+    }
+    if (value === null || typeof value !== 'object') {
+        return value;
+    }
+    if (typeof value.bdata === 'string' && value.dtype in typedArrays) {
+        const text = atob(value.bdata);
+        const bytes = new Uint8Array(text.length);
+        for (let i = 0; i < text.length; i++) {
+            bytes[i] = text.charCodeAt(i);
+        }
+        return new typedArrays[value.dtype](bytes.buffer);
+    }
+    for (const key in value) {
+        value[key] = decodeTypedArrays(value[key]);
+    }
+    return value;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    figures: {
+        fetch_figure: async function (path) {
+            if (!path) {
+                return window.dash_clientside.no_update;
+            }
+
+            // Ask for typed arrays: this script can decode them
+            const config = JSON.parse(document.getElementById('_dash-config').textContent);
+            const response = await fetch(config.requests_pathname_prefix + path + '&typed=1', {
+                credentials: 'same-origin'
+            });
+
+            if (!response.ok) {
+                throw new Error('Figure request failed: ' + response.status);
+            }
+            return decodeTypedArrays(await response.json());
+        }
+    }
+});
@@ -0,0 +1,24 @@
+// Listens to the server's dataset event stream (see components/utils/live_update.py)
+// and reloads the page when the dataset version changes.  The first version received
+// is the one this page was built against; the server only ever sends it again after a
+// reconnect, so an unchanged dataset costs nothing but the occasional reconnect.
+function listenForDatasetUpdates() {
+    if (!window.EventSource) {
+        return;
+    }
+
+    const config = JSON.parse(document.getElementById('_dash-config').textContent);
+    const source = new EventSource(config.requests_pathname_prefix + '_dataset-events');
+    let loadedVersion = null;
+
+    source.addEventListener('dataset-version', function (event) {
+        if (loadedVersion === null) {
+            loadedVersion = event.data;
+        } else if (event.data !== loadedVersion) {
+            source.close();
+            window.location.reload();
+        }
+    });
+}
+
+window.addEventListener('load', listenForDatasetUpdates);
@@ -0,0 +1,30 @@
+// Applies the theme in the browser (see components/control_panel/controls/theme_toggle.py
+// and components/control_panel/panel_container.py).  Only the content rebuilt with the new
+// theme (figures and the data table) still goes to the server, through the callbacks that
+// take the theme toggle's className as an input.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    theme: {
+        // Theme toggle clicks -> theme toggle, button label, main container, loading
+        // area styles, and the className of every dropdown (themed_dropdowns)
+        apply_theme: function (n_clicks) {
+            const theme = (n_clicks || 0) % 2 === 0 ? 'light' : 'dark';
+            const label = {
+                type: 'P',
+                namespace: 'dash_html_components',
+                props: {children: theme === 'light' ? 'Switch to Dark Theme' : 'Switch to Light Theme'}
+            };
+            const background = {'background-color': theme === 'light' ? 'white' : 'black'};
+            const dropdown = 'dropdown_' + theme;
+            return [
+                theme, label, theme, background, background,
+                dropdown, dropdown, dropdown, dropdown, dropdown, dropdown, dropdown
+            ];
+        },
+
+        // Theme and panel toggle clicks -> control panel and panel toggle classes
+        panel_class: function (theme, panel_toggle_clicks) {
+            const className = panel_toggle_clicks % 2 === 1 ? theme + ' collapsed' : theme;
+            return [className, className];
+        }
+    }
+});
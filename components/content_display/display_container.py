@@ -5,10 +5,23 @@ Plotly graphs, markdown documents, and other interactive elements into the user
 
 Functions
 ---------
-update_container(nav_opt, theme, source, fuel_type, nation, source_a, source_b, grouping)
+update_container(state)
     Updates the content of the display container based on user-selected navigation options,
     applying filters and themes to dynamically generate and display content.
 
+figure_for(nav_opt, theme, source, fuel_type, nation, source_a, source_b, grouping)
+    Returns the figure of a plotly navigation option, from the figure cache when possible.
+
+resolve_view(nav_opt, controls) -> (callable, list)
+    Returns the builder of a plotly view and its arguments, taken from the control values.
+
+figure_content(loading_id, nav_opt, controls, style, graph_config=None)
+    Returns the content of a plotly view: a graph the browser fills from the figure endpoint.
+
+update_heavy_figure(request)
+    Builds the figure of a heavy view (source sunburst, type ternary, source ternary) in a
+    background process, cancelled when the navigation option changes.
+
 Attributes
 ----------
 layout : dash.html.Div
@@ -23,6 +36,12 @@ config : dict
 sunburst_config : dict
     Special configuration for sunburst graphs to adjust visual settings and interaction behaviors.
 
+figure_builders : dict
+    Maps each plotly navigation option to its builder and the controls the builder takes.
+
+heavy_views : list of str
+    The navigation options built by the background callback.
+
 See Also
 --------
 components.figures.* : Modules that generate specific Plotly graphs for the dashboard.
@@ -32,6 +51,20 @@ Notes
 -----
 This module plays a critical role in rendering the visual and textual content of the dashboard.
 It responds to user inputs from various controls and toggles, updating the display in real time.
+It renders from the control panel's settled control state (`controls_container.state_id`),
+so one user action renders the display once, with the final control values.
+
+Plotly figures are not sent in callback responses.  The display container holds the figure's
+path on the figure endpoint (`components.utils.figure_endpoint`), and the browser fetches it,
+so a figure it already has is revalidated (304) instead of downloaded again.  The heavy views
+are first built by a background callback (see `components.utils.background`), so a slow build
+does not occupy a web worker; the browser polls until the figure's path is ready.
+
+Every figure is built by `figure_for`, through `components.utils.figure_cache`: recently built
+figures are reused, and identical concurrent requests (in any worker) share one build.  When
+the process pool is enabled, the views it lists that are built in the worker (not the heavy
+views) are built there (see `components.utils.process_pool`), so concurrent builds in one
+worker run in parallel.
 
 Examples
 --------
@@ -68,6 +101,12 @@ from components.figures.source_timeseries import source_timeseries
 from components.figures.source_ternary import source_ternary
 from components.figures.type_ternary import type_ternary
 from components.tables.browse import browse_table
+from components.utils import profiling
+from components.utils import background
+import components.control_panel.controls_container as controls_container
+from components.utils import figure_cache
+from components.utils import figure_endpoint
+from components.utils import process_pool
 from dash import Patch
 import numpy as np
 
@@ -98,26 +137,85 @@ sunburst_config = {
     }
     }
 
-# CALLBACKS (2)
+# The builder of each plotly view, and the controls it takes (in order)
+figure_builders = {
+    'carbon-atlas' : (carbon_atlas, ['source', 'fuel_type', 'theme']),
+    'political-geography-sunburst' : (country_sunburst, ['nation', 'fuel_type', 'theme']),
+    'political-geography-time-series' : (country_timeseries, ['fuel_type', 'nation', 'theme']),
+    'source-time-series' : (source_timeseries, ['source', 'fuel_type', 'nation', 'theme']),
+    'source-sunburst' : (source_sunburst, ['source', 'fuel_type', 'theme']),
+    'source-ternary' : (source_ternary, ['source_a', 'source_b', 'fuel_type', 'grouping', 'theme']),
+    'type-ternary' : (type_ternary, ['source', 'grouping', 'theme']),
+}
+
+# These views take long enough to build that they are built by a background
+# callback, in another process, instead of in the web worker
+heavy_views = ['source-sunburst', 'type-ternary', 'source-ternary']
+
+# IDs of the components a plotly view is rendered into
+figure_graph_id = "display-figure"
+figure_path_id = "display-figure-path"
+heavy_request_id = "heavy-figure-request"
+
+# Shown (transparent, no axes) until the figure arrives
+blank_figure = {'layout': {
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'plot_bgcolor': 'rgba(0,0,0,0)',
+    'xaxis': {'visible': False},
+    'yaxis': {'visible': False},
+}}
+
+def resolve_view(nav_opt, controls):
+    """
+    Returns the builder of a plotly view and its arguments, taken from the control values.
+    Raises KeyError for unknown views or missing controls.
+    """
+    builder, names = figure_builders[nav_opt]
+    return builder, [controls[name] for name in names]
+
+def figure_content(loading_id, nav_opt, controls, style, graph_config=None):
+    """
+    Returns the content of a plotly view: a graph that the browser fills by fetching the
+    figure from the figure endpoint.  Heavy views are built by `update_heavy_figure` first,
+    which then provides the figure's path.
+    """
+    controls = {name: controls[name] for name in figure_builders[nav_opt][1]}
+
+    if nav_opt in heavy_views:
+        path = None
+        build = [dash.dcc.Store(id = heavy_request_id, data = dict(controls, nav_opt = nav_opt))]
+    else:
+        path = figure_endpoint.figure_path(nav_opt, controls)
+        build = []
+
+    return dash.dcc.Loading(
+        id = loading_id,
+        children = build + [
+            dash.dcc.Store(id = figure_path_id, data = path),
+            dash.dcc.Graph(
+                id = figure_graph_id,
+                figure = blank_figure,
+                className = 'plotly-figure',
+                style = style,
+                **({'config': graph_config} if graph_config else {})),
+        ]
+    )
+
+# CALLBACKS (3)
 # The first callback decides what content should be in the display container.
 @dash.callback(
     dash.dependencies.Output(component_id, 'children'),
-    dash.dependencies.Input('navigation-dropdown-controler', 'value'),
-    dash.dependencies.Input('theme_toggle', 'className'),
-    dash.dependencies.Input('source-dropdown-controler', 'value'),
-    dash.dependencies.Input('fuel-type-dropdown-controler', 'value'),
-    dash.dependencies.Input('nation-dropdown-controler', 'value'),
-    dash.dependencies.Input('source-a-dropdown-controler', 'value'),
-    dash.dependencies.Input('source-b-dropdown-controler', 'value'),
-    dash.dependencies.Input('nation-group-dropdown-controler', 'value'),
+    dash.dependencies.Input(controls_container.state_id, 'data'),
 )
-def update_container(nav_opt, theme, source, fuel_type, nation, source_a, source_b, grouping):
+def update_container(state):
     """
     Dynamically updates the content within the display container based on user interactions
     with the dashboard's navigation controls.
 
     Parameters
     ----------
+    state : dict
+        The settled control state (see `controls_container.state_id`), with the following keys.
     nav_opt : str
         The navigation option selected by the user, which determines the type of content
         to be displayed (e.g., "about", "methodology", "download", or various data visualizations).
@@ -151,12 +249,23 @@ def update_container(nav_opt, theme, source, fuel_type, nation, source_a, source
     called to generate the content. Styling and specific configurations are applied to ensure
     the content aligns with the selected theme and user preferences.
 
+    Plotly views are not built here: the browser fetches them from the figure endpoint.
+
     Examples
     --------
-    >>> update_container("about", "light", None, None, None, None, None, None)
+    >>> update_container({"nav_opt": "about", "theme": "light", ...})
     Returns a Markdown component displaying the about page content with light theme styling.
     """
 
+    # Not settled yet
+    if not state :
+        return dash.no_update
+
+    nav_opt, theme, source, fuel_type, nation, source_a, source_b, grouping = (
+        state.get(key) for key in
+        ['nav_opt', 'theme', 'source', 'fuel_type', 'nation', 'source_a', 'source_b', 'grouping']
+    )
+
     
     # for displaying all non-plotly figure navigation options
     if nav_opt == "about" :
@@ -184,94 +293,54 @@ def update_container(nav_opt, theme, source, fuel_type, nation, source_a, source
     
     else :
 
+        controls = dict(
+            theme = theme, source = source, fuel_type = fuel_type, nation = nation,
+            source_a = source_a, source_b = source_b, grouping = grouping,
+        )
+
         if nav_opt == 'carbon-atlas' :
 
             # Carbon Atlas
-            return dash.dcc.Loading(
-                id = "carbon-atlas-loading",
-                children= dash.dcc.Graph(
-                    figure=carbon_atlas(source, fuel_type, theme) , 
-                    className='plotly-figure', 
-                    style = {'height' :  '100vh'})
-            )
+            return figure_content("carbon-atlas-loading", nav_opt, controls, {'height' :  '100vh'})
 
         if nav_opt == 'political-geography-sunburst' :
 
             # Political Geography sunburst
-            return dash.dcc.Loading(
-                id="political-geography-sunburst-loading",
-                children=dash.dcc.Graph(
-                    figure=country_sunburst(nation, fuel_type, theme),
-                    className='plotly-figure',
-                    style={
-                        'height': '100vh',
-                        'background': 'radial-gradient(circle at center, #999 10%, transparent 70%)',
-                        'background-size': '100% 100%',
-                        'background-repeat': 'no-repeat'
-                    },
-                    config=sunburst_config
-                )
+            return figure_content(
+                "political-geography-sunburst-loading", nav_opt, controls,
+                {
+                    'height': '100vh',
+                    'background': 'radial-gradient(circle at center, #999 10%, transparent 70%)',
+                    'background-size': '100% 100%',
+                    'background-repeat': 'no-repeat'
+                },
+                sunburst_config
             )
 
-
         if nav_opt == 'political-geography-time-series' :
 
             # Surface Demo
-            return dash.dcc.Loading(
-                id = "political-geography-time-series-loading",
-                children=dash.dcc.Graph(
-                    figure=country_timeseries(fuel_type, nation, theme), 
-                    className='plotly-figure', 
-                    style = {'height' :  '100vh'},
-                    config=config)
-            )
-        
+            return figure_content("political-geography-time-series-loading", nav_opt, controls, {'height' :  '100vh'}, config)
+
         if nav_opt == 'source-sunburst' :
 
-            # Animation Demo
-            return dash.dcc.Graph(
-                    figure=source_sunburst(source, fuel_type, theme), 
-                    className='plotly-figure', 
-                    id="plot-figure-with-year",
-                    style = {'height' :  '100vh'},
-                    config=sunburst_config)
-            
+            # Animation Demo (built in the background, see update_heavy_figure)
+            return figure_content("source-sunburst-loading", nav_opt, controls, {'height' :  '100vh'}, sunburst_config)
 
         if nav_opt == 'source-time-series' :
 
             # Animation Demo
-            return dash.dcc.Loading(
-                id = "source-time-series-loading",
-                children=dash.dcc.Graph(
-                    figure=source_timeseries(source, fuel_type, nation, theme), 
-                    className='plotly-figure', 
-                    style = {'height' :  '100vh'},
-                    config=config)
-            )
-        
+            return figure_content("source-time-series-loading", nav_opt, controls, {'height' :  '100vh'}, config)
+
         if nav_opt == 'source-ternary' :
 
-            # Animation Demo
-            return dash.dcc.Loading(
-                id = "ternary-loading",
-                children=dash.dcc.Graph(
-                    figure=source_ternary(source_a, source_b, fuel_type, grouping, theme), 
-                    className='plotly-figure', 
-                    style = {'height' :  '100vh'},
-                    config=config)
-            )
-        
+            # Animation Demo (built in the background, see update_heavy_figure)
+            return figure_content("ternary-loading", nav_opt, controls, {'height' :  '100vh'}, config)
+
         if nav_opt == 'type-ternary' :
 
-            # Animation Demo
-            return dash.dcc.Loading(
-                id = "ternary-loading",
-                children=dash.dcc.Graph(
-                    figure=type_ternary(source, grouping, theme), 
-                    className='plotly-figure', 
-                    style = {'height' :  '100vh'},
-                    config=config)
-            )
+            # Animation Demo (built in the background, see update_heavy_figure)
+            return figure_content("ternary-loading", nav_opt, controls, {'height' :  '100vh'}, config)
 
         else :
             return dash.dcc.Loading(
@@ -281,3 +350,68 @@ def update_container(nav_opt, theme, source, fuel_type, nation, source_a, source
                     id="plot-figure-with-year",
                     style = {'height' :  '100vh'},
                     config=config))
+
+
+# The second callback builds the figures of the heavy views in the background
+# (into the shared figure cache), then hands the figure's path to the browser.
+# Changing the navigation dropdown cancels a build that is still running.
+@dash.callback(
+    dash.dependencies.Output(figure_path_id, 'data'),
+    dash.dependencies.Input(heavy_request_id, 'data'),
+    background = True,
+    manager = background.manager,
+    interval = background.poll_interval_ms,
+    cancel = [dash.dependencies.Input('navigation-dropdown-controler', 'value')],
+)
+def update_heavy_figure(request):
+    """
+    Builds the figure of a heavy view in a background process.
+
+    Parameters
+    ----------
+    request : dict
+        The navigation option and the controls of the view, as stored by `figure_content`.
+
+    Returns
+    -------
+    str
+        The path of the figure on the figure endpoint.
+    """
+    controls = dict(request)
+    nav_opt = controls.pop('nav_opt')
+    figure_for(nav_opt, **controls)
+    return figure_endpoint.figure_path(nav_opt, controls)
+
+
+# The third callback fetches the figure in the browser (assets/js/figures.js), so
+# that it can be revalidated against the browser's HTTP cache.
+dash.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace = 'figures', function_name = 'fetch_figure'),
+    dash.dependencies.Output(figure_graph_id, 'figure'),
+    dash.dependencies.Input(figure_path_id, 'data'),
+)
+
+
+@profiling.profile_slow_calls
+def figure_for(nav_opt, theme, source=None, fuel_type=None, nation=None, source_a=None, source_b=None, grouping=None):
+    """
+    Returns the figure of a plotly navigation option, from the figure cache when possible.
+
+    Parameters
+    ----------
+    nav_opt : str
+        The navigation option (e.g. 'carbon-atlas').
+    theme, source, fuel_type, nation, source_a, source_b, grouping
+        The control values, as passed to `update_container`; only the ones the view's
+        builder uses are passed on (and make up its cache key).
+
+    Returns
+    -------
+    plotly.graph_objects.Figure or dict
+        The figure (a dict when it was shared by another process).
+    """
+    builder, args = resolve_view(nav_opt, dict(
+        theme = theme, source = source, fuel_type = fuel_type, nation = nation,
+        source_a = source_a, source_b = source_b, grouping = grouping,
+    ))
+    return figure_cache.cached_build(builder, *args, pool = nav_opt in process_pool.views)
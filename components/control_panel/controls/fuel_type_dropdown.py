@@ -12,7 +12,7 @@ Script Description: The fuel type selector allows for the selection of fossil fu
 Exceptional notes about this script:
 (none)
 
-Callback methods: 2
+Callback methods: 0
 
 ~~~
 
@@ -61,33 +61,10 @@ layout = dash.html.Div(
     ]
 )
 
-# CALLBACKS (2)
+# CALLBACKS (0)
 
-# Updates whether or not to show the fuel type dropdown selector.
-@dash.callback(
-    # OUT controls visibility of component (HIDDEN == VARIABLE -> FALSE == VISIBLE)
-    dash.dependencies.Output(component_id, 'hidden'),
-    # IN from navigation dropdown
-    dash.dependencies.Input('navigation-dropdown-controler', 'value')
-)
-def update_fuel_dropdown(nav_opt) :
-    # Navigat options that have a fuel type dropdown menu
-    if nav_opt in [
-        'carbon-atlas', 
-        'source-time-series', 
-        'political-geography-time-series', 
-        'political-geography-sunburst', 
-        'source-sunburst', 
-        'table',
-        'source-ternary'] :
-        return False # IS visible
-    else:
-        return True # is NOT visible
-
-# Controls Theme of component
-@dash.callback(
-    dash.dependencies.Output(component_id, 'className'),
-    dash.dependencies.Input('theme_toggle', 'className')
-)
-def update_source_dropdown(theme):
-    return "dropdown_" + theme
\ No newline at end of file
+# Visibility: set in the browser from the control panel's visibility table
+# (components/control_panel/controls_container.py)
+
+# Theme: the className is set in the browser by the theme toggle
+# (components/control_panel/controls/theme_toggle.py, assets/js/theme.js)
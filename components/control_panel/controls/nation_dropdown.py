@@ -12,7 +12,7 @@ Script Description: This script defines the style, layout, and callback function
 Exceptional notes about this script:
 This script is titled using the old "nation" terminology; as of September 2023, this is officially outdated language (in favor of the use of the term "political geography").  Eventually, it would be nice to eliminate vestiges of the previous standard language so that the language in the scripts are consistent with the language in the literature it is used to produce.
 
-Callback methods: 2
+Callback methods: 0
 
 ~~~
 
@@ -54,37 +54,10 @@ layout = dash.html.Div(
     ]
 )
 
-# CALLBACKS (2)
+# CALLBACKS (0)
 
-# Updates whether to show the country selector, and whether it's multi- or single
-@dash.callback(
-    dash.dependencies.Output(component_id, 'hidden'),
-    dash.dependencies.Output('nation-dropdown-controler', 'multi'),
-    dash.dependencies.Output('nation-dropdown-controler', 'value'),
-    dash.dependencies.Input('navigation-dropdown-controler', 'value')
-)
-def update_nation_dropdown(nav_opt) :
-
-    # Not Hidden, Not Multi Choice.  Default USA.
-    if nav_opt == 'political-geography-time-series' : 
-        return False, False, 'WORLD'
-    
-    if nav_opt == 'political-geography-sunburst' : 
-            return False, False, 'WORLD'
-
-    # Not Hidden.  Multi.
-    if nav_opt == 'source-time-series' :
-
-        return False, True, ['AFRICA', 'ASIA PACIFIC', 'COMMONWEALTH OF INDEPENDENT STATES', 'EUROPE', 'NORTH AMERICA', 'MIDDLE EAST', 'SOUTH AND CENTRAL AMERICA', 'CHINA (MAINLAND)',  'UNITED STATES OF AMERICA', 'RUSSIAN FEDERATION', 'INDIA']
-    
-    # Hidden
-    else:
-        return True, False, []
-
-# Controls Theme of component
-@dash.callback(
-    dash.dependencies.Output(component_id, 'className'),
-    dash.dependencies.Input('theme_toggle', 'className')
-)
-def update_source_dropdown(theme):
-    return "dropdown_" + theme
\ No newline at end of file
+# Visibility: set in the browser from the control panel's visibility table
+# (components/control_panel/controls_container.py)
+
+# Theme: the className is set in the browser by the theme toggle
+# (components/control_panel/controls/theme_toggle.py, assets/js/theme.js)
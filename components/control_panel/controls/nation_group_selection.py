@@ -12,7 +12,7 @@ Script Description: The nation group selector allows for the selection of differ
 Exceptional notes about this script:
 (none)
 
-Callback methods: 2
+Callback methods: 0
 
 ~~~
 
@@ -61,28 +61,10 @@ layout = dash.html.Div(
     ]
 )
 
-# CALLBACKS (2)
+# CALLBACKS (0)
 
-# Updates whether or not to show the nation group dropdown selector.
-@dash.callback(
-    # OUT controls visibility of component (HIDDEN == VARIABLE -> FALSE == VISIBLE)
-    dash.dependencies.Output(component_id, 'hidden'),
-    dash.dependencies.Output('nation-group-dropdown-controler', 'hidden'),
-    # IN from navigation dropdown
-    dash.dependencies.Input('navigation-dropdown-controler', 'value')
-)
-def update_fuel_dropdown(nav_opt) :
-    # Navigat options that have a nation group dropdown menu
-    if nav_opt in [
-        'type-ternary', 'source-ternary'] :
-        return False, False # IS visible
-    else:
-        return True, True # is NOT visible
-
-# Controls Theme of component
-@dash.callback(
-    dash.dependencies.Output(component_id, 'className'),
-    dash.dependencies.Input('theme_toggle', 'className')
-)
-def update_source_dropdown(theme):
-    return "dropdown_" + theme
\ No newline at end of file
+# Visibility: set in the browser from the control panel's visibility table
+# (components/control_panel/controls_container.py)
+
+# Theme: the className is set in the browser by the theme toggle
+# (components/control_panel/controls/theme_toggle.py, assets/js/theme.js)
@@ -90,14 +90,9 @@ layout = dash.html.Div(
     ]
 )
 
-# CALLBACKS (1)
-# Controls the theme of the navigation dropdown
-@dash.callback(
-    dash.dependencies.Output(component_id, 'className'),
-    dash.dependencies.Input('theme_toggle', 'className')
-)
-def update_source_dropdown(theme):
-    return "dropdown_" + theme
+# CALLBACKS (0)
+# Theme: the className is set in the browser by the theme toggle
+# (components/control_panel/controls/theme_toggle.py, assets/js/theme.js)
 
 '''
 
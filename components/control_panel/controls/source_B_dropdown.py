@@ -12,7 +12,7 @@ Script Description: This script defines the style, layout, and callback function
 Exceptional notes about this script:
 (none)
 
-Callback methods: 2
+Callback methods: 0
 
 ~~~
 
@@ -71,22 +71,10 @@ layout = dash.html.Div(
     ]
 )
 
-# CALLBACKS (2)
+# CALLBACKS (0)
 
-# Determines whether or not to show the source dropdown menu
-# and what the options are.
-@dash.callback(
-    dash.dependencies.Output(component_id, 'hidden'),
-    dash.dependencies.Input('navigation-dropdown-controler', 'value'),
-)
-def update_sourceb_dropdown(nav_opt):
-    if nav_opt == 'source-ternary' : return False
-    else : return True
-
-# Controls Theme of component
-@dash.callback(
-    dash.dependencies.Output(component_id, 'className'),
-    dash.dependencies.Input('theme_toggle', 'className')
-)
-def update_source_dropdown(theme):
-    return "dropdown_" + theme
\ No newline at end of file
+# Visibility: set in the browser from the control panel's visibility table
+# (components/control_panel/controls_container.py)
+
+# Theme: the className is set in the browser by the theme toggle
+# (components/control_panel/controls/theme_toggle.py, assets/js/theme.js)
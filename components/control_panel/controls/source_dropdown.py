@@ -10,9 +10,9 @@ Project: CDIAC at AppState
 Script Description: This script defines the style, layout, and callback functionality of the source_dropdown.
 
 Exceptional notes about this script:
-(none)
+The dropdown is updated in the browser (assets/js/controls.js) from the tables in source_table; the options and best match sources are precomputed when the data is loaded (components/utils/constants.py).
 
-Callback methods: 2
+Callback methods: 1
 
 ~~~
 
@@ -27,6 +27,21 @@ component_id = "source_dropdown"
 import dash.html.Div
 from components.utils import constants as d
 
+# The source dropdown's rules, for the browser (controls.update_source in
+# assets/js/controls.js); options and best matches are precomputed in constants.
+source_table = dict(
+
+    # Views that show the source dropdown
+    shown_for = ['carbon-atlas', 'source-time-series', 'source-sunburst', 'type-ternary'],
+
+    # Views that cannot show the stat difference
+    no_stat_difference_for = ['source-sunburst', 'type-ternary', 'carbon-atlas'],
+
+    options = d.source_options,
+
+    remap = d.source_remap,
+)
+
 # LAYOUT
 layout = dash.html.Div(
     id = component_id,
@@ -41,7 +56,7 @@ layout = dash.html.Div(
 
             value = d.df_total.columns[2],
 
-            options = [{'label': col, 'value': col} for col in d.df_total.columns[2:] if col not in ['Nation', 'Year']],
+            options = d.source_options['totals']['all'],
 
             clearable=False,
 
@@ -49,78 +64,27 @@ layout = dash.html.Div(
 
             searchable=False
 
-        )
+        ),
+
+        dash.dcc.Store(id = 'source-dropdown-table', data = source_table)
 
     ]
 )
 
-# CALLBACKS (2)
+# CALLBACKS (1)
 
 # Determines whether or not to show the source dropdown menu
-# and what the options are.
-@dash.callback(
+# and what the options are (evaluated in the browser).
+dash.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace = 'controls', function_name = 'update_source'),
     dash.dependencies.Output(component_id, 'hidden'),
     dash.dependencies.Output('source-dropdown-controler', 'options'),
     dash.dependencies.Output('source-dropdown-controler', 'value'),
     dash.dependencies.Input('navigation-dropdown-controler', 'value'),
     dash.dependencies.Input('fuel-type-dropdown-controler', 'value'),
-    dash.dependencies.State('source-dropdown-controler', 'options'),
-    dash.dependencies.Input('source-dropdown-controler', 'value')
+    dash.dependencies.Input('source-dropdown-controler', 'value'),
+    dash.dependencies.State('source-dropdown-table', 'data'),
 )
-def update_source_dropdown(nav_opt, fuel_type, options, value):
-    
-    #print(nav_opt, fuel_type, options, value)
-
-    # Defaults
-    hidden = True
-
-    if fuel_type == "totals" :
-        options = [
-            {'label': col, 'value': col} for col in d.df_total.columns[2:] 
-            if col not in ['Nation', 'Year'] and 
-            (nav_opt not in ['source-sunburst', 'type-ternary', 'carbon-atlas'] or col != "Stat Difference (Supplied - Consumed)")
-        ]
-    else :
-        options = [
-            {'label': col, 'value': col} for col in d.df_total.columns[2:] 
-            if col not in ['Nation', 'Year', 'Flaring of Natural Gas', 'Manufacture of Cement', 'Per Capita Total Emissions'] and 
-            (nav_opt not in ['source-sunburst', 'type-ternary', 'carbon-atlas'] or col != "Stat Difference (Supplied - Consumed)")
-        ]
-
-    if nav_opt in [
-            'carbon-atlas',
 
-            'source-time-series',
-
-            'source-sunburst',
-
-            'type-ternary',
-        ] :
-
-        hidden = False
-
-        if nav_opt != 'source-time-series' and value == "Stat Difference (Supplied - Consumed)":
-            return hidden, options, "Fossil Fuel Energy (Supplied)"
-
-        if fuel_type == 'totals' and nav_opt != 'type-ternary':
-
-            # If coming from a different fueltype, change to best match source
-            if value not in d.df_total.columns :
-                value = d.best_match_option(value, fuel_type)
-
-        else :
-            
-            if nav_opt == 'type-ternary':
-                value = d.best_match_option(value, "solids")
-            elif value not in d.df_gas.columns :
-                value = d.best_match_option(value, fuel_type)
-
-    return hidden, options, value
-
-# Controls Theme of component
-@dash.callback(
-    dash.dependencies.Output(component_id, 'className'),
-    dash.dependencies.Input('theme_toggle', 'className')
-)
-def update_source_dropdown(theme):
-    return "dropdown_" + theme
\ No newline at end of file
+# Theme: the className is set in the browser by the theme toggle
+# (components/control_panel/controls/theme_toggle.py, assets/js/theme.js)
@@ -7,7 +7,7 @@ Initially Created: 7/01/2023
 
 Last Modified: 10/29/2023
 
-Script Description: This script defines the functionality of the theme toggle.  When toggled (clicked), the theme toggle's class changes between "dark" and "light".  This is used in callbacks throughout the application to update components to the correct theme.
+Script Description: This script defines the functionality of the theme toggle.  When toggled (clicked), the theme toggle's class changes between "dark" and "light".  This is used in callbacks throughout the application to update components to the correct theme.  The classes and styles that only follow the theme (the main container, the loading areas and every dropdown) are set in the browser by one clientside callback (assets/js/theme.js), so a theme change makes no server requests for them.
 
 Exceptional notes about this script:
 (none)
@@ -39,15 +39,28 @@ layout = dash.html.Div(
     ]
 )
 
+# Components whose className follows the theme of the dropdown controls
+themed_dropdowns = [
+    'fuel_type_dropdown',
+    'nation_dropdown',
+    'nation_group_dropdown',
+    'navigation_dropdown',
+    'source_a_dropdown',
+    'source_b_dropdown',
+    'source_dropdown',
+]
+
 # CALLBACKS (1)
-# Controls Theme of component
-@dash.callback(
+# Applies the theme to every themed component in the browser (assets/js/theme.js),
+# so that toggling the theme only reaches the server for the content that is
+# rebuilt with the new theme (figures and the data table).
+dash.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace = 'theme', function_name = 'apply_theme'),
     dash.dependencies.Output(component_id, 'className'),
     dash.dependencies.Output('theme_toggle_switch', 'children'),
+    dash.dependencies.Output('main_container', 'className'),
+    dash.dependencies.Output('loading-content', 'style'),
+    dash.dependencies.Output('non-loading-content', 'style'),
+    *[dash.dependencies.Output(dropdown, 'className') for dropdown in themed_dropdowns],
     dash.dependencies.Input('theme_toggle_switch', 'n_clicks')
 )
-def update_source_dropdown(n_clicks):
-    if n_clicks % 2 == 0 :
-        return 'light', dash.html.P('Switch to Dark Theme')
-    else :
-        return 'dark', dash.html.P('Switch to Light Theme')
\ No newline at end of file
@@ -4,6 +4,21 @@ all user interactive elements such as dropdowns and links for navigation within
 
 Attributes
 ----------
+visible_for : dict
+    The visibility table: maps each control's component ID to the navigation options it is
+    shown for.
+
+nation_selection : dict
+    Maps the navigation options that show the political geography selector to whether it
+    allows multiple selection and the value it is reset to.
+
+state_id : str
+    The ID of the store holding the settled control state: a dict with the navigation option
+    (`nav_opt`) and every control's value, which the display container renders from.
+
+settle_ms : int
+    How long the controls must be quiet before the control state is written.
+
 layout : dash.html.Div
     The main HTML container that holds all control elements, including navigation dropdowns,
     user interaction controls like theme toggles, and various data selection options. Also includes
@@ -23,6 +38,13 @@ This module plays a critical role in user interaction, facilitating the selectio
 of data visualized in the dashboard. It ensures that all controls are accessible and functional,
 allowing for dynamic updates to the data displays based on user input.
 
+Which controls are shown for which view is declared in `visible_for` and evaluated in the
+browser (assets/js/controls.js), so changing views does not make a server request per control.
+
+The controls' values are collected into one store (`state_id`), debounced by `settle_ms` and
+written only when something changed, so a change that resets other controls still renders
+the display once.
+
 Examples
 --------
 The layout of the controls container is structured to provide a user-friendly interface with all
@@ -75,6 +97,51 @@ import components.control_panel.controls.source_B_dropdown as source_B_dropdown
 import components.control_panel.controls.nation_dropdown as nation_dropdown
 import components.control_panel.controls.nation_group_selection as nation_group_selection
 
+# VISIBILITY TABLE
+# The navigation options each control is shown for.  Evaluated in the browser
+# (controls.apply_visibility in assets/js/controls.js) whenever the navigation
+# option changes, so showing and hiding controls makes no server requests.
+visible_for = {
+    fuel_type_dropdown.component_id : [
+        'carbon-atlas',
+        'source-time-series',
+        'political-geography-time-series',
+        'political-geography-sunburst',
+        'source-sunburst',
+        'table',
+        'source-ternary',
+    ],
+    nation_dropdown.component_id : [
+        'political-geography-time-series',
+        'political-geography-sunburst',
+        'source-time-series',
+    ],
+    nation_group_selection.component_id : ['type-ternary', 'source-ternary'],
+    'nation-group-dropdown-controler' : ['type-ternary', 'source-ternary'],
+    source_A_dropdown.component_id : ['source-ternary'],
+    source_B_dropdown.component_id : ['source-ternary'],
+}
+
+# How the political geography selector behaves on the views that show it:
+# [multiple selection, the value it is reset to]
+nation_selection = {
+    'political-geography-time-series' : [False, 'WORLD'],
+    'political-geography-sunburst' : [False, 'WORLD'],
+    'source-time-series' : [True, [
+        'AFRICA', 'ASIA PACIFIC', 'COMMONWEALTH OF INDEPENDENT STATES', 'EUROPE', 'NORTH AMERICA',
+        'MIDDLE EAST', 'SOUTH AND CENTRAL AMERICA', 'CHINA (MAINLAND)', 'UNITED STATES OF AMERICA',
+        'RUSSIAN FEDERATION', 'INDIA'
+    ]],
+}
+
+# CONTROL STATE
+# Every control's value, in one store, is what the display container renders
+# from.  The store is only written once the controls have been quiet for
+# settle_ms, and only when a value actually changed, so one user action (and
+# the controls it resets) renders the display once, with the final values.
+state_id = 'control-state'
+settle_ms = 150
+
 # LAYOUT
 layout = dash.html.Div(
 
@@ -135,7 +202,46 @@ layout = dash.html.Div(
         # INFO / DEFAULT BUTTON AREA
         defaultbuttonarea.layout,
 
+        # The visibility table, for the browser
+        dash.dcc.Store(
+            id = 'control-visibility',
+            data = {
+                'visible_for' : [visible_for[control] for control in visible_for],
+                'nation_selection' : nation_selection,
+                'settle_ms' : settle_ms,
+            }
+        ),
+
+        # The settled control state (see settle_ms)
+        dash.dcc.Store(id = state_id),
+
     ]
 )
 
-# CALLBACKS (0)
+# CALLBACKS (2)
+# Shows the controls of the selected view, and sets up the political geography
+# selector for it (hidden controls are reset to a single, empty selection).
+dash.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace = 'controls', function_name = 'apply_visibility'),
+    *[dash.dependencies.Output(control, 'hidden') for control in visible_for],
+    dash.dependencies.Output('nation-dropdown-controler', 'multi'),
+    dash.dependencies.Output('nation-dropdown-controler', 'value'),
+    dash.dependencies.Input('navigation-dropdown-controler', 'value'),
+    dash.dependencies.State('control-visibility', 'data'),
+)
+
+# Collects the controls' values into the control state once they have settled.
+dash.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace = 'controls', function_name = 'settle_state'),
+    dash.dependencies.Output(state_id, 'data'),
+    dash.dependencies.Input('navigation-dropdown-controler', 'value'),
+    dash.dependencies.Input('theme_toggle', 'className'),
+    dash.dependencies.Input('source-dropdown-controler', 'value'),
+    dash.dependencies.Input('fuel-type-dropdown-controler', 'value'),
+    dash.dependencies.Input('nation-dropdown-controler', 'value'),
+    dash.dependencies.Input('source-a-dropdown-controler', 'value'),
+    dash.dependencies.Input('source-b-dropdown-controler', 'value'),
+    dash.dependencies.Input('nation-group-dropdown-controler', 'value'),
+    dash.dependencies.State('control-visibility', 'data'),
+    dash.dependencies.State(state_id, 'data'),
+)
@@ -5,9 +5,10 @@ data filtering and application control.
 
 Functions
 ---------
-update_source_dropdown(theme, panel_toggle_clicks)
-    Updates the theme of the control panel container and manages the visibility state of the
-    control panel based on user clicks on the panel toggle.
+theme.panel_class(theme, panel_toggle_clicks) (assets/js/theme.js)
+    A clientside callback that updates the theme of the control panel container and manages
+    the visibility state of the control panel based on user clicks on the panel toggle: an odd
+    number of clicks collapses the panel ('light collapsed'), an even number expands it.
 
 Attributes
 ----------
@@ -103,48 +104,12 @@ else :
 
 # CALLBACKS (1)
 
-# Controls Theme of component
-@dash.callback(
+# Controls Theme of component, and whether the panel is collapsed.  Runs in the
+# browser (assets/js/theme.js); the server is not involved.
+dash.clientside_callback(
+    dash.dependencies.ClientsideFunction(namespace = 'theme', function_name = 'panel_class'),
     dash.dependencies.Output(component_id, 'className'),
     dash.dependencies.Output("control_panel_toggle", 'className'),
     dash.dependencies.Input('theme_toggle', 'className'),
     dash.dependencies.Input("control_panel_toggle", 'n_clicks')
 )
-def update_source_dropdown(theme, panel_toggle_clicks):
-    """
-    Toggles the CSS class of the control panel based on user interaction to expand or collapse
-    the panel, while also updating the theme of the control panel.
-
-    Parameters
-    ----------
-    theme : str
-        The current theme setting (e.g., "light" or "dark") which affects the styling of
-        the control panel.
-    panel_toggle_clicks : int, optional
-        The number of times the control panel toggle has been clicked by the user, which determines
-        whether the panel is in an expanded or collapsed state.
-
-    Returns
-    -------
-    tuple of (str, str)
-        The updated class names for the panel container and the toggle element, reflecting the new
-        theme and expanded/collapsed state.
-
-    Notes
-    -----
-    The function checks the number of clicks on the toggle; an odd number of clicks implies a
-    collapsed state, and an even number implies an expanded state. The theme is applied consistently
-    regardless of the panel state.
-
-    Examples
-    --------
-    >>> update_source_dropdown("light", 1)
-    ('light collapsed', 'light collapsed')
-    """
-
-    if panel_toggle_clicks is None:
-        return theme, theme
-    elif panel_toggle_clicks % 2 == 1 :
-        return theme + " collapsed", theme + " collapsed"
-    else :
-        return theme, theme
\ No newline at end of file
@@ -50,6 +50,7 @@ See Also
 plotly.graph_objects : Plotly's graph object module for constructing figures.
 plotly.express : Plotly's high-level interface for building figures.
 components.utils.constants : Module where various constants like data frames and mappings are defined.
+components.utils.geography : The political geographies' ISO codes and aggregate flags.
 """
 
 
@@ -58,6 +59,8 @@ import plotly.graph_objects as go
 import plotly.express as px
 import datetime
 from components.utils import constants as d
+from components.utils import themes
+from components.utils import geography
 
 # Carbon Atlas
 def carbon_atlas(source, fuel_type, theme) :
@@ -88,25 +91,20 @@ def carbon_atlas(source, fuel_type, theme) :
         else :
             c_scale = "electric"
 
-    if theme == 'light' :
-        textCol = '#000'
-        bg = '#fff'
-    if theme == 'dark' :
-        textCol = '#fff'
-        bg = '#000'
+    # Theme colors (the rest of the styling is in the theme's template)
+    textCol = themes.text_color[theme]
 
 
-    # List of Nation values to filter
-    nations_to_filter = ["AFRICA", "ANTARCTICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "EUROPE", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "ANNEX I", "NON-ANNEX I", "WORLD"]
-
-    # Filter out rows with specified Nation values
-    df = df.copy()[~df['Political Geography'].isin(nations_to_filter)]
+    # Filter out the aggregates (world, regions and annex groups)
+    codes = geography.row_codes(df)
+    nations = ~geography.table['aggregate'].values[codes]
+    df = df[nations].copy()
 
     # Top of the scale should be the max value for the entire range of years
     maxValue = df[source].max()
 
-    # Map each observation to their nation ISO for plotly
-    df['Nation_ISO'] = df['Political Geography'].map(d.location_mapping)
+    # Each observation's nation ISO for plotly
+    df['Nation_ISO'] = geography.table['iso3'].values[codes[nations]]
 
     df['Year '] = df['Year']
 
@@ -134,27 +132,15 @@ def carbon_atlas(source, fuel_type, theme) :
         color_continuous_scale = c_scale,
         
         # set color range
-        range_color = [0, maxValue]
+        range_color = [0, maxValue],
+
+        template = themes.template_name(theme)
     )
     
     fig.update_geos(fitbounds="locations", visible=False)
     
-    # Give it the CDIAC Watermark with overkill year code lol
-    subtitle_annotation = dict(
-        x=0.5,
-        y=0,
-        xref='paper',
-        yref='paper',
-        xanchor="center",
-        text='<b>The CDIAC at AppState Dashboard</b><br>Hefner and Marland (' + str(datetime.date.today().year) + ')',
-        showarrow=False,
-        align="center",
-        
-        font = dict(
-            size=20,
-            color = textCol
-        )
-    )
+    # Give it the CDIAC Watermark
+    subtitle_annotation = themes.credit(x=0.5, y=0, xanchor="center", align="center")
 
     # Figure out what the plot title will be
     if fuel_type == 'solids':
@@ -174,33 +160,13 @@ def carbon_atlas(source, fuel_type, theme) :
     fig.update_layout(
 
             geo=dict(bgcolor= 'rgba(0,0,0,0)'),
-            plot_bgcolor=bg,
-            paper_bgcolor=bg,
 
             margin={'l': 0, 'r': 0, 't': 50, 'b': 0},
 
             coloraxis_colorbar_title="CO₂ Emissions<br>kilotonnes C".upper(),
 
-            # Set the font size for the entire plot, excluding the title
-            font=dict(
-                size=20, 
-                color = textCol  
-            ),
-            
-            # Title Layout and Styling
-            title = dict(
-                text = plot_title,
-                xanchor="center",
-                xref = "container",
-                yref = "container",
-                x = 0.5,
-                yanchor="top",
-                y = .98,
-                font = dict(
-                    size = 32,
-                    color = textCol
-                )
-            ),
+            # Title (styled by the theme's template)
+            title = dict(text = plot_title),
 
             sliders = [dict(
                 font=dict(size=20, color = textCol),
@@ -220,13 +186,6 @@ def carbon_atlas(source, fuel_type, theme) :
     fig.layout['sliders'][0]['active'] = last_frame_num
     fig = go.Figure(data=fig['frames'][-1]['data'], frames=fig['frames'], layout=fig.layout)
 
-    fig.update_layout(
-        hoverlabel=dict(
-        font_size=16,
-        font_family="Rockwell",
-        )
-    )
-
     fig["layout"].pop("updatemenus") # optional, drop animation buttons
 
     return fig
\ No newline at end of file
@@ -8,7 +8,10 @@ build_country_sunburst(nation, fuel_type, bg, year)
     Constructs the data structure necessary for a single snapshot of the sunburst chart,
     representing CO₂ emissions for a given year and country.
 
-country_sunburst(nation, fuel_type, theme)
+country_frame(year, nation, fuel_type, bg, textCol)
+    Builds the animation frame of one year; frames are built through `components.utils.year_frames`.
+
+country_sunburst(nation, fuel_type, theme, validate=None)
     Generates a complete sunburst chart with animation over multiple years, showing changes
     in CO₂ emissions distribution within a country.
 
@@ -24,6 +27,9 @@ year : int
     The year for which the data snapshot is to be visualized.
 theme : str
     The theme setting (e.g., 'light', 'dark') which affects the color scheme of the sunburst chart.
+validate : bool, optional
+    Whether the figure is built through `go.Figure` (validated) or sent as a dict; by default
+    as set for the political-geography-sunburst view in the `[raw_figures]` section (see `components.utils.raw_figure`).
 
 Returns
 -------
@@ -54,11 +60,15 @@ components.utils.constants : Provides access to global constants and data used i
 
 
 # Import needed libraries
+import functools
 import plotly.graph_objects as go
 import datetime
 import numpy as np
 import pandas as pd
 from components.utils import constants as d
+from components.utils import raw_figure
+from components.utils import year_frames
+from components.utils import themes
 
 def build_country_sunburst(nation, fuel_type, bg, year):
 
@@ -216,7 +226,7 @@ def build_country_sunburst(nation, fuel_type, bg, year):
     df = df[columns_to_keep]
 
     # Replace zeros with NAs so it doesn't show sectors with 0
-    df.replace(0, np.nan, inplace=True)
+    df = df.replace(0, np.nan)
 
     # Transpose the DataFrame to get the values
     transposed_df = df.T
@@ -237,110 +247,75 @@ def build_country_sunburst(nation, fuel_type, bg, year):
 
     return sunburst, plot_title, plot_subtitle
 
-def country_sunburst(nation, fuel_type, theme):
+def country_frame(year, nation, fuel_type, bg, textCol):
+    """
+    Returns the animation frame of one year (independent of the other years' frames).
+    """
+    sunburst, _, _ = build_country_sunburst(nation, fuel_type, bg, year)
+    return dict(
+        data=[dict(
+            type="sunburst",
+            labels=sunburst["labels"],
+            parents=sunburst["parents"],
+            values=sunburst["values"],
+            branchvalues="total",
+            insidetextorientation='horizontal',
+            marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5))
+        )],
+        name=str(year)
+    )
+
+def country_sunburst(nation, fuel_type, theme, validate=None):
 
-    if theme == 'light' :
-        textCol = '#000'
-        bg = '#fff'
-    if theme == 'dark' :
-        textCol = '#fff'
-        bg = '#000'
+    # Theme colors (the rest of the styling is in the theme's template)
+    textCol = themes.text_color[theme]
+    bg = themes.background[theme]
     # Define years for the animation
     years = list(range(1995, 2021))
 
-    # Initialize the figure with subplots
-    fig = go.Figure()
-
     # Setup the initial sunburst chart for the first year
     sunburst, plot_title, plot_subtitle = build_country_sunburst(nation, fuel_type, bg, years[-1])
 
-    fig.add_trace(go.Sunburst(
+    fig = dict(data = [dict(
+        type="sunburst",
         labels=sunburst["labels"],
         parents=sunburst["parents"],
         values=sunburst["values"],
         branchvalues="total",
         insidetextorientation='horizontal',
-        marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5))
-    ))
+        marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5)),
+        textfont=dict(color=textCol),
+    )], layout = {})
 
     if d.show_credit :
         annotations=[
             # Credit
-            dict(
-                x=0.01,
-                y=0,
-                xref='paper',
-                yref='paper',
-                xanchor="left",
-                text='<b>The CDIAC at AppState Dashboard</b><br>Hefner and Marland (' + str(datetime.date.today().year) + ')',
-                showarrow=False,
-                align="left",
-                
-                font = dict(
-                    size=20,
-                    color = textCol
-                )
-            ),
+            themes.credit(x=0.01, y=0, xanchor="left", align="left"),
         ]
     else :
         annotations=[
         ]
 
-    fig.update_layout(
+    fig['layout'].update(
 
-        #uniformtext=dict(minsize=20, mode='hide'),
+        template=themes.template_name(theme),
 
-        plot_bgcolor=bg,
-        paper_bgcolor=bg,
+        #uniformtext=dict(minsize=20, mode='hide'),
 
         margin={'l': 0, 'r': 0, 't': 55, 'b': 0},
 
-        yaxis_title = "CO₂ Emissions (kilotonnes C)",
-
-        # Set the font size for the entire plot, excluding the title
-        font=dict(
-            size=20, 
-            color=textCol
-        ),
-
-        # Title Layout and Styling
-        title = dict(
-            text = plot_title.upper(),
-            xanchor="center",
-            xref = "container",
-            yref = "container",
-            x = 0.5,
-            yanchor="top",
-            y = .98,
-            font = dict(
-                size = 32,
-                color = textCol,
-            )
-        ),
+        title=dict(text=plot_title.upper()),
 
         annotations=annotations
     )
-    # Create frames for each year
-    frames = []
-    for year in years:
-        sunburst, _, _ = build_country_sunburst(nation, fuel_type, bg, year)
-        frame = go.Frame(
-            data=[go.Sunburst(
-                labels=sunburst["labels"],
-                parents=sunburst["parents"],
-                values=sunburst["values"],
-                branchvalues="total",
-                insidetextorientation='horizontal',
-                marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5))
-            )],
-            name=str(year)
-        )
-        frames.append(frame)
-
-    fig.frames = frames
+    # Create frames for each year (independently, see components.utils.year_frames)
+    fig['frames'] = year_frames.map_years(
+        functools.partial(country_frame, nation=nation, fuel_type=fuel_type, bg=bg, textCol=textCol),
+        years
+    )
 
     # Add a play button and a slider for the animation
-    fig.update_layout(
+    fig['layout'].update(
         updatemenus = [{ 
             'type': 'buttons',
             'direction': 'left',
@@ -375,6 +350,5 @@ def country_sunburst(nation, fuel_type, theme):
         }]
     )
 
-    fig.update_traces(textfont=dict(color=textCol))
-    
-    return fig
+    # Sent without validation when the view is set up for it (see components.utils.raw_figure)
+    return raw_figure.finish(fig, 'political-geography-sunburst', validate)
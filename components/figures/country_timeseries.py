@@ -54,45 +54,17 @@ components.utils.constants : Module where global constants and data sources are
 # Import needed libraries
 import plotly.express as px
 import pandas as pd
-import datetime
-import plotly.io as pio
 from components.utils import constants as d
+from components.utils import themes
 import plotly.graph_objects as go
 
 def country_timeseries(fuel_type, political_geography, theme):
-    
-    pio.templates.default = "plotly_white"
-
-    # Select Color Scale depending on fuel type and theme
-    if fuel_type == 'solids':
-        df = d.df_solid
-    elif fuel_type == 'liquids':
-        df = d.df_liquid
-    elif fuel_type == 'gases':
-        df = d.df_gas
-    else :
-        df = d.df_total
-
-    if theme == 'light' :
-        textCol = '#000'
-        bg = '#fff'
-    if theme == 'dark' :
-        textCol = '#fff'
-        bg = '#000'
-
-    # Filter to proper political geography
-    df = df[df['Political Geography'] == political_geography]
 
-    # Save a pre-melt for variables you do not want to stack
-    premelt_df = df
-
-    # melt for variables you wish to stack
-    df = pd.melt(
-        df, 
-        id_vars=['Political Geography', 'Year'], 
-        var_name='Source', 
-        value_name='Carbon'
-    )
+    # The political geography's rows, wide (for the lines) and long (for the stack),
+    # precomputed by fuel type in constants
+    fuel_type = fuel_type if fuel_type in d.sheets else 'totals'
+    premelt_df = d.df_by_geography[fuel_type][political_geography]
+    df = d.df_long_by_geography[fuel_type][political_geography]
 
     custom_order = [
         "Political Geography", 
@@ -139,8 +111,8 @@ def country_timeseries(fuel_type, political_geography, theme):
         "Manufacture of Cement" : "#B0A690",  
     }
 
-    # Filter and keep only the sources you want to stack
-    df = df[df['Source'].isin(custom_order) & (df.groupby('Source')['Carbon'].transform('any'))]
+    # Filter and keep only the sources you want to stack (and that have any emissions)
+    df = df[df['Source'].isin(custom_order) & df['Reported']]
 
     # Make stacked area plot
     fig = px.area(
@@ -150,7 +122,7 @@ def country_timeseries(fuel_type, political_geography, theme):
         color = 'Source', 
         #color_discrete_sequence=px.colors.qualitative.Alphabet,
         color_discrete_map=custom_color_map,
-        template="plotly_dark",
+        template=themes.template_name(theme),
         hover_data={'Year' : False, 'Political Geography' : False},
     )
 
@@ -220,59 +192,20 @@ def country_timeseries(fuel_type, political_geography, theme):
         plot_title = political_geography + " CO₂ EMISSIONS"
         plot_subtitle = "FROM ENERGY USE OF FOSSIL FUELS AND CEMENT MANUFACTURE"
 
-    if d.show_credit :
-        annotations=[
-            # Subtitle
-            dict(
-                text= plot_subtitle,
-                showarrow=False,
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=1.04,
-                font=dict(size=20, color=textCol)
-            ),
+    # Subtitle
+    annotations=[dict(text=plot_subtitle, x=0.5, y=1.04)]
 
+    if d.show_credit :
+        annotations.append(
             # Credit
-            dict(
-                x=0,
-                y=-0.05,
-                xref='paper',
-                yref='paper',
-                xanchor="left",
-                yanchor="top",
-                text='<b>The CDIAC at AppState Dashboard</b><br>Hefner and Marland (' + str(datetime.date.today().year) + ')',
-                showarrow=False,
-                align="left",
-                
-                font = dict(
-                    size=20,
-                    color = textCol
-                )
-            ),
-        ]
-    else :
-        annotations=[
-            # Subtitle
-            dict(
-                text= plot_subtitle,
-                showarrow=False,
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=1.04,
-                font=dict(size=20, color=textCol)
-            ),
-        ]
+            themes.credit(x=0, y=-0.05, xanchor="left", yanchor="top", align="left")
+        )
 
     # Updates the figure layout
     fig.update_layout(
 
         legend={'traceorder': 'reversed'},
 
-        plot_bgcolor=bg,
-        paper_bgcolor=bg,
-
         margin={'l': 0, 'r': 0, 't': 100, 'b': 100},
 
         yaxis_title = "CO₂ Emissions (kilotonnes C)",
@@ -280,26 +213,8 @@ def country_timeseries(fuel_type, political_geography, theme):
         # everyone knows what a year is
         xaxis_title = "",
 
-        # Set the font size for the entire plot, excluding the title
-        font=dict(
-            size=20, 
-            color = textCol  
-        ),
-
-        # Title Layout and Styling
-        title = dict(
-            text = plot_title,
-            xanchor="center",
-            xref = "container",
-            yref = "container",
-            x = 0.5,
-            yanchor="top",
-            y = .98,
-            font = dict(
-                size = 32,
-                color = textCol
-            )
-        ),
+        # Title (styled by the theme's template)
+        title = dict(text = plot_title),
         
         # Subtitle
         annotations=annotations
@@ -307,10 +222,6 @@ def country_timeseries(fuel_type, political_geography, theme):
 
     fig.update_layout(
         hovermode="closest",
-        hoverlabel=dict(
-        font_size=16,
-        font_family="Rockwell"
-        )
     )
     
     return fig
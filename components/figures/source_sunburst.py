@@ -4,11 +4,14 @@ highlighting global distributions and emphasizing specific source contributions
 
 Functions
 ---------
-build_sunburst_data(source, fuel_type, year, bg)
+build_sunburst_data(source, fuel_type, year, theme)
     Prepares the necessary data structure for a single year sunburst visualization, including
     adjustments based on the fuel type and geographical aggregation.
 
-source_sunburst(source, fuel_type, theme)
+source_frame(year, source, fuel_type, theme)
+    Builds the animation frame of one year; frames are built through `components.utils.year_frames`.
+
+source_sunburst(source, fuel_type, theme, validate=None)
     Constructs a full sunburst chart animated over multiple years, reflecting changes in
     CO₂ emissions distribution worldwide according to a specified source and fuel type.
 
@@ -20,10 +23,11 @@ fuel_type : str
     The type of fuel (solids, liquids, gases, or total) to filter data by for the visualization.
 year : int
     The year for which the data snapshot is to be visualized.
-bg : str
-    Background color for the chart, derived from the theme, influencing visibility and aesthetics.
 theme : str
     The theme setting (e.g., 'light', 'dark') which affects the color scheme of the sunburst chart.
+validate : bool, optional
+    Whether the figure is built through `go.Figure` (validated) or sent as a dict; by default
+    as set for the source-sunburst view in the `[raw_figures]` section (see `components.utils.raw_figure`).
 
 Returns
 -------
@@ -55,23 +59,23 @@ See Also
 plotly.graph_objects : Used for constructing the sunburst chart.
 datetime : Used to handle year annotations within the chart.
 components.utils.constants : Provides access to global constants and data used in the visualization.
+components.utils.geography : The political geographies' labels, regions and colors.
 """
 
 
 # Import needed libraries
+import functools
 import plotly.graph_objects as go
 import datetime
 import numpy as np
 import pandas as pd
 from components.utils import constants as d
+from components.utils import raw_figure
+from components.utils import year_frames
+from components.utils import themes
+from components.utils import geography
 
-def build_sunburst_data(source, fuel_type, year, bg) :
-    # Assign Region Colors
-    colormap = pd.DataFrame()
-
-    colormap["REGION"] = ["NONE", "WORLD", "AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"]
-    colormap["COLOR"] = [bg, bg, "#46C6E7", "#616BB2", "#8B69AD", "#F9A05B", "#EF563C", "#F06591", "#41BB91"]
-
+def build_sunburst_data(source, fuel_type, year, theme) :
     # Set Data, Title, and Subtitle
     if fuel_type == 'solids':
 
@@ -112,55 +116,35 @@ def build_sunburst_data(source, fuel_type, year, bg) :
     world_bunkered_marine = df.loc[df['Political Geography'] == "WORLD", "Bunkered (Marine)"].values[0]
     world_bunkered_aviation = df.loc[df['Political Geography'] == "WORLD", "Bunkered (Aviation)"].values[0]
 
-    # Replace zeros with NaN values using .loc
-    df.loc[df['Year'] == year, source] = df.loc[df['Year'] == year, source].replace(0, np.nan)
-
-    # Left join to get the 'REGION' column
-    df = df.merge(d.regionLookup[["Political Geography", "REGION"]], on="Political Geography", how="left")
-
-    df = df.merge(colormap, on="REGION", how="left")
-
-    # Clean the 'REGION' values
-    df.loc[df['REGION'] == "NONE", 'REGION'] = ""
-
-    # List of region values to filter
-    regions_to_filter = ["", "WORLD", "AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"]
-
-    # Filter out rows with specified 'REGION' values
-    df = df.loc[df['REGION'].isin(regions_to_filter),]
-
-    # Filter out rows for annex division using .loc
-    df = df.loc[~df['Political Geography'].isin(['ANNEX I', 'NON-ANNEX I'])]
-
-    # Select only the columns you need
-    df = df.loc[:,['Political Geography', 'REGION', source, 'COLOR', 'Year']]
+    # Keep the world, its regions and their countries (see components.utils.geography)
+    codes = geography.row_codes(df)
+    parents = geography.table['parent'].values[codes]
+    shown = (parents >= 0) | (codes == geography.world)
+    codes, parents = codes[shown], parents[shown]
 
-    # Create the 'sunburst' DataFrame
-    sunburst = pd.DataFrame()
+    bunkered = source in ["Fossil Fuel Energy and Cement Manufacture", "Fossil Fuel Energy (Supplied)", "Fossil Fuel Energy (Consumed)"]
 
-    # Assign columns from 'df' to 'sunburst'
-    sunburst["labels"] = df.loc[:,'Political Geography']
-    sunburst["parents"] = df.loc[:,'REGION']
-    sunburst["values"] = df.loc[:,source]
-    sunburst["colors"] = df.loc[:,'COLOR']
-    sunburst["year"] = df.loc[:,'Year']
+    labels = geography.table['label'].values
+    if bunkered:
+        # Change the world's title
+        labels = labels.copy()
+        labels[geography.world] = "<b>WORLD</b><br>(INCLUDES<br>INTERNATIONALLY<br>BUNKERED FUELS)"
 
-    # Fix Region Colors
+    # Create the 'sunburst' DataFrame (the world is the root, in the background color)
+    sunburst = pd.DataFrame({
+        "labels" : labels[codes],
+        "parents" : np.where(parents >= 0, labels[parents], ""),
+        "values" : df[source].values[shown],
+        "colors" : geography.table['color_' + theme].values[codes],
+    })
 
-    sunburst.loc[sunburst["labels"] == "WORLD", "colors"] = bg
-    sunburst.loc[sunburst["labels"] == "AFRICA", "colors"] = "#46C6E7"
-    sunburst.loc[sunburst["labels"] == "ASIA PACIFIC", "colors"] = "#616BB2"
-    sunburst.loc[sunburst["labels"] == "COMMONWEALTH OF INDEPENDENT STATES", "colors"] = "#8B69AD"
-    sunburst.loc[sunburst["labels"] == "MIDDLE EAST", "colors"] = "#F9A05B"
-    sunburst.loc[sunburst["labels"] == "NORTH AMERICA", "colors"] = "#EF563C"
-    sunburst.loc[sunburst["labels"] == "SOUTH AND CENTRAL AMERICA", "colors"] = "#F06591"
-    sunburst.loc[sunburst["labels"] == "EUROPE", "colors"] = "#41BB91"
+    # Replace zeros with NaN values
+    sunburst["values"] = sunburst["values"].replace(0, np.nan)
 
-    # Perform specific replacements based on the 'source' column using .loc
-    if source in ["Fossil Fuel Energy and Cement Manufacture", "Fossil Fuel Energy (Supplied)", "Fossil Fuel Energy (Consumed)"]:
+    if bunkered:
         # add bunkers
         bunkers = [
-            {'labels' : 'Bunkered<br>Fuels', 'parents' : 'WORLD', 'values' : world_bunkered, 'colors' : "blue"},
+            {'labels' : 'Bunkered<br>Fuels', 'parents' : labels[geography.world], 'values' : world_bunkered, 'colors' : "blue"},
             {'labels' : 'Bunkered<br>(Marine)<br>Fuels', 'parents' : 'Bunkered<br>Fuels', 'values' : world_bunkered_marine, 'colors' : "blue"},
             {'labels' : 'Bunkered<br>(Aviation)<br>Fuels', 'parents' : 'Bunkered<br>Fuels', 'values' : world_bunkered_aviation, 'colors' : "blue"},
             ]
@@ -169,127 +153,78 @@ def build_sunburst_data(source, fuel_type, year, bg) :
 
         sunburst = pd.concat([sunburst, bunkers_df], ignore_index=True)
 
-        # Change region titles
-        sunburst.loc[sunburst["labels"] == "WORLD", "labels"] = "<b>WORLD</b><br>(INCLUDES<br>INTERNATIONALLY<br>BUNKERED FUELS)"
-        sunburst.loc[sunburst["parents"] == "WORLD", "parents"] = "<b>WORLD</b><br>(INCLUDES<br>INTERNATIONALLY<br>BUNKERED FUELS)"
-
-    sunburst.loc[sunburst["labels"] == "COMMONWEALTH OF INDEPENDENT STATES", "labels"] = "COMMONWEALTH OF<br>INDEPENDENT STATES"
-    sunburst.loc[sunburst["parents"] == "COMMONWEALTH OF INDEPENDENT STATES", "parents"] = "COMMONWEALTH OF<br>INDEPENDENT STATES"
-    sunburst.loc[sunburst["labels"] == "SOUTH AND CENTRAL AMERICA", "labels"] = "SOUTH AND<br>CENTRAL AMERICA"
-    sunburst.loc[sunburst["parents"] == "SOUTH AND CENTRAL AMERICA", "parents"] = "SOUTH AND<br>CENTRAL AMERICA"
-
-    # change country titles
-    sunburst.loc[sunburst["labels"] == "UNITED STATES OF AMERICA", "labels"] = "UNITED STATES<br>OF AMERICA"
-    sunburst.loc[sunburst["labels"] == "RUSSIAN FEDERATION", "labels"] = "RUSSIAN<br>FEDERATION"
-    sunburst.loc[sunburst["labels"] == "ISLAMIC REPUBLIC OF IRAN", "labels"] = "ISLAMIC REPUBLIC<br>OF IRAN"
-
     return sunburst, plot_title, plot_subtitle
 
-def source_sunburst(source, fuel_type, theme):
+def source_frame(year, source, fuel_type, theme):
+    """
+    Returns the animation frame of one year (independent of the other years' frames).
+    """
+    textCol = themes.text_color[theme]
+    sunburst, _, _ = build_sunburst_data(source, fuel_type, year, theme)
+    return dict(
+        data=[dict(
+            type="sunburst",
+            labels=sunburst["labels"],
+            parents=sunburst["parents"],
+            values=sunburst["values"],
+            branchvalues="total",
+            insidetextorientation='horizontal',
+            marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5))
+        )],
+        name=str(year)
+    )
+
+def source_sunburst(source, fuel_type, theme, validate=None):
 
     # Define color and background based on the theme
-    if theme == 'light':
-        textCol = '#000'
-        bg = '#fff'
-    elif theme == 'dark':
-        textCol = '#fff'
-        bg = '#000'
+    # Theme colors (the rest of the styling is in the theme's template)
+    textCol = themes.text_color[theme]
 
     # Define years for the animation
     years = list(range(1995, 2021))
 
-    # Initialize the figure with subplots
-    fig = go.Figure()
-
     # Setup the initial sunburst chart for the first year
-    sunburst, plot_title, plot_subtitle = build_sunburst_data(source, fuel_type, years[-1], bg)
-    fig.add_trace(go.Sunburst(
+    sunburst, plot_title, plot_subtitle = build_sunburst_data(source, fuel_type, years[-1], theme)
+    fig = dict(data = [dict(
+        type="sunburst",
         labels=sunburst["labels"],
         parents=sunburst["parents"],
         values=sunburst["values"],
         branchvalues="total",
         insidetextorientation='horizontal',
-        marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5))
-    ))
+        marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5)),
+        textfont=dict(color=textCol),
+    )], layout = {})
 
     if d.show_credit :
         annotations=[
             # Credit
-            dict(
-                x=0.01,
-                y=0,
-                xref='paper',
-                yref='paper',
-                xanchor="left",
-                text='<b>The CDIAC at AppState Dashboard</b><br>Hefner and Marland (' + str(datetime.date.today().year) + ')',
-                showarrow=False,
-                align="left",
-                
-                font = dict(
-                    size=20,
-                    color = textCol
-                )
-            ),
+            themes.credit(x=0.01, y=0, xanchor="left", align="left"),
         ]
     else :
         annotations=[
         ]
 
-    fig.update_layout(
+    fig['layout'].update(
 
-        #uniformtext=dict(minsize=20, mode='hide'),
+        template=themes.template_name(theme),
 
-        plot_bgcolor=bg,
-        paper_bgcolor=bg,
+        #uniformtext=dict(minsize=20, mode='hide'),
 
         margin={'l': 0, 'r': 0, 't': 55, 'b': 0},
 
-        yaxis_title = "CO₂ Emissions (kilotonnes C)",
-
-        # Set the font size for the entire plot, excluding the title
-        font=dict(
-            size=20, 
-            color=textCol
-        ),
-
-        # Title Layout and Styling
-        title = dict(
-            text = plot_title.upper(),
-            xanchor="center",
-            xref = "container",
-            yref = "container",
-            x = 0.5,
-            yanchor="top",
-            y = .98,
-            font = dict(
-                size = 32,
-                color = textCol,
-            )
-        ),
+        title=dict(text=plot_title.upper()),
 
         annotations=annotations
     )
-    # Create frames for each year
-    frames = []
-    for year in years:
-        sunburst, _, _ = build_sunburst_data(source, fuel_type, year, bg)
-        frame = go.Frame(
-            data=[go.Sunburst(
-                labels=sunburst["labels"],
-                parents=sunburst["parents"],
-                values=sunburst["values"],
-                branchvalues="total",
-                insidetextorientation='horizontal',
-                marker=dict(colors=sunburst["colors"], line=dict(color=textCol, width=0.5))
-            )],
-            name=str(year)
-        )
-        frames.append(frame)
-
-    fig.frames = frames
+    # Create frames for each year (independently, see components.utils.year_frames)
+    fig['frames'] = year_frames.map_years(
+        functools.partial(source_frame, source=source, fuel_type=fuel_type, theme=theme),
+        years
+    )
 
     # Add a play button and a slider for the animation
-    fig.update_layout(
+    fig['layout'].update(
         updatemenus = [{ 
             'type': 'buttons',
             'direction': 'left',
@@ -324,6 +259,5 @@ def source_sunburst(source, fuel_type, theme):
         }]
     )
 
-    fig.update_traces(textfont=dict(color=textCol))
-    
-    return fig
\ No newline at end of file
+    # Sent without validation when the view is set up for it (see components.utils.raw_figure)
+    return raw_figure.finish(fig, 'source-sunburst', validate)
@@ -5,7 +5,7 @@ The plot is dynamically adjustable based on fuel type, emission source, and them
 
 Functions
 ---------
-source_ternary(source_a, source_b, fuel_type, grouping, theme)
+source_ternary(source_a, source_b, fuel_type, grouping, theme, validate=None)
     Constructs a ternary plot that visualizes the proportional relationships between two primary
     CO₂ emission sources and all other sources combined. The plot's appearance and data are
     configured according to user-selected criteria such as fuel type, grouping, and color theme.
@@ -22,6 +22,9 @@ grouping : str
     The geopolitical grouping for the analysis (e.g., 'region', 'world', 'annex').
 theme : str
     The theme setting (e.g., 'light', 'dark') which affects the color scheme of the ternary plot.
+validate : bool, optional
+    Whether the figure is built through `go.Figure` (validated) or sent as a dict; by default
+    as set for the source-ternary view in the `[raw_figures]` section (see `components.utils.raw_figure`).
 
 Returns
 -------
@@ -50,6 +53,7 @@ See Also
 --------
 plotly.graph_objects : Used for constructing complex interactive visualizations.
 components.utils.constants : Provides access to global constants and data sources used in the visualization.
+components.utils.geography : The political geographies' regions and colors.
 """
 
 
@@ -59,23 +63,15 @@ import datetime
 import numpy as np
 import pandas as pd
 from components.utils import constants as d
-import plotly.express as px
+from components.utils import ternary
+from components.utils import raw_figure
+from components.utils import themes
+from components.utils import geography
 
-def source_ternary(source_a, source_b, fuel_type, grouping, theme) :
+def source_ternary(source_a, source_b, fuel_type, grouping, theme, validate=None) :
 
-    if theme == 'light' :
-        textCol = '#000'
-        bg = '#fff'
-    if theme == 'dark' :
-        textCol = '#fff'
-        bg = '#000'
-
-    # Assign Region Colors
-    colormap = pd.DataFrame()
-
-    # Define Colors
-    colormap["REGION"] = ["NONE", "WORLD", "AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"]
-    colormap["COLOR"] = [bg, bg, "#46C6E7", "#616BB2", "#8B69AD", "#F9A05B", "#EF563C", "#F06591", "#41BB91"]
+    # Theme colors (the rest of the styling is in the theme's template)
+    textCol = themes.text_color[theme]
 
     # Set Data
     if fuel_type == 'solids':
@@ -99,10 +95,13 @@ def source_ternary(source_a, source_b, fuel_type, grouping, theme) :
     y_ann = 0.5
     showLegend = True
 
+    # Geography codes of the rows (see components.utils.geography)
+    codes = geography.row_codes(df)
+
     if grouping == "region" :
 
         # Set the regions aside for the other trace
-        df = df.loc[df['Political Geography'].isin(["AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"])]
+        df = df.loc[np.isin(codes, geography.codes_of(geography.world_regions))]
 
 
     elif grouping == "world" :
@@ -115,7 +114,7 @@ def source_ternary(source_a, source_b, fuel_type, grouping, theme) :
 
         y_ann = 1
 
-        df = df.loc[df['Political Geography'].isin(["WORLD"])]
+        df = df.loc[codes == geography.world]
 
     elif grouping == "annex" :
         
@@ -125,64 +124,46 @@ def source_ternary(source_a, source_b, fuel_type, grouping, theme) :
 
         y_ann = 0.75
 
-        df = df.loc[df['Political Geography'].isin(['ANNEX I', 'NON-ANNEX I'])]
+        df = df.loc[np.isin(codes, geography.codes_of(geography.annex_groups))]
 
     else :
 
-    # Define regions so they can be removed in the first trace
-        regions_to_filter = ['ANNEX I', 'NON-ANNEX I', "WORLD", "AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"]
-
-        # remove regions
-        df = df.loc[~df['Political Geography'].isin(regions_to_filter)]
+        # remove the world, regions and annex groups
+        df = df.loc[~geography.table['aggregate'].values[codes]]
 
         colorby = "Region"
 
     #df.loc[:,'Fossil Fuel Energy (Consumed)']
 
     # Replace empty records with 0
-    df.loc[:, source_a] = df.loc[:, source_a].replace(np.nan, 0)
-    df.loc[:, source_b] = df.loc[:, source_b].replace(np.nan, 0)
+    df = df.fillna({source_a: 0, source_b: 0})
 
-    # Join to get country region and color
-    df = df.merge(d.regionLookup[["Political Geography", "REGION"]], on="Political Geography", how="left")
-    df = df.merge(colormap, on="REGION", how="left")
+    # Each country's region
+    region = geography.table['region'].values[geography.row_codes(df)]
 
     # Remove countries with "ANTARTICA" as their region
-    df = df.loc[~df['REGION'].isin(["ANTARCTICA"])]
+    kept = region != "ANTARCTICA"
+    df, region = df.loc[kept], region[kept]
 
     # Create the ternary data frame for the countries trace
     ternary_df = pd.DataFrame()
-    ternary_df['Total'] = df.loc[:,'Fossil Fuel Energy (Consumed)'].values
-    ternary_df.loc[:, 'Total'] = ternary_df.loc[:, 'Total'].replace(np.nan, 0)
+    ternary_df['Total'] = df.loc[:,'Fossil Fuel Energy (Consumed)'].fillna(0).values
     ternary_df['size'] = np.sqrt(5 +  ternary_df['Total'])
     ternary_df[source_a] = df.loc[:,source_a].values
     ternary_df[source_b] = df.loc[:,source_b].values
     ternary_df['All Other Sources'] = ternary_df['Total'] - (ternary_df[source_a] + ternary_df[source_b])
-    ternary_df["colors"] = df.loc[:,'COLOR']
     ternary_df['Name'] = df.loc[:,'Political Geography'].values
-    ternary_df['Region'] = df.loc[:,'REGION'].values
+    ternary_df['Region'] = region
     ternary_df['Year '] = df.loc[:,'Year'].values
 
     #ternary_df.to_csv('ternary_df_debug.csv', index=False)
 
-    colormap = {
-        "NONE": bg,
-        "WORLD": textCol,
-        "ANNEX I" : "#7570b3",
-        "NON-ANNEX I" : "#1b9e77",
-        "AFRICA": "#46C6E7",
-        "ASIA PACIFIC": "#616BB2",
-        "COMMONWEALTH OF INDEPENDENT STATES": "#8B69AD",
-        "MIDDLE EAST": "#F9A05B",
-        "NORTH AMERICA": "#EF563C",
-        "SOUTH AND CENTRAL AMERICA": "#F06591",
-        "EUROPE": "#41BB91"
-    }
+    # Region and annex group colors; the world's point is drawn in the text color
+    colormap = dict(geography.color_of[theme], WORLD = textCol)
 
     def makeAxis(title, tickangle):
         return {
-        'title': title,
-        'titlefont': { 'size': 20 },
+        'title': { 'text': title, 'font': { 'size': 20 } },
         'tickangle': tickangle,
         'tickfont': { 'size': 15 },
         'linecolor': textCol,
@@ -193,33 +174,19 @@ def source_ternary(source_a, source_b, fuel_type, grouping, theme) :
         #'title_standoff' : standoff
         }
 
-    fig = go.Figure()
-
-    fig = px.scatter_ternary(
-        ternary_df, 
-        a=source_a, 
-        b=source_b, 
-        c="All Other Sources", 
-        size="size",
-        color=colorby, 
-        animation_frame="Year ",
-        color_discrete_map=colormap,
-        labels={"A": "A-axis", "B": "B-axis", "C": "C-axis"},
-        title="Ternary Plot with Animation", 
-        custom_data=["Name", "Total", "Region", source_a, source_b, "All Other Sources"],  # Include only these columns in hover data
-        hover_data={
-            'Name': True,       # Display the "Name" as is
-            'Total': True,      # Display the "Total" as is
-            'Region': False,     # Display the "Region" as is
-            source_a: True,         # Don't display the a-axis value
-            source_b: True,         # Don't display the b-axis value
-            'All Other Sources': True,         # Don't display the c-axis value
-            'size' : False
-        }
+    fig = ternary.animated_ternary(
+        ternary_df,
+        a=source_a,
+        b=source_b,
+        c="All Other Sources",
+        color=colorby,
+        color_map=colormap,
+        custom_data=["Name", "Total", "Region", source_a, source_b, "All Other Sources"],
+        hovertemplate='Name: <b>%{customdata[0]}</b><br>Total: %{customdata[1]}<br>' + source_a + ': %{customdata[3]}<br>' + source_b + ': %{customdata[4]}<br>All Other Sources: %{customdata[5]}'
         )
 
     # Show the plot
-    fig.update_layout({
+    fig['layout'].update({
         'ternary': {
             'sum': 1,
             'bgcolor': 'rgba(0,0,0,0)',
@@ -234,89 +201,22 @@ def source_ternary(source_a, source_b, fuel_type, grouping, theme) :
     if d.show_credit :
         annotations=[
             # Credit
-            dict(
-                x=1,
-                y=y_ann,
-                xref='paper',
-                yref='paper',
-                xanchor=xanchor_ann,
-                yanchor='top',
-                text='<b>The CDIAC at AppState Dashboard</b><br>Hefner and Marland (' + str(datetime.date.today().year) + ')',
-                showarrow=False,
-                align=align_ann,
-                
-                font = dict(
-                    size=20,
-                    color = textCol
-                )
-            ),
+            themes.credit(x=1, y=y_ann, xanchor=xanchor_ann, yanchor='top', align=align_ann),
         ]
 
 
-    fig.update_layout(
+    fig['layout'].update(
+
+        template=themes.template_name(theme),
 
         showlegend=showLegend,
 
-        plot_bgcolor=bg,
-        paper_bgcolor=bg,
-
-        #margin={'l': 0, 'r': 0, 't': 100, 'b': 0},
-
-        yaxis_title = "CO₂ Emissions (kilotonnes C)",
-
-        # Set the font size for the entire plot, excluding the title
-        font=dict(
-            size=20, 
-            color=textCol
-        ),
-
-        # Title Layout and Styling
-        title = dict(
-            text = plot_title.upper(),
-            xanchor="center",
-            xref = "container",
-            yref = "container",
-            x = 0.5,
-            yanchor="top",
-            y = .98,
-            font = dict(
-                size = 32,
-                color = textCol,
-            )
-        ),
+        title=dict(text=plot_title.upper()),
 
         # Subtitle
         annotations=annotations
 
     )
 
-    # These lines set the last frame
-    last_frame_num = len(fig.frames) -1
-    fig.layout['sliders'][0]['active'] = last_frame_num
-    fig = go.Figure(data=fig['frames'][-1]['data'], frames=fig['frames'], layout=fig.layout)
-
-    fig.update_layout(
-        hoverlabel=dict(
-        font_size=16,
-        font_family="Rockwell",
-        ),
-    )
-
-    fig["layout"].pop("updatemenus") # optional, drop animation buttons
-
-    # Define your marker customizations
-    marker_settings = dict(
-        line=dict(width=0),
-    )
-
-    # Update the marker settings for each frame
-    for frame in fig.frames:
-        for trace in frame.data:
-            trace.marker = marker_settings
-
-    # Also update the initial trace (first frame)
-    fig.update_traces(marker=marker_settings)
-
-    fig.update_traces(hovertemplate='Name: <b>%{customdata[0]}</b><br>Total: %{customdata[1]}<br>' + source_a + ': %{customdata[3]}<br>' + source_b + ': %{customdata[4]}<br>All Other Sources: %{customdata[5]}')
-
-    return fig
+    # Sent without validation when the view is set up for it (see components.utils.raw_figure)
+    return raw_figure.finish(fig, 'source-ternary', validate)
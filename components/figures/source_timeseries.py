@@ -53,42 +53,38 @@ components.utils.constants : Module where global constants and data sources are
 
 # Import needed libraries
 import plotly.express as px
+import pandas as pd
 import datetime
-import plotly.io as pio
 from components.utils import constants as d
+from components.utils import themes
 
 def source_timeseries(source, fuel_type, nation, theme):
 
-    pio.templates.default = "plotly_white"
-
     # Select Color Scale depending on fuel type and theme
     if fuel_type == 'solids':
-        df = d.df_solid
         plot_title = source + " <b>SOLID</b> CO₂ EMISSIONS"
         plot_subtitle = "FROM ENERGY USE OF <b>SOLID</b> FOSSIL FUELS"
     elif fuel_type == 'liquids':
-        df = d.df_liquid
         plot_title = source + " <b>LIQUID</b> FUEL CO₂ EMISSIONS"
         plot_subtitle = "FROM ENERGY USE OF <b>LIQUID</b> FOSSIL FUELS"
     elif fuel_type == 'gases':
-        df = d.df_gas
         plot_title = source + " <b>GAS</b> FUEL CO₂ EMISSIONS"
         plot_subtitle = "FROM ENERGY USE OF <b>GASEOUS</b> FOSSIL FUELS"
     else :
-        df = d.df_total
+        fuel_type = 'totals'
         plot_title = source + " TOTAL CO₂ EMISSIONS"
         plot_subtitle = ""
 
-    if theme == 'light' :
-        textCol = '#000'
-        bg = '#fff'
-    if theme == 'dark' :
-        textCol = '#fff'
-        bg = '#000'
-
-    df = df[df['Political Geography'].isin(nation)]
+    # Theme colors (the rest of the styling is in the theme's template)
+    textCol = themes.text_color[theme]
 
-    df = df.copy()
+    # The selected political geographies' rows, in sheet order (precomputed by fuel type in constants);
+    # unknown names are ignored
+    rows = d.df_by_geography[fuel_type]
+    df = pd.concat(
+        [rows[geography] for geography in sorted({geography for geography in nation if geography in rows}, key=d.geography_order.get)]
+        or [d.sheets[fuel_type].head(0)]
+    )
 
     # Define your custom color map for specific political geographies
     custom_color_map = {
@@ -103,11 +99,11 @@ def source_timeseries(source, fuel_type, nation, theme):
         # Add more specific mappings as needed
     }
 
-    # Default color sequence for other categories
+    # Default color sequence for other categories (a copy: plotly's own lists are shared by every build)
     if theme == "dark" :
-        default_color_sequence = px.colors.qualitative.Light24_r
+        default_color_sequence = list(px.colors.qualitative.Light24_r)
     else :
-        default_color_sequence = px.colors.qualitative.Dark24_r
+        default_color_sequence = list(px.colors.qualitative.Dark24_r)
 
     # Combine custom colors with the default sequence
     # Make sure the custom colors take precedence
@@ -118,51 +114,23 @@ def source_timeseries(source, fuel_type, nation, theme):
 
     fig = px.line(df, x='Year', y=source, color='Political Geography',
                 color_discrete_map=custom_color_map,  # Use the combined color map
+                template=themes.template_name(theme),
                 hover_data={'Political Geography': True, 'Year': False})
     
-    if d.show_credit :
-        annotations=[
-            # Subtitle
-            dict(
-                text= plot_subtitle,
-                showarrow=False,
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=1.04,
-                font=dict(size=18, color=textCol)
-            ),
+    # Subtitle
+    annotations=[dict(text=plot_subtitle, x=0.5, y=1.04, font=dict(size=18))]
 
+    if d.show_credit :
+        annotations.append(
             # Credit
             dict(
                 x=0.5,
                 y=-0.10,
-                xref='paper',
-                yref='paper',
                 xanchor = 'center',
                 yanchor = 'top',
                 text='The CDIAC at AppState Dashboard (' + str(datetime.date.today().year) + ')',
-                showarrow=False,
-                
-                font = dict(
-                    size=20,
-                    color = textCol
-                )
             )
-        ]
-    else :
-        annotations=[
-            # Subtitle
-            dict(
-                text= plot_subtitle,
-                showarrow=False,
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=1.04,
-                font=dict(size=18, color=textCol)
-            ),
-        ]
+        )
 
     # Define your custom line styles for specific political geographies
     line_styles = {
@@ -188,33 +156,12 @@ def source_timeseries(source, fuel_type, nation, theme):
 
     fig.update_layout(
 
-        plot_bgcolor=bg,
-        paper_bgcolor=bg,
-
         margin={'l': 0, 'r': 0, 't': 100, 'b': 100},
 
         yaxis_title = "CO₂ Emissions (kilotonnes C)",
 
-        # Set the font size for the entire plot, excluding the title
-        font=dict(
-            size=20, 
-            color = textCol  
-        ),
-
-        # Title Layout and Styling
-        title = dict(
-            text = plot_title.upper(),
-            xanchor="center",
-            xref = "container",
-            yref = "container",
-            x = 0.5,
-            yanchor="top",
-            y = .98,
-            font = dict(
-                size = 32,
-                color = textCol
-            )
-        ),
+        # Title (styled by the theme's template)
+        title = dict(text = plot_title.upper()),
 
         # Subtitle
         annotations=annotations
@@ -225,10 +172,6 @@ def source_timeseries(source, fuel_type, nation, theme):
 
     fig.update_layout(
         hovermode="closest",
-        hoverlabel=dict(
-        font_size=16,
-        font_family="Rockwell"
-        )
     )
     
     return fig
\ No newline at end of file
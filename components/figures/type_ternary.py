@@ -6,7 +6,7 @@ geopolitical grouping, and theme.
 
 Functions
 ---------
-type_ternary(source, grouping, theme)
+type_ternary(source, grouping, theme, validate=None)
     Constructs a ternary plot that visualizes the relative contributions of solid, liquid, and gas
     fuels to total CO₂ emissions, filtered by geopolitical grouping and styled according to the
     specified theme.
@@ -20,6 +20,9 @@ grouping : str
     the scope of the data included in the plot.
 theme : str
     The theme setting (e.g., 'light', 'dark') which affects the color scheme of the ternary plot.
+validate : bool, optional
+    Whether the figure is built through `go.Figure` (validated) or sent as a dict; by default
+    as set for the type-ternary view in the `[raw_figures]` section (see `components.utils.raw_figure`).
 
 Returns
 -------
@@ -49,6 +52,7 @@ See Also
 --------
 plotly.graph_objects : Used for constructing complex interactive visualizations.
 components.utils.constants : Provides access to global constants and data sources used in the visualization.
+components.utils.geography : The political geographies' regions and colors.
 """
 
 
@@ -58,41 +62,24 @@ import datetime
 import numpy as np
 import pandas as pd
 from components.utils import constants as d
-import plotly.express as px
-
-def type_ternary(source, grouping, theme) :
-
-    if theme == 'light' :
-        textCol = '#000'
-        bg = '#fff'
-    if theme == 'dark' :
-        textCol = '#fff'
-        bg = '#000'
-
-    # Assign Region Colors
-    colormap = pd.DataFrame()
-
-    # Define Colors
-    colormap["REGION"] = ["NONE", "WORLD", "AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"]
-    colormap["COLOR"] = [bg, bg, "#46C6E7", "#616BB2", "#8B69AD", "#F9A05B", "#EF563C", "#F06591", "#41BB91"]
-
-    # Create copies and rename the 'source' column in each copy
-    df_solid_copy = d.df_solid[['Political Geography', 'Year', source]].copy()
-    df_liquid_copy = d.df_liquid[['Political Geography', 'Year', source]].copy()
-    df_gas_copy = d.df_gas[['Political Geography', 'Year', source]].copy()
-    df_total_copy = d.df_total[['Political Geography', 'Year', source]].copy()
-
-    df_solid_copy = df_solid_copy.rename(columns={source: 'Solid'})
-    df_liquid_copy = df_liquid_copy.rename(columns={source: 'Liquid'})
-    df_gas_copy = df_gas_copy.rename(columns={source: 'Gas'})
-    df_total_copy = df_total_copy.rename(columns={source: 'Total'})
-
-    # Merge the copies of the DataFrames
-    df_merged = pd.merge(df_total_copy, df_solid_copy, on=['Political Geography', 'Year'], how='outer')
-    df_merged = pd.merge(df_merged, df_liquid_copy, on=['Political Geography', 'Year'], how='outer')
-    df_merged = pd.merge(df_merged, df_gas_copy, on=['Political Geography', 'Year'], how='outer')
-
-    df = df_merged
+from components.utils import ternary
+from components.utils import raw_figure
+from components.utils import themes
+from components.utils import geography
+
+def type_ternary(source, grouping, theme, validate=None) :
+
+    # Theme colors (the rest of the styling is in the theme's template)
+    textCol = themes.text_color[theme]
+
+    # The source on each sheet, side by side (the sheets share their rows, see
+    # components.utils.geography, so they are aligned by index)
+    df = d.df_total[['Political Geography', 'Year']].assign(
+        Total = d.df_total[source],
+        Solid = d.df_solid[source],
+        Liquid = d.df_liquid[source],
+        Gas = d.df_gas[source],
+    )
 
 
     # Set Title and credit properties
@@ -106,10 +93,13 @@ def type_ternary(source, grouping, theme) :
     y_ann = 0.5
     showLegend = True
 
+    # Geography codes of the rows (see components.utils.geography)
+    codes = geography.row_codes(df)
+
     if grouping == "region" :
 
         # Set the regions aside for the other trace
-        df = df.loc[df['Political Geography'].isin(["AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"])]
+        df = df.loc[np.isin(codes, geography.codes_of(geography.world_regions))]
 
 
     elif grouping == "world" :
@@ -122,7 +112,7 @@ def type_ternary(source, grouping, theme) :
 
         y_ann = 1
 
-        df = df.loc[df['Political Geography'].isin(["WORLD"])]
+        df = df.loc[codes == geography.world]
 
     elif grouping == "annex" :
         
@@ -132,66 +122,46 @@ def type_ternary(source, grouping, theme) :
 
         y_ann = 0.75
 
-        df = df.loc[df['Political Geography'].isin(['ANNEX I', 'NON-ANNEX I'])]
+        df = df.loc[np.isin(codes, geography.codes_of(geography.annex_groups))]
 
     else :
 
-    # Define regions so they can be removed in the first trace
-        regions_to_filter = ['ANNEX I', 'NON-ANNEX I', "WORLD", "AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"]
-
-        # remove regions
-        df = df.loc[~df['Political Geography'].isin(regions_to_filter)]
+        # remove the world, regions and annex groups
+        df = df.loc[~geography.table['aggregate'].values[codes]]
 
         colorby = "Region"
 
     #df.loc[:,'Fossil Fuel Energy (Consumed)']
 
     # Replace empty records with 0
-    df.loc[:, 'Total'] = df.loc[:, 'Total'].replace(np.nan, 0)
-    df.loc[:, 'Solid'] = df.loc[:, 'Solid'].replace(np.nan, 0)
-    df.loc[:, 'Liquid'] = df.loc[:, 'Liquid'].replace(np.nan, 0)
-    df.loc[:, 'Gas'] = df.loc[:, 'Gas'].replace(np.nan, 0)
+    df = df.fillna({'Total': 0, 'Solid': 0, 'Liquid': 0, 'Gas': 0})
 
-    # Join to get country region and color
-    df = df.merge(d.regionLookup[["Political Geography", "REGION"]], on="Political Geography", how="left")
-    df = df.merge(colormap, on="REGION", how="left")
+    # Each country's region
+    region = geography.table['region'].values[geography.row_codes(df)]
 
     # Remove countries with "ANTARTICA" as their region
-    df = df.loc[~df['REGION'].isin(["ANTARCTICA"])]
+    kept = region != "ANTARCTICA"
+    df, region = df.loc[kept], region[kept]
 
     # Create the ternary data frame for the countries trace
     ternary_df = pd.DataFrame()
     ternary_df['Total'] = df.loc[:,'Total'].values
-    ternary_df.loc[:, 'Total'] = ternary_df.loc[:, 'Total'].replace(np.nan, 0)
     ternary_df['size'] = np.sqrt(5 +  ternary_df['Total'])
     ternary_df['Solid'] = df.loc[:,'Solid'].values
     ternary_df['Liquid'] = df.loc[:,'Liquid'].values
     ternary_df['Gas'] = df.loc[:,'Gas'].values
-    ternary_df["colors"] = df.loc[:,'COLOR']
     ternary_df['Name'] = df.loc[:,'Political Geography'].values
-    ternary_df['Region'] = df.loc[:,'REGION'].values
+    ternary_df['Region'] = region
     ternary_df['Year '] = df.loc[:,'Year'].values
 
     #ternary_df.to_csv('ternary_df_debug.csv', index=False)
 
-    colormap = {
-        "NONE": bg,
-        "WORLD": textCol,
-        "ANNEX I" : "#7570b3",
-        "NON-ANNEX I" : "#1b9e77",
-        "AFRICA": "#46C6E7",
-        "ASIA PACIFIC": "#616BB2",
-        "COMMONWEALTH OF INDEPENDENT STATES": "#8B69AD",
-        "MIDDLE EAST": "#F9A05B",
-        "NORTH AMERICA": "#EF563C",
-        "SOUTH AND CENTRAL AMERICA": "#F06591",
-        "EUROPE": "#41BB91"
-    }
+    # Region and annex group colors; the world's point is drawn in the text color
+    colormap = dict(geography.color_of[theme], WORLD = textCol)
 
     def makeAxis(title, tickangle):
         return {
-        'title': title,
-        'titlefont': { 'size': 20 },
+        'title': { 'text': title, 'font': { 'size': 20 } },
         'tickangle': tickangle,
         'tickfont': { 'size': 15 },
         'linecolor': textCol,
@@ -201,33 +171,19 @@ def type_ternary(source, grouping, theme) :
         'showgrid': True,
         }
 
-    fig = go.Figure()
-
-    fig = px.scatter_ternary(
-        ternary_df, 
-        b='Solid', 
-        c='Liquid', 
-        a='Gas', 
-        size="size",
-        color=colorby, 
-        animation_frame="Year ",
-        color_discrete_map=colormap,
-        labels={"A": "A-axis", "B": "B-axis", "C": "C-axis"},
-        title="Ternary Plot with Animation", 
+    fig = ternary.animated_ternary(
+        ternary_df,
+        a='Gas',
+        b='Solid',
+        c='Liquid',
+        color=colorby,
+        color_map=colormap,
         custom_data=["Name", "Total", "Region", "Solid", "Liquid", "Gas"],
-        hover_data={
-            'Name': True,       # Display the "Name" as is
-            'Total': True,      # Display the "Total" as is
-            'Region': False,     # Display the "Region" as is
-            'Solid': True,         # Don't display the a-axis value
-            'Liquid': True,         # Don't display the b-axis value
-            'Gas': True,         # Don't display the c-axis value
-            'size' : False
-        }
+        hovertemplate='Name: <b>%{customdata[0]}</b><br>Total: %{customdata[1]}<br> Solid Fuel: %{customdata[3]}<br>Liquid Fuel: %{customdata[4]}<br>Gas Fuel: %{customdata[5]}'
         )
 
     # Show the plot
-    fig.update_layout({
+    fig['layout'].update({
         'ternary': {
             'sum': 1,
             'bgcolor': 'rgba(0,0,0,0)',
@@ -242,89 +198,22 @@ def type_ternary(source, grouping, theme) :
     if d.show_credit :
         annotations=[
             # Credit
-            dict(
-                x=1,
-                y=y_ann,
-                xref='paper',
-                yref='paper',
-                xanchor=xanchor_ann,
-                yanchor='top',
-                text='<b>The CDIAC at AppState Dashboard</b><br>Hefner and Marland (' + str(datetime.date.today().year) + ')',
-                showarrow=False,
-                align=align_ann,
-                
-                font = dict(
-                    size=20,
-                    color = textCol
-                )
-            ),
+            themes.credit(x=1, y=y_ann, xanchor=xanchor_ann, yanchor='top', align=align_ann),
         ]
 
 
-    fig.update_layout(
+    fig['layout'].update(
+
+        template=themes.template_name(theme),
 
         showlegend=showLegend,
 
-        plot_bgcolor=bg,
-        paper_bgcolor=bg,
-
-        #margin={'l': 0, 'r': 0, 't': 100, 'b': 0},
-
-        yaxis_title = "CO₂ Emissions (kilotonnes C)",
-
-        # Set the font size for the entire plot, excluding the title
-        font=dict(
-            size=20, 
-            color=textCol
-        ),
-
-        # Title Layout and Styling
-        title = dict(
-            text = plot_title.upper(),
-            xanchor="center",
-            xref = "container",
-            yref = "container",
-            x = 0.5,
-            yanchor="top",
-            y = .98,
-            font = dict(
-                size = 32,
-                color = textCol,
-            )
-        ),
+        title=dict(text=plot_title.upper()),
 
         # Subtitle
         annotations=annotations
 
     )
 
-    # These lines set the last frame
-    last_frame_num = len(fig.frames) -1
-    fig.layout['sliders'][0]['active'] = last_frame_num
-    fig = go.Figure(data=fig['frames'][-1]['data'], frames=fig['frames'], layout=fig.layout)
-
-    fig.update_layout(
-        hoverlabel=dict(
-        font_size=16,
-        font_family="Rockwell",
-        )
-    )
-
-    fig["layout"].pop("updatemenus") # optional, drop animation buttons
-
-    # Define your marker customizations
-    marker_settings = dict(
-        line=dict(width=0),
-    )
-
-    # Update the marker settings for each frame
-    for frame in fig.frames:
-        for trace in frame.data:
-            trace.marker = marker_settings
-
-    # Also update the initial trace (first frame)
-    fig.update_traces(marker=marker_settings)
-
-    fig.update_traces(hovertemplate='Name: <b>%{customdata[0]}</b><br>Total: %{customdata[1]}<br> Solid Fuel: %{customdata[3]}<br>Liquid Fuel: %{customdata[4]}<br>Gas Fuel: %{customdata[5]}')
-
-    return fig
+    # Sent without validation when the view is set up for it (see components.utils.raw_figure)
+    return raw_figure.finish(fig, 'type-ternary', validate)
@@ -0,0 +1,63 @@
+"""
+Provides the background callback manager used to build the heavy figures (the source
+sunburst and the two ternary animations) outside of the web worker.
+
+Background callbacks are started by one request and then polled by the browser, so a
+gunicorn worker is only occupied for a few milliseconds per poll instead of for the whole
+build.  The manager runs each build in a forked process and keeps the results in a local
+`diskcache` directory, so no Redis or Celery is required.
+
+Attributes
+----------
+manager : dash.DiskcacheManager
+    The background callback manager, passed to `dash.Dash` and to every background callback.
+
+directory : str
+    Where results are stored.  Shared by every worker on the machine, since a poll may be
+    answered by a different worker than the one that started the build.
+
+expire_seconds : int
+    Results that are never collected (e.g. the browser was closed) are removed after this long.
+
+poll_interval_ms : int
+    How often the browser asks for the result of a running build.
+
+Notes
+-----
+- Settings are read from the `[background]` section of rieee.conf:
+
+  [background]
+  directory = /tmp/cdiac-dashboard/background
+  expire_seconds = 600
+  poll_interval_ms = 500
+
+- A build is cancelled (its process terminated) when the navigation dropdown changes, or when
+  the same browser asks for a newer build of the same callback.
+- Builds run without a Flask request context, so profiling them needs `mode = always` in the
+  `[profiling]` section.
+
+See Also
+--------
+components.content_display.display_container : Where the background callback is defined.
+"""
+
+
+import os
+import tempfile
+import dash
+import diskcache
+from components.utils.config import cfg
+
+# Background callback settings (see module notes)
+directory = cfg.get(
+    'background', 'directory',
+    fallback=os.path.join(tempfile.gettempdir(), 'cdiac-dashboard', 'background')
+)
+expire_seconds = cfg.getint('background', 'expire_seconds', fallback=600)
+poll_interval_ms = cfg.getint('background', 'poll_interval_ms', fallback=500)
+
+# One result store per machine, one manager per worker
+manager = dash.DiskcacheManager(
+    diskcache.Cache(directory),
+    expire = expire_seconds,
+)
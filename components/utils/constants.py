@@ -36,6 +36,22 @@ df_gas : pandas.DataFrame
     DataFrame loaded with gas fuel CO₂ emissions data.
 regionLookup : pandas.DataFrame
     DataFrame containing mappings of countries to their respective regions, used for regional analysis and filtering.
+source_options : dict
+    The source dropdown's options, by sheet ('totals' or 'fuels') and by whether the stat
+    difference is offered ('all' or 'no_stat_difference').
+source_remap : dict
+    Every source mapped to its best match (`best_match_option`) on the totals sheet ('totals'),
+    the fuel type sheets ('fuels') and, unconditionally, the solids sheet ('solids').
+df_by_geography : dict
+    Each sheet's rows by fuel type ('totals', 'solids', 'liquids', 'gases') and political geography.
+df_long_by_geography : dict
+    The same, in long format (Political Geography, Year, Source, Carbon), with a 'Reported' flag
+    set for the sources with any emissions in the geography.
+geography_order : dict
+    Position of each political geography in the sheets.
+dataset_version : str
+    Short content hash of the data files loaded above.  Changes only when the data files change,
+    and is used to tell connected browsers (and caches) that the dataset was updated.
 about_content : str
     Content of the 'About' page, loaded from a markdown file.
 methodology_content : str
@@ -63,6 +79,7 @@ dash.html : For creating HTML components in the Dash application.
 # Import Dependencies
 import pandas as pd
 import math
+import hashlib
 import dash.html
 
 # IN-LINE APPLICATION METADATA----------------------------------------
@@ -401,6 +418,14 @@ df_gas = pd.read_excel('assets/data/' + data_file, sheet_name='GAS FUELS')
 # Load region lookup
 regionLookup = pd.read_excel('assets/data/Region_Lookup.xlsx')
 
+# Dataset version: a short hash of the data files that were just loaded.
+# Every worker that loaded the same files reports the same version.
+dataset_hash = hashlib.sha256()
+for dataset_file in ['assets/data/' + data_file, 'assets/data/Region_Lookup.xlsx']:
+    with open(dataset_file, 'rb') as file:
+        dataset_hash.update(file.read())
+dataset_version = dataset_hash.hexdigest()[:16]
+
 """ CLEAN DATA -----
 
 This section cleans the CDIAC data to be used easily by the dash application.
@@ -447,6 +472,75 @@ def best_match_option(value, fuel_type):
     return value
 
 
+# Source Option Tables------------------------------
+#
+# The source dropdown's options and the best match of every source on each
+# sheet, computed once here so that the dropdown can be updated in the browser
+# (see components/control_panel/controls/source_dropdown.py).
+
+# Sources that are not on the fuel type sheets
+totals_only_sources = ['Flaring of Natural Gas', 'Manufacture of Cement', 'Per Capita Total Emissions']
+
+# Source options for [totals or fuel type sheets][with or without the stat difference]
+source_options = {
+    sheet : {
+        with_stat_difference : [
+            {'label': col, 'value': col} for col in df_total.columns[2:]
+            if (sheet == 'totals' or col not in totals_only_sources) and
+            (with_stat_difference == 'all' or col != "Stat Difference (Supplied - Consumed)")
+        ]
+        for with_stat_difference in ['all', 'no_stat_difference']
+    }
+    for sheet in ['totals', 'fuels']
+}
+
+# Every source mapped to its best match on [totals, fuel type sheets, solids sheet]
+# ('solids' always remaps, as the type ternary does; the others only remap
+# sources missing from the sheet)
+source_remap = {
+    'totals' : {
+        col : col if col in df_total.columns else best_match_option(col, 'totals')
+        for col in list(df_total.columns[2:]) + list(df_solid.columns[2:])
+    },
+    'fuels' : {
+        col : col if col in df_gas.columns else best_match_option(col, 'solids')
+        for col in list(df_total.columns[2:]) + list(df_solid.columns[2:])
+    },
+    'solids' : {
+        col : best_match_option(col, 'solids')
+        for col in list(df_total.columns[2:]) + list(df_solid.columns[2:])
+    },
+}
+
+
+# Time Series Tables------------------------------
+#
+# Each sheet split by political geography, wide (as in the sheet) and long
+# (one row per year and source), so the time series figures look a
+# geography up instead of filtering and melting the sheet on every call.
+
+sheets = {'totals': df_total, 'solids': df_solid, 'liquids': df_liquid, 'gases': df_gas}
+
+# [fuel type][political geography] -> the geography's rows of the sheet
+df_by_geography = {
+    fuel_type : dict(tuple(sheet.groupby('Political Geography', sort=False)))
+    for fuel_type, sheet in sheets.items()
+}
+
+def long_by_geography(sheet):
+    # One row per geography, year and source, in the sheet's source order, with
+    # 'Reported' set on every row of a source with any emissions in the geography
+    df = pd.melt(sheet, id_vars=['Political Geography', 'Year'], var_name='Source', value_name='Carbon')
+    df['Reported'] = df.groupby(['Political Geography', 'Source'], sort=False)['Carbon'].transform('any')
+    return dict(tuple(df.groupby('Political Geography', sort=False)))
+
+# [fuel type][political geography] -> the geography's long table
+df_long_by_geography = {fuel_type : long_by_geography(sheet) for fuel_type, sheet in sheets.items()}
+
+# Political geography -> its position in the sheets (to keep the sheet order)
+geography_order = {geography : position for position, geography in enumerate(df_total['Political Geography'].unique())}
+
+
 # Read Markdown Pages-------------------------------
 
 # About page
@@ -0,0 +1,200 @@
+"""
+Keeps recently built figures in memory, in front of the shared disk cache, and warms the
+cache with the most common views when a worker starts, so that the first visitors after a
+deploy do not wait for cold builds.
+
+Functions
+---------
+cached_build(builder, *args, pool=False) -> object
+    Returns `builder(*args)`, from the cache when it has been built before.
+
+start_warmup(build_view)
+    Builds the configured warm-up views in a background thread.
+
+Attributes
+----------
+max_entries : int
+    Number of figures kept per worker; the least recently used are dropped first.
+
+warmup_enabled : bool
+    Whether `start_warmup` builds anything.
+
+warmup_views : list of dict
+    The views built by `start_warmup`: the control values of each, starting from the
+    controls' initial values.
+
+Notes
+-----
+- Settings are read from the `[figure_cache]` and `[warmup]` sections of rieee.conf.  Each
+  warm-up view is a navigation option followed by any control values that differ from the
+  initial ones, separated by `|`:
+
+  [figure_cache]
+  max_entries = 64
+
+  [warmup]
+  enabled = true
+  views =
+      carbon-atlas
+      carbon-atlas | theme=dark
+      political-geography-sunburst
+      source-sunburst | source=Fossil Fuel Energy (Supplied)
+
+- Misses are looked up in the shared disk cache (`components.utils.shared_cache`) and
+  otherwise built and stored there.  Both happen through `components.utils.single_flight`,
+  so concurrent misses share one build, and a warm-up running in every worker at once builds
+  each view only once.
+- Figures are rounded once, when built, by `components.utils.precision`.
+- Builds of the views listed in the `[process_pool]` section run in the worker's process pool
+  when it is enabled (see `components.utils.process_pool`).
+- Cached figures are shared by every request of the worker and must not be modified.
+- Each worker has its own in-memory cache.  Background callback processes are forked from a
+  worker and see what it had cached at the time (with a new lock, as the worker's may have
+  been held by another thread when it forked); what they build reaches the workers through
+  the shared disk cache.
+
+See Also
+--------
+components.content_display.display_container.figure_for : Where figures are requested.
+"""
+
+
+import os
+import time
+import logging
+import threading
+import collections
+from components.utils.config import cfg
+from components.utils import single_flight
+from components.utils import shared_cache
+from components.utils import process_pool
+from components.utils import precision
+from components.utils import constants as d
+
+# Figure cache settings (see module notes)
+max_entries = cfg.getint('figure_cache', 'max_entries', fallback=64)
+
+# Warm-up settings (see module notes)
+warmup_enabled = cfg.getboolean('warmup', 'enabled', fallback=True)
+
+# The controls' initial values; warm-up views only list what differs
+initial_controls = dict(
+    theme = 'light',
+    source = d.df_total.columns[2],
+    fuel_type = 'totals',
+    nation = 'WORLD',
+    source_a = "Electric, CHP, Heat Plants",
+    source_b = "Road Transport",
+    grouping = 'individual',
+)
+
+# The landing view first, then the most visited views
+default_warmup_views = """
+    carbon-atlas
+    carbon-atlas | theme=dark
+    political-geography-sunburst
+    political-geography-time-series
+    source-sunburst
+    type-ternary | source=Fossil Fuel Energy (Supplied)
+    source-ternary
+"""
+
+def parse_view(line):
+    # "nav-option | control=value | ..." -> control values for figure_for
+    nav_opt, *overrides = [part.strip() for part in line.split('|')]
+    view = dict(initial_controls, nav_opt = nav_opt)
+    for override in overrides:
+        control, value = override.split('=', 1)
+        view[control.strip()] = value.strip()
+    return view
+
+warmup_views = [
+    parse_view(line)
+    for line in cfg.get('warmup', 'views', fallback=default_warmup_views).splitlines()
+    if line.strip()
+]
+
+logger = logging.getLogger(__name__)
+
+cache = collections.OrderedDict()
+cache_lock = threading.Lock()
+
+
+def reset_after_fork():
+    # A thread of the parent (a request or the warm-up) may have held the lock when it forked
+    global cache_lock
+    cache_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=reset_after_fork)
+
+
+def cached_build(builder, *args, pool=False):
+    """
+    Returns `builder(*args)`, from the cache when it has been built before.
+
+    Parameters
+    ----------
+    builder : callable
+        A figure builder from `components.figures`.
+    *args
+        Its (JSON serializable) arguments.
+    pool : bool, optional
+        Whether a miss is built in the process pool (`components.utils.process_pool`).
+
+    Returns
+    -------
+    plotly.graph_objects.Figure or dict
+        The figure.
+    """
+    key = single_flight.figure_key(builder, args)
+
+    with cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+    def build():
+        # Another worker may have built it already
+        figure = shared_cache.get(key)
+        if figure is None:
+            figure = precision.reduce(process_pool.build(builder, *args) if pool else builder(*args))
+            shared_cache.put(key, figure)
+        return figure
+
+    # The shared cache passes results between processes, so single flight need not
+    figure = single_flight.single_flight(key, build, share_result=False)
+
+    with cache_lock:
+        cache[key] = figure
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
+    return figure
+
+
+def start_warmup(build_view):
+    """
+    Builds the warm-up views in a background (daemon) thread, so that the worker accepts
+    requests straight away.
+
+    Parameters
+    ----------
+    build_view : callable
+        Builds (and caches) the figure of a view, given its control values as keyword
+        arguments (`display_container.figure_for`).
+    """
+    if not warmup_enabled or not warmup_views:
+        return
+
+    def warm_up():
+        for view in warmup_views:
+            start = time.perf_counter()
+            try:
+                build_view(**view)
+            except Exception:
+                logger.exception("Warm-up of %s failed", view)
+                continue
+            logger.info("Warmed up %s in %.2f s", view['nav_opt'], time.perf_counter() - start)
+
+    threading.Thread(target=warm_up, name="figure-cache-warmup", daemon=True).start()
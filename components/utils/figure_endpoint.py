@@ -0,0 +1,166 @@
+"""
+Serves figure JSON from a cacheable GET endpoint, so that browsers (and any reverse proxy in
+front of gunicorn) can revalidate a figure they already have and receive a `304 Not Modified`
+instead of downloading it again.
+
+Figures are deterministic for a given data file and set of arguments, so each response carries
+a strong ETag derived from the dataset version, the figure's builder and its arguments.  The
+ETag is computed before anything is built: a revalidation costs neither a build nor a
+serialization.  The display container stores the path of each figure, and the browser
+fetches it (assets/js/figures.js).
+
+Functions
+---------
+figure_path(nav_opt, controls) -> str
+    Returns the path of a figure, relative to the application's url prefix.
+
+register_routes(server, url_prefix, is_authorized, resolve)
+    Adds the figure endpoint to the Flask server.
+
+Attributes
+----------
+route : str
+    The path of the endpoint, relative to the application's url prefix.
+
+cache_control : str
+    The `Cache-Control` header of figure responses.
+
+Notes
+-----
+- Settings are read from the `[figure_endpoint]` section of rieee.conf:
+
+  [figure_endpoint]
+  cache_control = no-cache
+
+  `no-cache` lets browsers and proxies store figures but makes them revalidate every use,
+  so every request still reaches the application and its authorization check.
+- ETags change with the dataset, the figure code (`single_flight.code_version`) and the
+  settings that change a figure's bytes, so browsers revalidate to new figures after a
+  deploy or a configuration change.
+- Paths have the form `_figures/<nav_opt>?view=<controls as JSON>`, with only the controls
+  the view's builder uses, so equal figures have equal URLs.
+- Builds are profiled when the request carries `X-Profile` (see `components.utils.profiling`).
+- When `typed_arrays.enabled`, browsers that add `typed=1` to the path receive the figure's
+  numeric arrays as base64 typed arrays (see `components.utils.typed_arrays`), under their
+  own ETag; otherwise the parameter is ignored.
+
+See Also
+--------
+components.content_display.display_container : Builds figure paths and resolves views.
+components.utils.figure_cache : Where figures are built and cached.
+assets/js/figures.js : Fetches figures in the browser.
+"""
+
+
+import json
+import hashlib
+import urllib.parse
+import flask
+import plotly.io
+from components.utils.config import cfg
+from components.utils import figure_cache
+from components.utils import single_flight
+from components.utils import process_pool
+from components.utils import typed_arrays
+from components.utils import profiling
+
+# Path of the endpoint (relative to the url prefix)
+route = "_figures"
+
+# Figure endpoint settings (see module notes)
+cache_control = cfg.get('figure_endpoint', 'cache_control', fallback='no-cache')
+
+
+def figure_path(nav_opt, controls):
+    """
+    Returns the path of a figure.
+
+    Parameters
+    ----------
+    nav_opt : str
+        The navigation option of the figure.
+    controls : dict
+        The control values its builder uses.
+
+    Returns
+    -------
+    str
+        The path, relative to the application's url prefix.
+    """
+    view = json.dumps(controls, sort_keys=True, separators=(',', ':'))
+    return route + "/" + nav_opt + "?" + urllib.parse.urlencode({'view': view})
+
+
+def valid_controls(controls):
+    # Control values are strings, lists of strings (multi-select dropdowns) or empty
+    return isinstance(controls, dict) and all(
+        value is None
+        or isinstance(value, str)
+        or (isinstance(value, list) and all(isinstance(item, str) for item in value))
+        for value in controls.values()
+    )
+
+
+@profiling.profile_slow_calls
+def build_figure(nav_opt, builder, args):
+    # The figure of a request, profiled when the request asks for it (see components.utils.profiling)
+    return figure_cache.cached_build(builder, *args, pool = nav_opt in process_pool.views)
+
+
+def figure_response(nav_opt, is_authorized, resolve):
+    if not is_authorized():
+        flask.abort(403)
+
+    try:
+        controls = json.loads(flask.request.args.get('view', ''))
+    except ValueError:
+        flask.abort(400)
+    if not valid_controls(controls):
+        flask.abort(400)
+
+    try:
+        builder, args = resolve(nav_opt, controls)
+    except KeyError:
+        flask.abort(404)
+
+    typed = typed_arrays.enabled and flask.request.args.get(typed_arrays.parameter) == '1'
+
+    # Strong validator: the same data, code, builder, arguments and encoding always give the
+    # same bytes (the figure key covers the data and code versions)
+    etag = hashlib.sha256(single_flight.figure_key(builder, args).encode('utf-8')).hexdigest()[:32]
+    if typed:
+        etag += '-typed' + str(typed_arrays.min_length)
+
+    if flask.request.if_none_match.contains(etag):
+        response = flask.Response(status=304)
+    else:
+        figure = build_figure(nav_opt, builder, args)
+        if typed:
+            figure = typed_arrays.encode(figure)
+        response = flask.Response(plotly.io.to_json(figure, validate=False), mimetype='application/json')
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def register_routes(server, url_prefix, is_authorized, resolve):
+    """
+    Adds the figure endpoint to the Flask server.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        The Flask server backing the Dash application (`app.server`).
+    url_prefix : str
+        The application's url prefix (the same one passed to `dash.Dash`).
+    is_authorized : callable
+        Returns True when the current request may see figures.
+    resolve : callable
+        Maps a navigation option and its controls to the figure's builder and arguments,
+        raising KeyError for unknown views (`display_container.resolve_view`).
+    """
+    server.add_url_rule(
+        url_prefix + route + "/<nav_opt>", "figure",
+        lambda nav_opt: figure_response(nav_opt, is_authorized, resolve)
+    )
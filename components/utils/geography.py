@@ -0,0 +1,167 @@
+"""
+The geography dimension table: one row per political geography of the sheets, with what the
+figures show of it (display label, ISO code, region, whether it is an aggregate and its colors
+on each theme), built once when the data is loaded.
+
+A geography's code is its row in the table.  Figures look up the codes of the sheet rows they
+draw (`row_codes`) and take labels, regions and colors from the table's columns by code,
+instead of mapping names and merging lookup tables on every call.
+
+Functions
+---------
+row_codes(df) -> numpy.ndarray
+    The geography codes of rows of the sheets.
+
+codes_of(names) -> numpy.ndarray
+    The codes of political geographies, by name.
+
+Attributes
+----------
+table : pandas.DataFrame
+    The geographies, indexed by code, in the order of the sheets.
+
+codes : pandas.Series
+    The geography code of every row of the sheets, indexed like them.
+
+code_of : dict
+    Political geography -> code.
+
+world : int
+    The code of the WORLD.
+
+world_regions : list of str
+    The regions the world is divided into.
+
+annex_groups : list of str
+    The Annex I and non-Annex I groups.
+
+aggregates : list of str
+    Geographies that sum others (the world, its regions, Antarctica and the annex groups).
+
+color_of : dict
+    Each theme's colors, by political geography (of the geographies that have one).
+
+Notes
+-----
+- The columns of `table`:
+
+  name : the political geography, as in the sheets
+  label : the name as displayed, broken over lines (`<br>`) where it is long
+  iso3 : ISO 3166-1 alpha-3 code (`components.utils.constants.location_mapping`); NaN where
+      there is none
+  region : the REGION of the geography in assets/data/Region_Lookup.xlsx; NaN where it is
+      not listed
+  parent : code of the geography the sunbursts draw it in (the world for its regions, a
+      region for its countries); -1 for the world and geographies outside the hierarchy
+  aggregate : whether the geography is one of `aggregates`
+  color_light, color_dark : the region color of a region and its countries, the group
+      color of an annex group and the theme's background for the world; NaN for the rest
+
+- Every sheet lists the same geographies and years in the same order, with the same index,
+  so one code per row serves them all and columns of different sheets line up by index;
+  this is checked when the table is built.
+
+See Also
+--------
+components.utils.constants : Loads the sheets and the region lookup.
+"""
+
+
+import numpy as np
+import pandas as pd
+from components.utils import constants as d
+from components.utils import themes
+
+world_regions = ["AFRICA", "ASIA PACIFIC", "COMMONWEALTH OF INDEPENDENT STATES", "MIDDLE EAST", "NORTH AMERICA", "SOUTH AND CENTRAL AMERICA", "EUROPE"]
+annex_groups = ["ANNEX I", "NON-ANNEX I"]
+aggregates = ["WORLD", "ANTARCTICA"] + world_regions + annex_groups
+
+# Colors of the regions (shared by their countries) and of the annex groups
+group_colors = {
+    "AFRICA": "#46C6E7",
+    "ASIA PACIFIC": "#616BB2",
+    "COMMONWEALTH OF INDEPENDENT STATES": "#8B69AD",
+    "MIDDLE EAST": "#F9A05B",
+    "NORTH AMERICA": "#EF563C",
+    "SOUTH AND CENTRAL AMERICA": "#F06591",
+    "EUROPE": "#41BB91",
+    "ANNEX I": "#7570b3",
+    "NON-ANNEX I": "#1b9e77",
+}
+
+# Names displayed over two lines
+labels = {
+    "COMMONWEALTH OF INDEPENDENT STATES": "COMMONWEALTH OF<br>INDEPENDENT STATES",
+    "SOUTH AND CENTRAL AMERICA": "SOUTH AND<br>CENTRAL AMERICA",
+    "UNITED STATES OF AMERICA": "UNITED STATES<br>OF AMERICA",
+    "RUSSIAN FEDERATION": "RUSSIAN<br>FEDERATION",
+    "ISLAMIC REPUBLIC OF IRAN": "ISLAMIC REPUBLIC<br>OF IRAN",
+}
+
+
+def build_table():
+    names = pd.Series(d.df_total['Political Geography'].unique())
+    region = names.map(d.regionLookup.set_index('Political Geography')['REGION'])
+
+    # Regions sit in the world and countries in their region
+    code_of_name = {name : code for code, name in enumerate(names)}
+    parent = region.map(lambda name: code_of_name[name] if name in world_regions + ["WORLD"] else -1)
+
+    table = pd.DataFrame({
+        'name' : names,
+        'label' : names.map(lambda name: labels.get(name, name)),
+        'iso3' : names.map(d.location_mapping),
+        'region' : region,
+        'parent' : parent.astype(int),
+        'aggregate' : names.isin(aggregates),
+    })
+    table.index.name = 'code'
+
+    for theme in themes.background:
+        color = region.map(group_colors)
+        color[names.isin(group_colors)] = names.map(group_colors)
+        color[names == "WORLD"] = themes.background[theme]
+        table['color_' + theme] = color
+
+    return table
+
+
+table = build_table()
+
+code_of = {name : code for code, name in table['name'].items()}
+world = code_of["WORLD"]
+
+color_of = {
+    theme : dict(table.loc[table['color_' + theme].notna(), ['name', 'color_' + theme]].values)
+    for theme in themes.background
+}
+
+# One code per row, the same for every sheet
+codes = pd.Series(d.df_total['Political Geography'].map(code_of).values, index=d.df_total.index)
+for sheet in [d.df_solid, d.df_liquid, d.df_gas]:
+    if not (sheet.index.equals(d.df_total.index) and sheet[['Political Geography', 'Year']].equals(d.df_total[['Political Geography', 'Year']])):
+        raise ValueError("the sheets do not list the same political geographies and years in the same order")
+
+
+def row_codes(df):
+    """
+    Returns the geography codes of rows of the sheets.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Rows of any of the sheets (or of a frame of their columns), with their index.
+
+    Returns
+    -------
+    numpy.ndarray
+        The code of each row's political geography.
+    """
+    return codes.loc[df.index].values
+
+
+def codes_of(names):
+    """
+    Returns the codes of political geographies, by name.
+    """
+    return np.array([code_of[name] for name in names])
@@ -0,0 +1,113 @@
+"""
+Provides a server-push channel that tells connected browsers when the dataset behind the
+dashboard has changed, replacing the old one-second `dcc.Interval` polling component.
+
+The channel is a Server-Sent Events (SSE) endpoint registered directly on the Flask server
+that backs the Dash application.  Each message carries `constants.dataset_version`; the
+browser side (assets/js/live_update.js) remembers the first version it sees and reloads the
+page only when a different version arrives.
+
+Functions
+---------
+register_routes(server, url_prefix)
+    Adds the dataset event stream route to the given Flask server.
+
+dataset_events() -> flask.Response
+    Streams the current dataset version to the browser as a Server-Sent Event.
+
+Attributes
+----------
+route : str
+    The path of the event stream, relative to the application's url prefix.
+
+hold_seconds : float
+    How long a stream is held open (sending keep-alive comments) before the server closes it.
+
+retry_seconds : float
+    How long the browser waits before reconnecting after a stream is closed.
+
+heartbeat_seconds : float
+    Interval between keep-alive comments while a stream is held open.
+
+Notes
+-----
+- The dataset is loaded once per worker at import time, so the version can only change when
+  workers restart with a new data file.  Restarting drops every open stream, the browser
+  reconnects, and the reconnect is what delivers the new version.  The server never polls.
+- With gunicorn's default sync workers an open stream occupies the whole worker, so the
+  default is to answer and close immediately (`hold_seconds = 0`) and let the browser
+  reconnect after `retry_seconds`.  With threaded workers the stream can be held open for
+  much longer, bringing idle request load to zero.
+- Settings are read from the `[live_update]` section of rieee.conf:
+
+  [live_update]
+  hold_seconds = 0
+  retry_seconds = 900
+  heartbeat_seconds = 15
+
+See Also
+--------
+components.utils.constants : Where the dataset version is computed.
+assets/js/live_update.js : The browser side of the channel.
+"""
+
+
+import time
+import flask
+from components.utils.config import cfg
+from components.utils import constants as d
+
+# Path of the event stream (relative to the url prefix)
+route = "_dataset-events"
+
+# Stream timing settings (see module notes)
+hold_seconds = cfg.getfloat('live_update', 'hold_seconds', fallback=0)
+retry_seconds = cfg.getfloat('live_update', 'retry_seconds', fallback=900)
+heartbeat_seconds = cfg.getfloat('live_update', 'heartbeat_seconds', fallback=15)
+
+
+def dataset_events():
+    """
+    Streams the current dataset version as a Server-Sent Event.
+
+    Returns
+    -------
+    flask.Response
+        A `text/event-stream` response carrying one `dataset-version` event, followed by
+        keep-alive comments until `hold_seconds` have passed.
+    """
+
+    def stream():
+        # Tell the browser how long to wait before reconnecting
+        yield "retry: " + str(int(retry_seconds * 1000)) + "\n"
+        yield "event: dataset-version\ndata: " + d.dataset_version + "\n\n"
+
+        # Hold the stream open (threaded workers only, see notes)
+        deadline = time.monotonic() + hold_seconds
+        while time.monotonic() < deadline:
+            time.sleep(max(0, min(heartbeat_seconds, deadline - time.monotonic())))
+            yield ": keep-alive\n\n"
+
+    return flask.Response(
+        stream(),
+        mimetype = "text/event-stream",
+        headers = {
+            'Cache-Control': 'no-cache',
+            # Stop reverse proxies from buffering the stream
+            'X-Accel-Buffering': 'no',
+        }
+    )
+
+
+def register_routes(server, url_prefix):
+    """
+    Adds the dataset event stream to the Flask server.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        The Flask server backing the Dash application (`app.server`).
+    url_prefix : str
+        The application's url prefix (the same one passed to `dash.Dash`).
+    """
+    server.add_url_rule(url_prefix + route, "dataset_events", dataset_events)
@@ -18,6 +18,14 @@ userIsAuthorized() -> bool
     if not, it further checks the user's permissions based on the SQL server's metadata.
     Returns True if the user is authorized, otherwise False.
 
+userIsAuthorizedCached() -> bool
+    `userIsAuthorized()`, remembered per user for `authorization_seconds`, for requests made
+    many times per session (e.g. every figure the browser fetches).
+
+userIsAdmin() -> bool
+    Determines if the current user is a RIEEE DataDash administrator, regardless of whether the application is public.
+    Used to guard administrative pages such as the captured profile listing.
+
 Examples
 --------
 >>> login_status = authenticaedLogin()
@@ -38,6 +46,15 @@ Notes
 -----
 - The module assumes the presence of a valid Flask request context to access request headers.
 - It interfaces with a SQL server managed by 'sqlconnection.py' for reading application and user-specific metadata.
+- `userIsAuthorizedCached` keeps each user's answer for `authorization_seconds`, set in the
+  `[login]` section of rieee.conf:
+
+  [login]
+  authorization_seconds = 300
+
+  A failed check (e.g. the data server is unreachable) denies the request and is not kept.
+- `userIsAdmin` likewise answers False when the data server is unreachable, instead of
+  letting sqlconnection's exit end the worker thread.
 
 See Also
 --------
@@ -46,8 +63,18 @@ components.utils.sqlconnection : For interactions with the SQL server managing a
 """
 
 
+import time
 import flask
+import threading
 import components.utils.sqlconnection as dataserver
+from components.utils.config import cfg
+
+# How long a user's authorization is remembered (see userIsAuthorizedCached)
+authorization_seconds = cfg.getfloat('login', 'authorization_seconds', fallback=300)
+
+# Shibboleth user -> (authorized, when it was checked)
+authorizations = {}
+authorizations_lock = threading.Lock()
 
 # INTERFACING WITH SHIBBOLETH SINGLE SIGN-ON AUTHENTICATION
 #
@@ -107,3 +134,51 @@ def userIsAuthorized():
     
     # otherwise... USER NOT AUTHORIZED
     return False
+
+# The figure endpoint authorizes every figure the browser fetches, so the
+# answer is remembered per user instead of asking the data server each time.
+def userIsAuthorizedCached():
+
+    username = authenticaedLogin()[1] if flask.has_request_context() else None
+    now = time.monotonic()
+
+    with authorizations_lock:
+        if username in authorizations:
+            authorized, checked = authorizations[username]
+            if now - checked < authorization_seconds:
+                return authorized
+
+    try:
+        authorized = userIsAuthorized()
+    except SystemExit:
+        # The data server could not be reached (sqlconnection exits);
+        # deny this request without ending the worker or remembering it
+        return False
+
+    with authorizations_lock:
+        authorizations[username] = (authorized, now)
+
+    return authorized
+
+# Administrative pages (e.g. captured profiles) are only for DataDash
+# admins, even when the application itself is public.
+def userIsAdmin():
+
+    # If there is no request context, there is no user
+    if not flask.has_request_context():
+        return False
+
+    # Get Log in information
+    login = authenticaedLogin()
+
+    if login[1] is None :
+        return False
+
+    try:
+        metadata = dataserver.get_authorization_metadata(login[1])
+    except SystemExit:
+        # The data server could not be reached (sqlconnection exits);
+        # deny this request without ending the worker
+        return False
+
+    return metadata[0][0][0].lower() == "true"
@@ -0,0 +1,315 @@
+"""
+Collects timing, payload-size and exception counters for every Dash callback and every
+figure request, and exposes them in the Prometheus text format on a `/metrics` route of the
+Flask server.
+
+Every server-side Dash callback (the display container, the control panel dropdowns, the
+theme toggles, `authorize`, ...) is answered by a POST to `_dash-update-component`, so the
+instrumentation is done once, with Flask request hooks on that route, instead of wrapping
+each `@dash.callback` by hand.  New callbacks are measured automatically.  Figures are built
+when the browser fetches them from the figure endpoint (`components.utils.figure_endpoint`),
+so the same hooks time that route too, per view.
+
+Functions
+---------
+register_routes(server, url_prefix)
+    Installs the request hooks and the `/metrics` route on the given Flask server.
+
+render() -> str
+    Renders all collected metrics in the Prometheus text exposition format.
+
+Attributes
+----------
+callback_duration : Histogram
+    Seconds spent answering each callback request, labelled by callback and navigation option.
+
+callback_response_bytes : Histogram
+    Size of each callback response body in bytes, labelled by callback and navigation option.
+
+callback_requests : Counter
+    Number of callback requests, labelled by callback and HTTP status.
+
+callback_exceptions : Counter
+    Number of callback requests that raised, labelled by callback and navigation option.
+
+figure_duration : Histogram
+    Seconds spent answering each figure request, labelled by view and HTTP status.
+
+figure_response_bytes : Histogram
+    Size of each figure response body in bytes, labelled by view and HTTP status.
+
+figure_exceptions : Counter
+    Number of figure requests that raised, labelled by view.
+
+Notes
+-----
+- The `callback` label is the callback's output as Dash names it (for example
+  `display_container.children`; multi-output callbacks are joined with commas).
+- The `nav` label is the value of the navigation dropdown when the callback takes it as an
+  input, so `source-sunburst` and `carbon-atlas` builds of the display container are
+  reported as separate series.  It is empty for callbacks that do not depend on navigation.
+- The `nav` label of figure metrics is the view in the figure's path, and `status` tells
+  builds and cache hits (200) from revalidations (304).  Requests that are refused (400,
+  403, 404) are counted without a view, so made-up paths do not add series.
+- Metrics are kept in memory per process.  Each gunicorn worker keeps its own counters and
+  adds its process id as the `worker` label, so series from different workers never collide.
+
+See Also
+--------
+application : Where the routes are registered on `app.server`.
+"""
+
+
+import os
+import time
+import threading
+import flask
+
+# Path of the metrics page (relative to the url prefix)
+route = "metrics"
+
+# Guards every metric update and the rendering of the page
+lock = threading.Lock()
+
+worker = str(os.getpid())
+
+
+def escape(value):
+    # Escape a label value for the Prometheus text format
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    return "{" + ",".join(name + '="' + escape(value) + '"' for name, value in labels) + "}"
+
+
+class Counter:
+    """
+    A monotonically increasing count, kept separately for each combination of label values.
+    """
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values = {}
+
+    def inc(self, *labelvalues):
+        with lock:
+            self.values[labelvalues] = self.values.get(labelvalues, 0) + 1
+
+    def render(self):
+        lines = [
+            "# HELP " + self.name + " " + self.documentation,
+            "# TYPE " + self.name + " counter",
+        ]
+        for labelvalues, value in sorted(self.values.items()):
+            labels = list(zip(self.labelnames, labelvalues)) + [("worker", worker)]
+            lines.append(self.name + format_labels(labels) + " " + str(value))
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative bucket counts, sum and count of observations, kept separately for each
+    combination of label values.
+    """
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.values = {}
+
+    def observe(self, amount, *labelvalues):
+        with lock:
+            if labelvalues not in self.values:
+                self.values[labelvalues] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            series = self.values[labelvalues]
+            for i, bound in enumerate(self.buckets):
+                if amount <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += amount
+            series['count'] += 1
+
+    def render(self):
+        lines = [
+            "# HELP " + self.name + " " + self.documentation,
+            "# TYPE " + self.name + " histogram",
+        ]
+        for labelvalues, series in sorted(self.values.items()):
+            labels = list(zip(self.labelnames, labelvalues)) + [("worker", worker)]
+            for bound, count in zip(self.buckets, series['buckets']):
+                lines.append(self.name + "_bucket" + format_labels(labels + [("le", repr(float(bound)))]) + " " + str(count))
+            lines.append(self.name + "_bucket" + format_labels(labels + [("le", "+Inf")]) + " " + str(series['count']))
+            lines.append(self.name + "_sum" + format_labels(labels) + " " + repr(series['sum']))
+            lines.append(self.name + "_count" + format_labels(labels) + " " + str(series['count']))
+        return lines
+
+
+callback_duration = Histogram(
+    "dash_callback_duration_seconds",
+    "Time spent answering Dash callback requests.",
+    ("callback", "nav"),
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+callback_response_bytes = Histogram(
+    "dash_callback_response_bytes",
+    "Size of Dash callback response bodies.",
+    ("callback", "nav"),
+    (1e3, 1e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7),
+)
+
+callback_requests = Counter(
+    "dash_callback_requests_total",
+    "Dash callback requests by HTTP status.",
+    ("callback", "status"),
+)
+
+callback_exceptions = Counter(
+    "dash_callback_exceptions_total",
+    "Dash callback requests that raised an exception.",
+    ("callback", "nav"),
+)
+
+figure_duration = Histogram(
+    "dash_figure_duration_seconds",
+    "Time spent answering figure endpoint requests.",
+    ("nav", "status"),
+    callback_duration.buckets,
+)
+
+figure_response_bytes = Histogram(
+    "dash_figure_response_bytes",
+    "Size of figure endpoint response bodies.",
+    ("nav", "status"),
+    callback_response_bytes.buckets,
+)
+
+figure_exceptions = Counter(
+    "dash_figure_exceptions_total",
+    "Figure endpoint requests that raised an exception.",
+    ("nav",),
+)
+
+
+def callback_labels(body):
+    """
+    Finds the callback name and navigation option of a `_dash-update-component` request body.
+    """
+    if not isinstance(body, dict):
+        return "unknown", ""
+
+    # "..a.b...c.d.." (multi-output) -> "a.b,c.d"
+    callback = str(body.get('output', 'unknown')).strip('.').replace('...', ',')
+
+    nav = ""
+    for dependency in (body.get('inputs') or []) + (body.get('state') or []):
+        if not isinstance(dependency, dict):
+            continue
+        if dependency.get('id') == 'navigation-dropdown-controler':
+            nav = str(dependency.get('value'))
+        elif dependency.get('id') == 'control-state' and isinstance(dependency.get('value'), dict):
+            # The settled control state (components/control_panel/controls_container.py)
+            nav = str(dependency['value'].get('nav_opt'))
+
+    return callback, nav
+
+
+def figure_nav(status=None):
+    """
+    Finds the view of a figure endpoint request, or "" when it was refused.
+    """
+    if status in (400, 403, 404):
+        return ""
+    return str((flask.request.view_args or {}).get('nav_opt', ""))
+
+
+def is_callback_request():
+    return flask.request.path.endswith('_dash-update-component')
+
+
+def is_figure_request():
+    # The endpoint name given in components.utils.figure_endpoint.register_routes
+    return flask.request.endpoint == 'figure'
+
+
+def response_size(response):
+    size = response.content_length
+    if size is None and not response.is_streamed:
+        size = len(response.get_data())
+    return size or 0
+
+
+def start_timer():
+    if is_callback_request() or is_figure_request():
+        flask.g.callback_start = time.perf_counter()
+
+
+def record_response(response):
+    if 'callback_start' not in flask.g:
+        return response
+
+    elapsed = time.perf_counter() - flask.g.callback_start
+    if is_callback_request():
+        callback, nav = callback_labels(flask.request.get_json(silent=True))
+        callback_duration.observe(elapsed, callback, nav)
+        callback_response_bytes.observe(response_size(response), callback, nav)
+        callback_requests.inc(callback, str(response.status_code))
+    elif is_figure_request():
+        nav, status = figure_nav(response.status_code), str(response.status_code)
+        figure_duration.observe(elapsed, nav, status)
+        figure_response_bytes.observe(response_size(response), nav, status)
+    return response
+
+
+def record_exception(exception):
+    if exception is None:
+        return
+    if is_callback_request():
+        callback, nav = callback_labels(flask.request.get_json(silent=True))
+        callback_exceptions.inc(callback, nav)
+    elif is_figure_request():
+        figure_exceptions.inc(figure_nav())
+
+
+def render():
+    """
+    Renders every metric in the Prometheus text exposition format.
+
+    Returns
+    -------
+    str
+        The metrics page body.
+    """
+    with lock:
+        lines = []
+        for metric in [
+            callback_duration, callback_response_bytes, callback_requests, callback_exceptions,
+            figure_duration, figure_response_bytes, figure_exceptions,
+        ]:
+            lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def metrics_page():
+    return flask.Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def register_routes(server, url_prefix):
+    """
+    Installs the callback and figure request hooks and the metrics page on the Flask server.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        The Flask server backing the Dash application (`app.server`).
+    url_prefix : str
+        The application's url prefix (the same one passed to `dash.Dash`).
+    """
+    server.before_request(start_timer)
+    server.after_request(record_response)
+    server.teardown_request(record_exception)
+    server.add_url_rule(url_prefix + route, "metrics", metrics_page)
@@ -0,0 +1,158 @@
+"""
+Rounds the numbers of a figure before it is cached and sent, so that values computed in
+float64 (marker sizes, proportions, per capita emissions, colorscale stops) are not written
+out with 17 significant digits in every trace and frame.
+
+The policy keeps `significant_digits` significant digits, but never rounds to more than a
+whole unit: emissions (whole kilotonnes in the data) are sent exactly as they are, while
+fractions lose only the digits no chart or hover label can show.  Whole numbers are written
+as integers (`559480` rather than `559480.0`).
+
+Functions
+---------
+reduce(figure) -> dict
+    Returns the figure as a dict with its numbers rounded.
+
+round_array(values) -> numpy.ndarray
+    Rounds a float array according to the policy.
+
+Attributes
+----------
+significant_digits : int
+    Significant digits kept (0 keeps every digit).
+
+Notes
+-----
+- Settings are read from the `[precision]` section of rieee.conf:
+
+  [precision]
+  significant_digits = 6
+
+- Rounding is applied once per figure, when `components.utils.figure_cache` builds it, so
+  cached figures (in memory, on disk and through the figure endpoint) are all rounded alike.
+  `significant_digits` is part of every figure key (`single_flight.figure_key`), so figures
+  cached with other settings, or before rounding, are not served.
+- The figure is not modified: rounded arrays are new, and anything else is shared with it.
+- Numbers below 1e-15 in magnitude are left as they are.
+- Float arrays holding only whole numbers become integer arrays, or object arrays of integers
+  and None where they hold NaN (sent as `null`, as NaN is).
+- `python -m tools.payload_budget` measures figures as rounded here.
+
+See Also
+--------
+components.utils.figure_cache : Where figures are rounded.
+"""
+
+
+import math
+import numpy as np
+import pandas as pd
+from components.utils.config import cfg
+
+# Precision settings (see module notes)
+significant_digits = cfg.getint('precision', 'significant_digits', fallback=6)
+
+# Past this many decimals, numbers are left alone
+max_decimals = 15
+
+# Whole numbers up to this magnitude are exact as integers
+max_whole = 2.0 ** 53
+
+
+def decimals_of(magnitude):
+    # Decimals that keep `significant_digits` digits of a number of this magnitude, never negative
+    return max(0, significant_digits - 1 - magnitude)
+
+
+def round_float(value):
+    if not math.isfinite(value):
+        return value
+    if value.is_integer() and abs(value) < max_whole:
+        return int(value)
+    decimals = decimals_of(math.floor(math.log10(abs(value))))
+    if decimals > max_decimals:
+        return value
+    value = round(value, decimals)
+    return int(value) if value.is_integer() else value
+
+
+def whole(values):
+    # Float arrays of whole numbers as integers (NaN as None)
+    finite = np.isfinite(values)
+    if not np.array_equal(values[finite], np.trunc(values[finite])) or np.any(np.abs(values[finite]) >= max_whole):
+        return values
+    if finite.all():
+        return values.astype(np.int64)
+    if np.isinf(values).any():
+        return values
+    integers = np.where(finite, values, 0).astype(np.int64).astype(object)
+    integers[~finite] = None
+    return integers
+
+
+def round_array(values):
+    """
+    Rounds a float array according to the policy.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        A float array (of any shape).
+
+    Returns
+    -------
+    numpy.ndarray
+        A new array with each value rounded to `significant_digits` significant digits, but
+        not past the units; integers when every value is whole.
+    """
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    rounds = np.isfinite(values) & (magnitude > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimals = np.where(rounds, significant_digits - 1 - np.floor(np.log10(magnitude)), 0)
+    decimals = np.maximum(decimals, 0)
+    rounds &= decimals <= max_decimals
+
+    scale = 10.0 ** np.where(rounds, decimals, 0)
+    return whole(np.where(rounds, np.round(values * scale) / scale, values))
+
+
+def rounded(value):
+    if isinstance(value, dict):
+        return {key: rounded(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [rounded(item) for item in value]
+    if isinstance(value, pd.Series):
+        value = value.values
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f':
+            return round_array(value)
+        if value.dtype.kind == 'O':
+            return np.array([rounded(item) for item in value.ravel()], dtype=object).reshape(value.shape)
+        return value
+    if isinstance(value, (float, np.floating)):
+        return round_float(float(value))
+    return value
+
+
+def reduce(figure):
+    """
+    Returns the figure as a dict with its numbers rounded.
+
+    Parameters
+    ----------
+    figure : plotly.graph_objects.Figure or dict
+        The figure, as a builder returned it.
+
+    Returns
+    -------
+    plotly.graph_objects.Figure or dict
+        The figure unchanged when `significant_digits` is 0; otherwise a dict with the same
+        content, its numbers rounded.
+    """
+    if significant_digits <= 0:
+        return figure
+    if hasattr(figure, 'to_plotly_json'):
+        figure = figure.to_plotly_json()
+    return rounded(figure)
@@ -0,0 +1,269 @@
+"""
+Builds figures in a pool of separate processes, so that several CPU-heavy builds requested of
+one gunicorn worker (e.g. a few atlases or sunburst animations at once on its threads) run in
+parallel instead of taking turns holding the worker's interpreter lock.
+
+The pool is optional and off by default.  When it is enabled, `figure_cache.cached_build`
+sends the builds of the configured views to it; everything else about a build (the caches,
+single flight) is unchanged.
+
+Functions
+---------
+build(builder, *args) -> object
+    Returns `builder(*args)`, built in the pool when it has room.
+
+map_in_pool(function, items) -> list
+    Returns `[function(item) for item in items]`, calling it in the pool for as many items as
+    it has room for.
+
+available() -> bool
+    Whether this process may use the pool.
+
+Attributes
+----------
+enabled : bool
+    Whether builds are sent to the pool.
+
+views : set of str
+    Navigation options whose figures are built in the pool.
+
+processes : int
+    Processes in the pool of each worker.
+
+max_pending : int
+    Builds a worker may have queued or running in its pool at once.
+
+timeout_seconds : float
+    How long a request waits for a build in the pool.
+
+Notes
+-----
+- Settings are read from the `[process_pool]` section of rieee.conf:
+
+  [process_pool]
+  enabled = false
+  processes = 2
+  max_pending = 8
+  timeout_seconds = 120
+  views = carbon-atlas, political-geography-sunburst
+
+- Only views built in a worker can use the pool: the carbon atlas, the political
+  geography sunburst and the time series.  The heavy views (`display_container.heavy_views`:
+  the source sunburst and both ternaries) are built by a background callback, in a process
+  forked from the worker, which builds in-process; the figure endpoint then serves them from
+  the cache.  Listing them here only helps when the endpoint misses that cache.
+- Pool processes are forked from a fork server that has imported the figure builders, and
+  so loaded the dataset, once: a pool process starts with the data in memory, and forking
+  it does not copy the threads of the gunicorn worker.
+- Each worker starts its own pool with its first build in the pool.  Background callback
+  processes, forked from a worker, build in-process: they are already outside the worker.
+- When `max_pending` builds are already in the pool, further builds run in the calling
+  thread, as they would without the pool.  If a pool process dies, the pool is replaced and
+  the build runs in the calling thread.
+- A build that takes longer than `timeout_seconds` raises `TimeoutError`, and the request
+  fails without caching anything.  A build already running cannot be interrupted; it keeps
+  its pool process (and its place in `max_pending`) until it finishes.
+- `map_in_pool` (used by `components.utils.year_frames`) sends each item as its own task, under
+  the same `max_pending` limit: items the pool has no room for, and items whose pool process
+  died, are called in the calling thread.  All of them must finish within `timeout_seconds`.
+- Figures come back as dicts (`go.Figure.to_plotly_json()`), which serialize to the same JSON
+  without being validated again.
+
+See Also
+--------
+components.utils.figure_cache : Sends builds here.
+components.utils.background : Builds the heavy views outside the web worker for Dash callbacks.
+"""
+
+
+import os
+import time
+import pkgutil
+import logging
+import threading
+import multiprocessing
+import concurrent.futures
+import concurrent.futures.process
+import plotly.graph_objects as go
+import components.figures
+from components.utils.config import cfg
+
+# Process pool settings (see module notes)
+enabled = cfg.getboolean('process_pool', 'enabled', fallback=False)
+processes = cfg.getint('process_pool', 'processes', fallback=2)
+max_pending = cfg.getint('process_pool', 'max_pending', fallback=8)
+timeout_seconds = cfg.getfloat('process_pool', 'timeout_seconds', fallback=120)
+views = {
+    view.strip()
+    for view in cfg.get(
+        'process_pool', 'views',
+        fallback='carbon-atlas, political-geography-sunburst'
+    ).split(',')
+    if view.strip()
+}
+
+# The fork server imports every figure builder (and with them the dataset) before forking
+preload = ['components.utils.constants'] + [
+    'components.figures.' + module.name for module in pkgutil.iter_modules(components.figures.__path__)
+]
+
+logger = logging.getLogger(__name__)
+
+executor = None
+executor_lock = threading.Lock()
+pending = threading.BoundedSemaphore(max_pending)
+
+# Set in processes forked from a worker (background callbacks) and in the pool's own
+# processes, which build in-process
+forked = False
+in_pool = False
+
+
+def reset_after_fork():
+    global executor, executor_lock, forked
+    executor = None
+    executor_lock = threading.Lock()
+    forked = True
+
+os.register_at_fork(after_in_child=reset_after_fork)
+
+
+def mark_pool_process():
+    global in_pool
+    in_pool = True
+
+
+def available():
+    """
+    Returns whether this process may use the pool: only gunicorn workers (and other processes
+    that are neither forked from one nor part of the pool) may.
+    """
+    return not forked and not in_pool
+
+
+def get_executor():
+    global executor
+    with executor_lock:
+        if executor is None:
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(preload)
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes, mp_context=context, initializer=mark_pool_process
+            )
+        return executor
+
+
+def drop_executor(broken):
+    global executor
+    with executor_lock:
+        if executor is broken:
+            executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def run(builder, args):
+    # In the pool process
+    figure = builder(*args)
+    return figure.to_plotly_json() if isinstance(figure, go.Figure) else figure
+
+
+def submit(function, *args):
+    # Queues function(*args) in the pool: (pool, future), or None when the pool is full or broken
+    if not available() or not pending.acquire(blocking=False):
+        return None
+
+    pool = get_executor()
+    try:
+        future = pool.submit(function, *args)
+    except concurrent.futures.process.BrokenProcessPool:
+        pending.release()
+        drop_executor(pool)
+        return None
+    future.add_done_callback(lambda _: pending.release())
+    return pool, future
+
+
+def build(builder, *args):
+    """
+    Returns `builder(*args)`, built in the pool when it is enabled and has room.
+
+    Parameters
+    ----------
+    builder : callable
+        A figure builder from `components.figures` (a module-level function).
+    *args
+        Its arguments (picklable).
+
+    Returns
+    -------
+    plotly.graph_objects.Figure or dict
+        The figure; a dict when it was built in the pool.
+
+    Raises
+    ------
+    TimeoutError
+        When the build did not finish in the pool within `timeout_seconds`.
+    """
+    submitted = submit(run, builder, args) if enabled else None
+    if submitted is None:
+        return builder(*args)
+    pool, future = submitted
+
+    try:
+        return future.result(timeout=timeout_seconds)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        logger.warning("Build of %s%r timed out in the process pool", builder.__name__, args)
+        raise TimeoutError("figure build timed out after " + str(timeout_seconds) + " s")
+    except concurrent.futures.process.BrokenProcessPool:
+        logger.exception("The process pool broke during a build of %s%r", builder.__name__, args)
+        drop_executor(pool)
+        return builder(*args)
+
+
+def map_in_pool(function, items):
+    """
+    Returns `[function(item) for item in items]`, calling it in the pool for as many items as
+    it has room for (whether or not `enabled` is set).
+
+    Parameters
+    ----------
+    function : callable
+        A picklable function (module-level, or a `functools.partial` of one).
+    items : list
+        Its (picklable) arguments.
+
+    Returns
+    -------
+    list
+        The results, in the order of `items`.
+
+    Raises
+    ------
+    TimeoutError
+        When the items did not all finish within `timeout_seconds`.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    submissions = [submit(function, item) for item in items]
+
+    results = []
+    for item, submitted in zip(items, submissions):
+        if submitted is None:
+            # No room in the pool: call it here while the pool works on the others
+            results.append(function(item))
+            continue
+        pool, future = submitted
+
+        try:
+            results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+        except concurrent.futures.TimeoutError:
+            for _, queued in filter(None, submissions):
+                queued.cancel()
+            logger.warning("Calls of %r timed out in the process pool", function)
+            raise TimeoutError("calls timed out after " + str(timeout_seconds) + " s")
+        except concurrent.futures.process.BrokenProcessPool:
+            logger.exception("The process pool broke during calls of %r", function)
+            drop_executor(pool)
+            results.append(function(item))
+
+    return results
@@ -0,0 +1,271 @@
+"""
+Opt-in profiling of slow figure builds.  When profiling is requested, a decorated function
+(the figure endpoint's `build_figure`) runs under cProfile, and any call slower than
+a threshold has its profile saved along with the navigation option and arguments it was
+called with.  A small admin page lists the slowest captured profiles.
+
+Functions
+---------
+profile_slow_calls(func) -> callable
+    Decorator that profiles `func` whenever profiling is requested and keeps slow profiles.
+
+profiling_requested() -> bool
+    Whether the current call should be profiled (by configuration or request header).
+
+register_routes(server, url_prefix, is_admin)
+    Adds the admin pages listing and showing captured profiles to the Flask server.
+
+Attributes
+----------
+mode : str
+    'off' (never profile), 'header' (profile requests carrying the `X-Profile` header) or
+    'always' (profile every call).
+
+threshold_seconds : float
+    Calls that take at least this long have their profile kept.
+
+keep : int
+    Number of profiles kept; the fastest are discarded first.
+
+directory : str
+    Where profiles are written.  Shared by every worker on the machine, so the admin page
+    shows profiles captured by any of them.
+
+Notes
+-----
+- Settings are read from the `[profiling]` section of rieee.conf:
+
+  [profiling]
+  mode = header
+  threshold_seconds = 1.0
+  keep = 50
+  directory = /tmp/cdiac-dashboard/profiles
+
+- Each capture is a pair of files: `<id>.prof` (loadable with `pstats` or snakeviz) and
+  `<id>.json` (duration, navigation option and arguments).
+- Only one call per process is profiled at a time; concurrent calls run unprofiled.
+- The admin pages are guarded by the `is_admin` callable given to `register_routes`.
+
+See Also
+--------
+cProfile, pstats : The standard library profiler used to capture and render profiles.
+components.utils.figure_endpoint : Where `build_figure` is decorated.
+"""
+
+
+import os
+import io
+import json
+import time
+import uuid
+import html
+import pstats
+import inspect
+import cProfile
+import tempfile
+import functools
+import threading
+import flask
+from components.utils.config import cfg
+
+# Profiling settings (see module notes)
+mode = cfg.get('profiling', 'mode', fallback='header')
+threshold_seconds = cfg.getfloat('profiling', 'threshold_seconds', fallback=1.0)
+keep = cfg.getint('profiling', 'keep', fallback=50)
+directory = cfg.get(
+    'profiling', 'directory',
+    fallback=os.path.join(tempfile.gettempdir(), 'cdiac-dashboard', 'profiles')
+)
+
+# Request header that turns profiling on for a single request in 'header' mode
+header = "X-Profile"
+
+# Path of the admin page (relative to the url prefix)
+route = "_admin/profiles"
+
+# cProfile can only run one profiler per process at a time
+profiler_lock = threading.Lock()
+
+
+def profiling_requested():
+    """
+    Whether the current call should be profiled.
+
+    Returns
+    -------
+    bool
+        True when profiling is always on, or when it is on by header and the current
+        request carries the `X-Profile` header.
+    """
+    if mode == 'always':
+        return True
+    if mode == 'header' and flask.has_request_context():
+        return flask.request.headers.get(header, '').lower() in ['1', 'true', 'yes']
+    return False
+
+
+def save_profile(profiler, func, arguments, elapsed):
+    # Write the profile and its description, then drop the fastest beyond `keep`
+    os.makedirs(directory, exist_ok=True)
+
+    profile_id = time.strftime('%Y%m%d-%H%M%S') + '-' + uuid.uuid4().hex[:8]
+
+    profiler.dump_stats(os.path.join(directory, profile_id + '.prof'))
+
+    with open(os.path.join(directory, profile_id + '.json'), 'w') as file:
+        json.dump({
+            'id': profile_id,
+            'function': func.__name__,
+            'nav_opt': arguments.get('nav_opt', ''),
+            'arguments': arguments,
+            'seconds': elapsed,
+            'captured': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }, file, default=str)
+
+    for stale in captured_profiles()[keep:]:
+        for extension in ['.prof', '.json']:
+            try:
+                os.remove(os.path.join(directory, stale['id'] + extension))
+            except OSError:
+                pass
+
+
+def captured_profiles():
+    """
+    Lists the captured profiles, slowest first.
+
+    Returns
+    -------
+    list of dict
+        The description saved with each profile.
+    """
+    profiles = []
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                try:
+                    with open(os.path.join(directory, name)) as file:
+                        profiles.append(json.load(file))
+                except (OSError, ValueError):
+                    # Being written or removed by another worker
+                    pass
+    return sorted(profiles, key=lambda profile: profile['seconds'], reverse=True)
+
+
+def profile_slow_calls(func):
+    """
+    Profiles `func` when profiling is requested and keeps the profiles of slow calls.
+
+    Parameters
+    ----------
+    func : callable
+        The function to profile (e.g. a Dash callback).
+
+    Returns
+    -------
+    callable
+        A wrapper that behaves exactly like `func`.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+
+        if not profiling_requested() or not profiler_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            result = profiler.runcall(func, *args, **kwargs)
+            elapsed = time.perf_counter() - start
+
+            if elapsed >= threshold_seconds:
+                arguments = dict(signature.bind(*args, **kwargs).arguments)
+                save_profile(profiler, func, arguments, elapsed)
+
+            return result
+        finally:
+            profiler_lock.release()
+
+    return wrapper
+
+
+def profile_list_page(is_admin):
+    if not is_admin():
+        flask.abort(403)
+
+    # One table per navigation option, slowest first
+    by_nav = {}
+    for profile in captured_profiles():
+        by_nav.setdefault(str(profile['nav_opt']), []).append(profile)
+
+    sections = []
+    for nav_opt, profiles in by_nav.items():
+        rows = []
+        for profile in profiles:
+            rows.append(
+                "<tr><td>" + "%.3f" % profile['seconds'] + "</td>"
+                + "<td><code>" + html.escape(json.dumps(profile['arguments'], default=str)) + "</code></td>"
+                + "<td>" + html.escape(profile['captured']) + "</td>"
+                + '<td><a href="' + html.escape(profile['id']) + '">stats</a> '
+                + '<a href="' + html.escape(profile['id']) + '?raw=1">.prof</a></td></tr>'
+            )
+        sections.append(
+            "<h2>" + html.escape(nav_opt) + "</h2>"
+            + '<table border="1" cellpadding="4"><tr><th>Seconds</th><th>Arguments</th>'
+            + "<th>Captured</th><th></th></tr>"
+            + "".join(rows)
+            + "</table>"
+        )
+
+    return (
+        "<!DOCTYPE html><html><head><title>Captured profiles</title></head><body>"
+        + "<h1>Slowest captured profiles</h1>"
+        + "<p>Mode: " + html.escape(mode) + ", threshold: " + str(threshold_seconds) + " s</p>"
+        + "".join(sections)
+        + "</body></html>"
+    )
+
+
+def profile_page(is_admin, profile_id):
+    if not is_admin():
+        flask.abort(403)
+
+    # Only names listed by the index are served
+    if profile_id not in [profile['id'] for profile in captured_profiles()]:
+        flask.abort(404)
+
+    path = os.path.join(directory, profile_id + '.prof')
+
+    if flask.request.args.get('raw'):
+        return flask.send_file(path, as_attachment=True, download_name=profile_id + '.prof')
+
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(60)
+
+    return flask.Response(output.getvalue(), mimetype='text/plain')
+
+
+def register_routes(server, url_prefix, is_admin):
+    """
+    Adds the captured profile pages to the Flask server.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        The Flask server backing the Dash application (`app.server`).
+    url_prefix : str
+        The application's url prefix (the same one passed to `dash.Dash`).
+    is_admin : callable
+        Returns True when the current request may see the profiles.
+    """
+    server.add_url_rule(
+        url_prefix + route + "/", "profile_list",
+        lambda: profile_list_page(is_admin)
+    )
+    server.add_url_rule(
+        url_prefix + route + "/<profile_id>", "profile",
+        lambda profile_id: profile_page(is_admin, profile_id)
+    )
@@ -0,0 +1,144 @@
+"""
+A fast path for figure builders that assemble their figure as a plain dict: the dict is sent
+as it is instead of going through `go.Figure`, whose validation of every nested property and
+array costs more than building the figure for the larger animations.
+
+Builders that support it build a dict in plotly's canonical form (the form `go.Figure(...)
+.to_plotly_json()` produces) and finish with `finish(fig, view, validate)`, which also puts
+its keys in plotly's order, so both paths serialize to the same bytes.  Which views skip
+validation is set per navigation option.
+
+Functions
+---------
+finish(fig, view, validate=None) -> go.Figure or dict
+    Returns the figure validated (a `go.Figure`) or as a dict with its template resolved.
+
+ordered(value, trace=False) -> object
+    Returns a part of a figure dict with its keys in the order `go.Figure` gives them.
+
+Attributes
+----------
+unvalidated_views : set of str
+    Navigation options whose figures are sent without validation.
+
+supported_views : list of str
+    Navigation options whose builders build a dict.
+
+Notes
+-----
+- Settings are read from the `[raw_figures]` section of rieee.conf:
+
+  [raw_figures]
+  views = political-geography-sunburst, source-sunburst, type-ternary, source-ternary
+
+  Leave `views` empty to validate every figure (e.g. while changing a builder).
+- `go.Figure` orders the properties of every object alphabetically, with a trace's `type`
+  last, and keeps free-form values (`args`, `customdata`, `meta`, the template's dict) as
+  given.  `ordered` does the same, so the ETag-keyed bytes of a figure do not depend on
+  whether its view is validated.
+- tests/test_raw_figures.py checks that both paths give byte-equal JSON for every supported
+  view; `python -m tools.raw_figures` compares them too, and times them.
+- Figures that are not validated can only be used as dicts (no `update_layout`).  The
+  figure cache, shared cache and figure endpoint serialize either.
+
+See Also
+--------
+components.utils.ternary : Builds the ternary animations as dicts.
+"""
+
+
+import plotly.io as pio
+import plotly.graph_objects as go
+from components.utils.config import cfg
+
+# The views whose builders build a dict
+supported_views = ['political-geography-sunburst', 'source-sunburst', 'type-ternary', 'source-ternary']
+
+# Raw figure settings (see module notes)
+unvalidated_views = {
+    view.strip()
+    for view in cfg.get('raw_figures', 'views', fallback=', '.join(supported_views)).split(',')
+    if view.strip()
+}
+
+# Properties whose values go.Figure keeps as given
+free_form = {'template', 'args', 'args2', 'customdata', 'meta'}
+
+# Template name -> its canonical dict (templates do not change at run time)
+templates = {}
+
+
+def template(name):
+    if name not in templates:
+        templates[name] = pio.templates[name].to_plotly_json()
+    return templates[name]
+
+
+def finish(fig, view, validate=None):
+    """
+    Returns a figure built as a dict, validated or not.
+
+    Parameters
+    ----------
+    fig : dict
+        The figure ('data', 'layout' and optionally 'frames'), in canonical form.
+    view : str
+        The navigation option of the figure, looked up in `unvalidated_views`.
+    validate : bool, optional
+        Overrides the setting of the view.
+
+    Returns
+    -------
+    plotly.graph_objects.Figure or dict
+        A validated `go.Figure`, or the dict with its template (or the default one) resolved
+        to the template's dict, as `go.Figure` would send it.
+    """
+    if validate is None:
+        validate = view not in unvalidated_views
+
+    if validate:
+        return go.Figure(fig)
+
+    # Templates are sent as their dicts, as go.Figure would send them
+    layout = fig.setdefault('layout', {})
+    name = layout.get('template', pio.templates.default)
+    if isinstance(name, str) and name:
+        layout['template'] = template(name)
+
+    ordered_fig = {
+        'data' : [ordered(trace, trace=True) for trace in fig.get('data', [])],
+        'layout' : ordered(layout),
+    }
+    if 'frames' in fig:
+        ordered_fig['frames'] = [
+            {key : [ordered(trace, trace=True) for trace in frame[key]] if key == 'data' else ordered(frame[key]) for key in sorted(frame)}
+            for frame in fig['frames']
+        ]
+    return ordered_fig
+
+
+def ordered(value, trace=False):
+    """
+    Returns a part of a figure dict with its keys in the order `go.Figure` gives them.
+
+    Parameters
+    ----------
+    value : object
+        A dict (a trace, the layout or one of their objects), a list of them, or a value.
+    trace : bool, optional
+        Whether `value` is a trace, whose `type` goes last.
+
+    Returns
+    -------
+    object
+        `value`, with its dicts rebuilt in order (arrays and free-form values are not copied).
+    """
+    if isinstance(value, dict):
+        keys = sorted(value)
+        if trace and 'type' in value:
+            keys.remove('type')
+            keys.append('type')
+        return {key : value[key] if key in free_form else ordered(value[key]) for key in keys}
+    if isinstance(value, list):
+        return [ordered(item) for item in value]
+    return value
@@ -0,0 +1,147 @@
+"""
+A figure cache on local disk shared by every worker (and background callback process) on the
+machine, so that a figure built by one worker is served by all of them.
+
+Figures are stored as the JSON sent to the browser, in content-addressed files named after the
+SHA-256 of their key (dataset version, builder and arguments).  Writes are atomic (a temporary
+file renamed into place), so readers never see a partial figure, and the total size of the
+cache is kept under a limit by removing the least recently used files.
+
+Functions
+---------
+get(key) -> dict or None
+    Returns the cached figure for a key, or None.
+
+put(key, figure)
+    Stores a figure under a key, evicting old figures when the cache is over its size limit.
+
+Attributes
+----------
+enabled : bool
+    Whether the shared cache is used at all.
+
+directory : str
+    Where figures are stored.  Must be shared by every worker on the machine.
+
+max_bytes : int
+    Size limit of the cache.
+
+Notes
+-----
+- Settings are read from the `[shared_cache]` section of rieee.conf:
+
+  [shared_cache]
+  enabled = true
+  directory = /tmp/cdiac-dashboard/figures
+  max_megabytes = 512
+
+- A hit refreshes the file's modification time, which is what eviction orders by.
+- Figures of an older dataset version are never read again (the version is part of the key)
+  and are evicted like any other unused figure.
+
+See Also
+--------
+components.utils.figure_cache : The in-memory tier in front of this one.
+"""
+
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import plotly.io
+from components.utils.config import cfg
+
+# Shared cache settings (see module notes)
+enabled = cfg.getboolean('shared_cache', 'enabled', fallback=True)
+directory = cfg.get(
+    'shared_cache', 'directory',
+    fallback=os.path.join(tempfile.gettempdir(), 'cdiac-dashboard', 'figures')
+)
+max_bytes = int(cfg.getfloat('shared_cache', 'max_megabytes', fallback=512) * 1024 * 1024)
+
+
+def path_of(key):
+    return os.path.join(directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def get(key):
+    """
+    Returns the cached figure for a key.
+
+    Parameters
+    ----------
+    key : str
+        The figure's key (`single_flight.figure_key`).
+
+    Returns
+    -------
+    dict or None
+        The figure, or None when it is not cached.
+    """
+    if not enabled:
+        return None
+
+    path = path_of(key)
+    try:
+        with open(path) as file:
+            figure = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        # Evicted since it was read
+        pass
+    return figure
+
+
+def put(key, figure):
+    """
+    Stores a figure, then evicts the least recently used figures while over `max_bytes`.
+
+    Parameters
+    ----------
+    key : str
+        The figure's key (`single_flight.figure_key`).
+    figure : plotly.graph_objects.Figure or dict
+        The figure.
+    """
+    if not enabled:
+        return
+
+    os.makedirs(directory, exist_ok=True)
+
+    path = path_of(key)
+    temporary = path + '.' + str(os.getpid()) + '.tmp'
+    with open(temporary, 'w') as file:
+        file.write(plotly.io.to_json(figure, validate=False))
+    os.replace(temporary, path)
+
+    evict()
+
+
+def evict():
+    # Remove the least recently used figures until the cache fits in max_bytes
+    entries = []
+    for name in os.listdir(directory):
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except OSError:
+            continue
+        if name.endswith('.tmp') and time.time() - stat.st_mtime < 3600:
+            # Being written
+            continue
+        entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+        total -= size
@@ -0,0 +1,293 @@
+"""
+Coalesces identical concurrent figure builds.  When many users ask for the same figure at the
+same moment (e.g. the default carbon atlas at the start of a lecture), only one build runs and
+every other request waits for it and shares its result.
+
+Coalescing happens at two levels:
+
+- Within a worker, requests wait on the in-progress build of another thread.
+- Across workers (and background callback processes) on the same machine, the build holds an
+  exclusive file lock named after its key.  Workers that find the lock taken announce that
+  they are waiting, wait for the lock, and read the result the builder left on disk.
+
+Functions
+---------
+shared_build(builder, *args) -> object
+    Calls `builder(*args)`, sharing the result with identical concurrent calls.
+
+single_flight(key, build, share_result=True) -> object
+    Runs `build()` once for every group of concurrent calls with the same key.
+
+figure_key(builder, args) -> str
+    Identifies a figure by the dataset and code versions, its builder and the builder's arguments.
+
+Attributes
+----------
+code_version : str
+    Short hash of the sources of `components.figures` and `components.utils`.
+
+directory : str
+    Where lock and result files are kept.  Must be shared by every worker on the machine.
+
+wait_seconds : float
+    How long a request waits for another build before building the figure itself.
+
+Notes
+-----
+- Settings are read from the `[single_flight]` section of rieee.conf:
+
+  [single_flight]
+  directory = /tmp/cdiac-dashboard/flights
+  wait_seconds = 60
+
+- Keys include the dataset version, the code version, the builder and its arguments, so
+  workers running different data or code (during a deploy) never share results, and
+  figures cached (or validated by browsers) before a deploy are not served after it.
+  They also include `precision.significant_digits`, as figures are cached rounded.
+- Results are only written to disk when another process is waiting for them.  They are
+  shared as JSON, so a process that waited gets the figure as a dict rather than a
+  `plotly.graph_objects.Figure`; `dash.dcc.Graph` accepts either.
+- Results shared within a worker are the same object for every caller, and must not be
+  modified.
+- If the build fails, waiting requests build the figure themselves.
+- Each use of a lock file renews its modification time.  Lock, announcement and result
+  files unused for twice `wait_seconds` are swept from `directory` (at most once per
+  `wait_seconds` in each process), so keys that are never requested again (e.g. arbitrary
+  nation lists) do not accumulate.  A lock is only removed while this process holds it.
+
+See Also
+--------
+components.content_display.display_container : Where figure builds are coalesced.
+"""
+
+
+import os
+import json
+import time
+import fcntl
+import hashlib
+import tempfile
+import threading
+import plotly.io
+from components.utils.config import cfg
+from components.utils import constants as d
+from components.utils import precision
+
+# Single flight settings (see module notes)
+directory = cfg.get(
+    'single_flight', 'directory',
+    fallback=os.path.join(tempfile.gettempdir(), 'cdiac-dashboard', 'flights')
+)
+wait_seconds = cfg.getfloat('single_flight', 'wait_seconds', fallback=60)
+
+# How often a waiting process checks whether the file lock was released
+poll_seconds = 0.05
+
+# When this process last swept the directory (see sweep)
+last_sweep = 0.0
+
+
+def hash_sources(source_directories):
+    # Short hash of the Python sources in the given directories
+    digest = hashlib.sha256()
+    for source_directory in source_directories:
+        for name in sorted(os.listdir(source_directory)):
+            if name.endswith('.py'):
+                with open(os.path.join(source_directory, name), 'rb') as file:
+                    digest.update(name.encode('utf-8'))
+                    digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+# The figure builders and the utilities that shape their output (templates, rounding, ...)
+components_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+code_version = hash_sources([os.path.join(components_directory, 'figures'), os.path.join(components_directory, 'utils')])
+
+
+class Flight:
+    # One in-progress build within this process
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+flights = {}
+flights_lock = threading.Lock()
+
+
+def reset_after_fork():
+    # A forked process (e.g. a background callback) must not wait on its parent's threads
+    global flights, flights_lock
+    flights = {}
+    flights_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=reset_after_fork)
+
+
+def shared_build(builder, *args):
+    """
+    Calls `builder(*args)`, sharing the result with identical concurrent calls.
+
+    Parameters
+    ----------
+    builder : callable
+        A figure builder from `components.figures`.
+    *args
+        Its (JSON serializable) arguments.
+
+    Returns
+    -------
+    plotly.graph_objects.Figure or dict
+        The figure.
+    """
+    return single_flight(figure_key(builder, args), lambda: builder(*args))
+
+
+def figure_key(builder, args):
+    """
+    Identifies a figure by the dataset and code versions, its builder and the builder's arguments.
+
+    Returns
+    -------
+    str
+        The key (JSON text).
+    """
+    return json.dumps([d.dataset_version, code_version, precision.significant_digits, builder.__module__, builder.__name__, args])
+
+
+def single_flight(key, build, share_result=True):
+    """
+    Runs `build()` once for every group of concurrent calls with the same key.
+
+    Parameters
+    ----------
+    key : str
+        Identifies the result; calls with equal keys share it.
+    build : callable
+        Builds the result.
+    share_result : bool
+        Whether the result is left on disk for waiting processes.  Pass False when `build`
+        itself finds results stored by other processes (e.g. in the shared figure cache);
+        waiting processes then call `build` once the lock is released.
+
+    Returns
+    -------
+    object
+        The result of `build()`, possibly built by another thread or process.
+    """
+    with flights_lock:
+        flight = flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = flights[key] = Flight()
+
+    if not leader:
+        if flight.done.wait(wait_seconds) and not flight.failed:
+            return flight.result
+        return build()
+
+    try:
+        flight.result = across_processes(key, build, share_result)
+        return flight.result
+    except BaseException:
+        flight.failed = True
+        raise
+    finally:
+        flight.done.set()
+        with flights_lock:
+            flights.pop(key, None)
+
+
+def across_processes(key, build, share_result):
+    # Coalesce with other processes through a file lock named after the key
+    os.makedirs(directory, exist_ok=True)
+    sweep()
+    path = os.path.join(directory, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    with open(path + '.lock', 'a') as lock_file:
+        # In use: not swept
+        os.utime(path + '.lock')
+
+        if not try_lock(lock_file):
+            # Another process is building: announce this one and wait for the lock
+            started = time.time()
+            if share_result:
+                open(path + '.waiting', 'a').close()
+            while not try_lock(lock_file):
+                if time.time() - started > wait_seconds:
+                    # Too slow: build without sharing
+                    return build()
+                time.sleep(poll_seconds)
+
+            # Results are keyed by data and arguments, so any result left is valid
+            try:
+                if share_result:
+                    with open(path + '.json') as file:
+                        return json.load(file)
+            except (OSError, ValueError):
+                # The build failed (or finished before this process announced itself)
+                pass
+
+        # This process holds the lock: build, and leave the result for any waiters
+        try:
+            result = build()
+            if share_result and os.path.exists(path + '.waiting'):
+                write_result(path, result)
+            return result
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def try_lock(lock_file):
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def write_result(path, result):
+    # Atomically replace the result
+    temporary = path + '.json.' + str(os.getpid())
+    with open(temporary, 'w') as file:
+        file.write(plotly.io.to_json(result, validate=False))
+    os.replace(temporary, path + '.json')
+
+    try:
+        os.remove(path + '.waiting')
+    except OSError:
+        pass
+
+
+def sweep():
+    # Remove the files no build or waiting request can still be using: nobody waits longer
+    # than wait_seconds, so anything unused for twice that is stale
+    global last_sweep
+    now = time.time()
+    if now - last_sweep < wait_seconds:
+        return
+    last_sweep = now
+
+    for name in os.listdir(directory):
+        file_path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(file_path) <= 2 * wait_seconds:
+                continue
+            if name.endswith('.lock'):
+                remove_lock(file_path)
+            else:
+                os.remove(file_path)
+        except OSError:
+            pass
+
+
+def remove_lock(lock_path):
+    # Remove a stale lock file, unless a build holds it or a request opened it since
+    with open(lock_path, 'a') as lock_file:
+        if not try_lock(lock_file):
+            return
+        try:
+            if time.time() - os.path.getmtime(lock_path) > 2 * wait_seconds:
+                os.remove(lock_path)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
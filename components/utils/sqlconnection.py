@@ -136,6 +136,9 @@ def get_application_metadata():
     metadata_cursor.execute(applicationIsPublic)
     applicationIsPublic = metadata_cursor.fetchall()
 
+    metadata_cursor.close()
+    metadata_connection.close()
+
     return applicationIsPublic
 
 
@@ -179,4 +182,7 @@ def get_authorization_metadata(username):
     metadata_cursor.execute(userHasPermission)
     userHasPermission = metadata_cursor.fetchall()
 
+    metadata_cursor.close()
+    metadata_connection.close()
+
     return [userIsAdmin, userHasPermission]
@@ -0,0 +1,159 @@
+"""
+Builds animated ternary plots with a single `go.Scatterternary` trace per frame.
+
+`px.scatter_ternary(color=..., animation_frame=...)` makes one trace per color group per
+frame: one per political geography per year on the region and annex views.  Here each frame
+is one trace whose points carry their own size and color (a group number, through a stepped
+colorscale, so colors are not repeated as strings), and the legend is drawn by one
+empty trace per color group, so the trace count (and the JSON sent to the browser, and the
+time plotly.js takes to draw it) no longer grows with the number of groups.
+
+Functions
+---------
+animated_ternary(df, a, b, c, color, color_map, custom_data, hovertemplate) -> dict
+    Returns an animated ternary plot of `df`, one frame per year, showing the last year.
+
+Notes
+-----
+- Colors and sizes follow `px.scatter_ternary`: groups missing from `color_map` take the
+  default qualitative colors in order, points without a group are left out, marker areas are scaled so the largest point of any
+  frame is `max_size` pixels across, and points are drawn group by group in order of first
+  appearance.
+- Every frame carries its own colors, sizes and hover template, so moving the slider keeps
+  them in step with the year shown.
+- The figure is built as a dict (see `components.utils.raw_figure`).
+- The legend entries are not linked to the points: clicking one does not hide its group.
+
+See Also
+--------
+components.utils.raw_figure : Validates (or not) the figures built here.
+components.figures.type_ternary : Ternary plot of fuel type proportions.
+components.figures.source_ternary : Ternary plot of source proportions.
+"""
+
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+
+def animated_ternary(df, a, b, c, color, color_map, custom_data, hovertemplate, frame='Year ', size='size', max_size=20):
+    """
+    Returns an animated ternary plot with one trace per frame.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        One row per point, with the columns named below.
+    a, b, c : str
+        Columns of the three ternary axes.
+    color : str
+        Column of the color group of each point (drawn in the legend).
+    color_map : dict
+        Maps color groups to colors.
+    custom_data : list of str
+        Columns passed to the hover template as `customdata`; must include `color`.
+    hovertemplate : str
+        Hover template of the points (the color group is shown beside it).
+    frame : str, optional
+        Column of the animation frame (the year).
+    size : str, optional
+        Column of the marker sizes.
+    max_size : int, optional
+        Diameter, in pixels, of the largest marker.
+
+    Returns
+    -------
+    dict
+        The figure, showing its last frame, with a year slider, in plotly's canonical form
+        (finish it with `components.utils.raw_figure.finish`).
+    """
+    # Points without a color group are not drawn (as in plotly express)
+    df = df.loc[df[color].notna()]
+
+    # Color groups in order of first appearance, as plotly express orders them
+    group_codes, groups = pd.factorize(df[color])
+    default_colors = iter(px.colors.qualitative.Plotly * len(groups))
+    group_colors = [color_map[group] if group in color_map else next(default_colors) for group in groups]
+
+    # Draw group by group, as one trace per group would
+    df = df.iloc[np.argsort(group_codes, kind = 'stable')].assign(group_code = np.sort(group_codes, kind = 'stable'))
+
+    # Points are colored by group code, through a colorscale with one flat step per group
+    colorscale = [
+        [edge / len(groups), group_color]
+        for code, group_color in enumerate(group_colors)
+        for edge in (code, code + 1)
+    ]
+
+    sizeref = df[size].max() / (max_size ** 2)
+    hovertemplate = hovertemplate + '<extra>%{customdata[' + str(custom_data.index(color)) + ']}</extra>'
+
+    def points(year_df, name):
+        return dict(
+            type = 'scatterternary',
+            a = year_df[a].values,
+            b = year_df[b].values,
+            c = year_df[c].values,
+            customdata = year_df[custom_data].values,
+            hovertemplate = hovertemplate,
+            mode = 'markers',
+            name = name,
+            showlegend = False,
+            marker = dict(
+                color = year_df['group_code'].values,
+                colorscale = colorscale,
+                cmin = -0.5,
+                cmax = len(groups) - 0.5,
+                showscale = False,
+                size = year_df[size].values,
+                sizemode = 'area',
+                sizeref = sizeref,
+                line = dict(width = 0),
+            ),
+        )
+
+    # The points are trace 0, which is all a frame updates
+    frames = [
+        dict(name = str(year), data = [points(year_df, str(year))], traces = [0])
+        for year, year_df in df.groupby(frame, sort = False)
+    ]
+
+    legend = [
+        dict(
+            type = 'scatterternary',
+            a = [None], b = [None], c = [None],
+            mode = 'markers',
+            name = group,
+            marker = dict(color = group_color, size = max_size / 2, line = dict(width = 0)),
+            hoverinfo = 'skip',
+        )
+        for group, group_color in zip(groups, group_colors)
+    ]
+
+    layout = dict(
+        legend = dict(title = dict(text = color), itemsizing = 'constant', tracegroupgap = 0),
+        sliders = [dict(
+            active = len(frames) - 1,
+            currentvalue = dict(prefix = frame + '='),
+            len = 0.9,
+            pad = dict(b = 10, t = 60),
+            x = 0.1, xanchor = 'left',
+            y = 0, yanchor = 'top',
+            steps = [
+                dict(
+                    args = [[f['name']], dict(
+                        frame = dict(duration = 0, redraw = True),
+                        mode = 'immediate',
+                        fromcurrent = True,
+                        transition = dict(duration = 0, easing = 'linear'),
+                    )],
+                    label = f['name'],
+                    method = 'animate',
+                )
+                for f in frames
+            ],
+        )],
+    )
+
+    return dict(data = [frames[-1]['data'][0]] + legend, layout = layout, frames = frames)
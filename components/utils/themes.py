@@ -0,0 +1,124 @@
+"""
+Registers the dashboard's light and dark Plotly templates, which hold the styling every
+figure shares (background, fonts, title placement, hover labels and annotation defaults), so
+that figure builders only supply their data, titles and what is particular to them.
+
+The templates are built once, when this module is imported, and registered with
+`plotly.io.templates` as `cdiac_light` and `cdiac_dark`.  Builders select one explicitly
+(`template = themes.template_name(theme)`); the global `plotly.io.templates.default` is left
+alone, so a figure's styling never depends on which figures a worker built before it.
+
+Functions
+---------
+template_name(theme) -> str
+    Returns the name of the registered template of a theme.
+
+credit(**position) -> dict
+    Returns the credit annotation, placed as given.
+
+Attributes
+----------
+text_color : dict
+    The text (and line) color of each theme.
+
+background : dict
+    The background color of each theme.
+
+credit_text : str
+    The credit shown on the figures, with the year the worker started.
+
+Notes
+-----
+- The light template extends `plotly_white` and the dark one `plotly_dark`.
+- Annotations take their font (20 px, in the theme's text color) and paper coordinates from
+  the template, so builders only place them.
+- Every figure is cached for the life of the data file (see `components.utils.figure_cache`),
+  so the year in the credit is fixed when the worker starts rather than on every build.
+
+See Also
+--------
+components.figures : The figure builders using these templates.
+"""
+
+
+import datetime
+import plotly.io as pio
+import plotly.graph_objects as go
+
+# Colors of each theme
+text_color = {'light': '#000', 'dark': '#fff'}
+background = {'light': '#fff', 'dark': '#000'}
+
+# The credit shown on the figures
+credit_text = '<b>The CDIAC at AppState Dashboard</b><br>Hefner and Marland (' + str(datetime.date.today().year) + ')'
+
+# Plotly's template each theme extends
+base_templates = {'light': 'plotly_white', 'dark': 'plotly_dark'}
+
+
+def template_name(theme):
+    """
+    Returns the name of the registered template of a theme ('light' or 'dark').
+    """
+    return 'cdiac_' + theme
+
+
+def credit(**position):
+    """
+    Returns the credit annotation, placed by the given annotation properties (x, y, xanchor,
+    ...).
+    """
+    return dict(text = credit_text, **position)
+
+
+def build_template(theme):
+    textCol = text_color[theme]
+    bg = background[theme]
+
+    template = go.layout.Template(pio.templates[base_templates[theme]])
+    template.layout.update(
+
+        plot_bgcolor = bg,
+        paper_bgcolor = bg,
+
+        # Set the font size for the entire plot, excluding the title
+        font = dict(
+            size = 20,
+            color = textCol
+        ),
+
+        # Title Layout and Styling
+        title = dict(
+            xanchor = "center",
+            xref = "container",
+            yref = "container",
+            x = 0.5,
+            yanchor = "top",
+            y = .98,
+            font = dict(
+                size = 32,
+                color = textCol
+            )
+        ),
+
+        hoverlabel = dict(
+            font_size = 16,
+            font_family = "Rockwell",
+        ),
+
+        # Subtitles and credits
+        annotationdefaults = dict(
+            xref = 'paper',
+            yref = 'paper',
+            showarrow = False,
+            font = dict(
+                size = 20,
+                color = textCol
+            )
+        ),
+    )
+    return template
+
+
+for theme in text_color:
+    pio.templates[template_name(theme)] = build_template(theme)
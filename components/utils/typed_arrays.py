@@ -0,0 +1,153 @@
+"""
+Encodes the numeric arrays of a figure as base64 typed arrays (`{"dtype": "i4", "bdata":
+"..."}`, the encoding plotly.js reads natively from version 2.28), which are more compact than
+JSON number lists for integers and are decoded without parsing every number.
+
+When enabled, the figure endpoint encodes a figure only when the browser asks for it
+(`?typed=1`, sent by assets/js/figures.js, which decodes the arrays into JavaScript typed
+arrays before handing the figure to plotly.js); any other client gets plain JSON.  It is
+disabled by default (see the notes).
+
+Functions
+---------
+encode(figure) -> dict
+    Returns the figure with its large numeric arrays encoded.
+
+encode_array(values) -> dict or None
+    Returns the typed array encoding of a numeric array, or None when JSON is as good.
+
+Attributes
+----------
+enabled : bool
+    Whether the figure endpoint encodes figures for browsers that ask.
+
+min_length : int
+    Arrays shorter than this are left as JSON.
+
+parameter : str
+    The query parameter with which a browser asks for typed arrays.
+
+Notes
+-----
+- Settings are read from the `[typed_arrays]` section of rieee.conf:
+
+  [typed_arrays]
+  enabled = false
+  min_length = 16
+
+  The encoding is off unless enabled: measured with `tools.typed_arrays`, it saves under 1%
+  of the gzipped payloads of the dashboard's views, whose arrays are short or mostly
+  rounded floats, and decoding them takes longer than parsing the JSON.  Enable it for
+  views with a measured gain.
+
+- Figures may hold their arrays as numpy arrays (when just built) or as lists (when read
+  back from the shared disk cache); both are encoded alike.
+- Only one-dimensional arrays of the keys in `keys` (coordinates, values and marker sizes
+  and colors) are encoded, and only when every value is finite; arrays with gaps stay JSON,
+  so plotly.js sees `null` for them as before.
+- Integers take the smallest integer type that holds them, and floats are sent as float64;
+  either is encoded only when that is shorter than its JSON.  Small integers (the ternaries'
+  color indices) gain most; thousands of kilotonnes take as many characters as JSON, and
+  floats rounded by `components.utils.precision` are mostly shorter as JSON.
+- The dashboard's plotly.js (2.24) does not read the encoding itself, which is why the
+  browser decodes it; the decoder also accepts figures without encoded arrays.
+- `python -m tools.typed_arrays` compares payloads and parse times of both encodings.
+
+See Also
+--------
+components.utils.figure_endpoint : Encodes the figures it serves.
+assets/js/figures.js : Decodes them in the browser.
+"""
+
+
+import json
+import base64
+import numpy as np
+import pandas as pd
+from components.utils.config import cfg
+
+# Typed array settings (see module notes)
+enabled = cfg.getboolean('typed_arrays', 'enabled', fallback=False)
+min_length = cfg.getint('typed_arrays', 'min_length', fallback=16)
+
+# Query parameter of figure requests that accept typed arrays
+parameter = 'typed'
+
+# Keys whose arrays are encoded
+keys = {'x', 'y', 'z', 'a', 'b', 'c', 'values', 'size', 'color'}
+
+# Integer types plotly.js reads, smallest first
+integer_types = [('i1', np.int8), ('u1', np.uint8), ('i2', np.int16), ('u2', np.uint16), ('i4', np.int32), ('u4', np.uint32)]
+
+
+def encode_array(values):
+    """
+    Returns the typed array encoding of a one-dimensional numeric array.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The array.
+
+    Returns
+    -------
+    dict or None
+        `{'dtype': ..., 'bdata': ...}`, or None when the array is better left as JSON.
+    """
+    if values.ndim != 1 or len(values) < min_length or values.dtype.kind not in 'iuf':
+        return None
+
+    if values.dtype.kind in 'iu':
+        low, high = values.min(), values.max()
+        dtype = next(
+            (dtype for dtype, numpy_type in integer_types
+             if np.iinfo(numpy_type).min <= low and high <= np.iinfo(numpy_type).max),
+            None
+        )
+        if dtype is None:
+            return None
+    elif np.isfinite(values).all():
+        dtype = 'f8'
+    else:
+        return None
+
+    bdata = base64.b64encode(values.astype('<' + dtype).tobytes()).decode('ascii')
+    if len(bdata) >= len(json.dumps(values.tolist(), separators=(',', ':'))):
+        return None
+    return dict(dtype = dtype, bdata = bdata)
+
+
+def numeric(values):
+    # Lists of plain numbers (as figures read back from the shared cache hold them)
+    return len(values) >= min_length and all(
+        isinstance(item, (int, float)) and not isinstance(item, bool) for item in values
+    )
+
+
+def encoded(value, key=None):
+    if isinstance(value, dict):
+        return {item_key: encoded(item, item_key) for item_key, item in value.items()}
+    if key in keys and (isinstance(value, (np.ndarray, pd.Series)) or isinstance(value, (list, tuple)) and numeric(value)):
+        return encode_array(np.asarray(value)) or value
+    if isinstance(value, (list, tuple)):
+        return [encoded(item) for item in value]
+    return value
+
+
+def encode(figure):
+    """
+    Returns the figure with its large numeric arrays encoded as typed arrays.
+
+    Parameters
+    ----------
+    figure : plotly.graph_objects.Figure or dict
+        The figure (not modified).
+
+    Returns
+    -------
+    dict
+        The figure, sharing everything that was not encoded.
+    """
+    if hasattr(figure, 'to_plotly_json'):
+        figure = figure.to_plotly_json()
+    return encoded(figure)
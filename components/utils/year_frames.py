@@ -0,0 +1,101 @@
+"""
+Builds the frames of the animated figures, one per year, as an independent map over the years
+that can run serially, on a pool of threads or on the process pool.  Frames always come back in
+the order of the years, however they were built, so figures are the same in every mode.
+
+Functions
+---------
+map_years(build_frame, years, mode=None) -> list
+    Returns `[build_frame(year) for year in years]`, built as configured.
+
+Attributes
+----------
+executor : str
+    How frames are built: 'serial', 'thread' or 'process'.
+
+threads : int
+    Threads of the frame pool, when `executor` is 'thread'.
+
+Notes
+-----
+- Settings are read from the `[year_frames]` section of rieee.conf:
+
+  [year_frames]
+  executor = serial
+  threads = 4
+
+- 'process' builds frames on the processes of `components.utils.process_pool` (whether or
+  not its `enabled` is set), so `build_frame` must be picklable: a module-level function, or
+  a `functools.partial` of one with picklable arguments.  Processes that are not gunicorn
+  workers (pool and background callback processes) build their frames serially.  Frames
+  share the pool's `max_pending` limit and `timeout_seconds` with other builds: frames the
+  pool has no room for (or whose pool process died) are built in the calling thread.
+- Frames of a year are built from that year's rows only, so they can be built in any order.
+- `python -m tools.year_frames` times each mode as the number of years grows.
+
+See Also
+--------
+components.figures.country_sunburst : Animated sunburst of one political geography.
+components.figures.source_sunburst : Animated sunburst of one source.
+"""
+
+
+import os
+import threading
+import concurrent.futures
+from components.utils.config import cfg
+from components.utils import process_pool
+
+# Frame settings (see module notes)
+executor = cfg.get('year_frames', 'executor', fallback='serial')
+threads = cfg.getint('year_frames', 'threads', fallback=4)
+
+thread_pool = None
+thread_pool_lock = threading.Lock()
+
+
+def reset_after_fork():
+    # The pool's threads do not survive a fork (e.g. into a background callback process)
+    global thread_pool, thread_pool_lock
+    thread_pool = None
+    thread_pool_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=reset_after_fork)
+
+
+def get_thread_pool():
+    global thread_pool
+    with thread_pool_lock:
+        if thread_pool is None:
+            thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=threads, thread_name_prefix="year-frames")
+        return thread_pool
+
+
+def map_years(build_frame, years, mode=None):
+    """
+    Returns `[build_frame(year) for year in years]`, built as configured.
+
+    Parameters
+    ----------
+    build_frame : callable
+        Builds the frame of one year.
+    years : list of int
+        The years, in the order of the frames.
+    mode : str, optional
+        Overrides `executor` ('serial', 'thread' or 'process').
+
+    Returns
+    -------
+    list
+        The frames, in the order of `years`.
+    """
+    mode = mode or executor
+
+    if mode == 'thread':
+        return list(get_thread_pool().map(build_frame, years))
+
+    if mode == 'process':
+        # Bounded and timed like any build in the pool; frames it has no room for are built here
+        return process_pool.map_in_pool(build_frame, years)
+
+    return [build_frame(year) for year in years]
@@ -0,0 +1,42 @@
+"""
+gunicorn settings for serving the dashboard with threaded (`gthread`) workers.
+
+gunicorn reads this file when it is started from the repository root (as the Dockerfile does).
+Each worker process loads the dataset once and serves `threads` requests at a time from it, so
+concurrent users cost threads rather than copies of the data.  Figure builds are CPU-bound and
+share a worker's interpreter, but most requests (static bundles, cached figures, clientside
+updates, the live update stream) only wait on the network, which threads overlap well.
+
+Attributes
+----------
+workers : int
+    Worker processes, from `GUNICORN_WORKERS` (default 2).  Each holds its own copy of the data.
+
+threads : int
+    Request threads per worker, from `GUNICORN_THREADS` (default 8).
+
+Notes
+-----
+- Figure builders are reentrant: they never write to the shared data frames or to Plotly's
+  global state (templates, color sequences), so any number of threads can build at once.
+- An open live update stream (see `components.utils.live_update`) holds a thread for up to
+  `hold_seconds`; count them when choosing `threads`.
+- Settings given on the command line take precedence, e.g. `--workers 4`.
+- Size workers and threads with `python -m tools.load_test --workers 2 --threads 8`.
+- The application is not preloaded: each worker starts its own cache warm-up thread, which
+  would not survive a fork from a preloaded master.
+"""
+
+
+import os
+
+bind = '0.0.0.0:8050'
+
+worker_class = 'gthread'
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# The heavy figures are built by background callbacks, so requests stay short
+timeout = 120
+
+accesslog = '-'
@@ -0,0 +1,27 @@
+"""
+Checks that the figures built as dicts (`components.utils.raw_figure`) serialize to the same
+bytes with and without validation, for every supported view over its argument grid in
+`tools.views`.
+
+Run from the repository root:
+
+>>> python -m pytest tests
+"""
+
+
+import pytest
+import plotly.io
+from tools import views as v
+from components.utils import raw_figure
+
+cases = [
+    pytest.param(builder, arguments, id = name + ' ' + ','.join(map(str, arguments.values())))
+    for name, builder, arguments in v.cases(raw_figure.supported_views)
+]
+
+
+@pytest.mark.parametrize('builder, arguments', cases)
+def test_raw_figure_json_matches_validated(builder, arguments):
+    validated = plotly.io.to_json(builder(**arguments, validate = True), validate = False)
+    raw = plotly.io.to_json(builder(**arguments, validate = False), validate = False)
+    assert raw == validated
@@ -0,0 +1,15 @@
+"""
+tools/__init__.py
+=================
+
+Developer tools for measuring the performance of the CDIAC at AppState Dashboard: figure build
+benchmarks, payload size checks and load generation.  None of these modules are imported by the
+application itself.
+
+Every tool is run as a module from the repository root (the data files are loaded with paths
+relative to it), for example:
+
+>>> python -m tools.benchmark_figures
+
+This Dash application was created using the template provided by the Research Institute for Environment, Energy, and Economics at Appalachian State University.
+"""
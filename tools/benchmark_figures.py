@@ -0,0 +1,214 @@
+"""
+Benchmarks every figure builder (and the data browser table) over the representative argument
+grids in `tools.views`, reporting build time percentiles, serialized JSON size and peak memory,
+and optionally saving or comparing against a baseline.
+
+Usage
+-----
+From the repository root:
+
+>>> python -m tools.benchmark_figures
+>>> python -m tools.benchmark_figures --views source-sunburst type-ternary --repeat 5
+>>> python -m tools.benchmark_figures --save-baseline tools/baselines/figures.json
+>>> python -m tools.benchmark_figures --compare tools/baselines/figures.json
+
+Functions
+---------
+measure_case(builder, arguments, repeat) -> dict
+    Builds one case `repeat` times and measures it.
+
+summarize(results) -> dict
+    Aggregates per-case measurements into per-view statistics.
+
+compare(summary, baseline, tolerance) -> list of str
+    Lists the views that regressed against a saved baseline.
+
+Notes
+-----
+- Build time is wall-clock time of the builder call alone; serialization is measured separately
+  as JSON size.  p50/p95 are taken over every build of every argument set of a view.
+- Peak memory is the peak of Python allocations (tracemalloc) during one extra, untimed build
+  of each case, since tracing slows the builders down.
+- Timings depend on the machine, so only compare baselines saved on the same machine.  JSON sizes
+  are machine independent.
+- The exit status is 1 when `--compare` finds a regression, so the benchmark can gate a release.
+"""
+
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tracemalloc
+from tools import views as v
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a list of numbers
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def measure_case(builder, arguments, repeat):
+    """
+    Builds one case and measures it.
+
+    Parameters
+    ----------
+    builder : callable
+        The figure (or table) builder.
+    arguments : dict
+        Keyword arguments for the builder.
+    repeat : int
+        Number of timed builds.
+
+    Returns
+    -------
+    dict
+        Build times in seconds, serialized JSON bytes and peak traced memory in bytes.
+    """
+    # One traced build for memory and size (also warms up any lazy imports)
+    tracemalloc.start()
+    result = builder(**arguments)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    json_bytes = len(v.serialize(result).encode('utf-8'))
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        builder(**arguments)
+        times.append(time.perf_counter() - start)
+
+    return {'times': times, 'json_bytes': json_bytes, 'peak_memory_bytes': peak}
+
+
+def summarize(results):
+    """
+    Aggregates case measurements into per-view statistics.
+
+    Parameters
+    ----------
+    results : list of dict
+        One entry per case with 'view', 'arguments' and the output of `measure_case`.
+
+    Returns
+    -------
+    dict
+        Per view: p50/p95 build seconds, median and max JSON bytes, max peak memory bytes and
+        the number of cases.
+    """
+    summary = {}
+    for name in dict.fromkeys(result['view'] for result in results):
+        cases = [result for result in results if result['view'] == name]
+        times = [t for case in cases for t in case['times']]
+        sizes = [case['json_bytes'] for case in cases]
+        summary[name] = {
+            'cases': len(cases),
+            'p50_seconds': percentile(times, 0.50),
+            'p95_seconds': percentile(times, 0.95),
+            'median_json_bytes': statistics.median(sizes),
+            'max_json_bytes': max(sizes),
+            'max_peak_memory_bytes': max(case['peak_memory_bytes'] for case in cases),
+        }
+    return summary
+
+
+def compare(summary, baseline, tolerance):
+    """
+    Lists the views that got slower or larger than the baseline.
+
+    Parameters
+    ----------
+    summary : dict
+        The output of `summarize` for this run.
+    baseline : dict
+        A saved benchmark (the 'summary' of a previous run).
+    tolerance : float
+        Allowed relative increase (0.2 means 20%).
+
+    Returns
+    -------
+    list of str
+        One message per regression; empty when nothing regressed.
+    """
+    regressions = []
+    for name, stats in summary.items():
+        if name not in baseline:
+            continue
+        for key in ['p50_seconds', 'p95_seconds', 'max_json_bytes', 'max_peak_memory_bytes']:
+            before = baseline[name][key]
+            after = stats[key]
+            if before and after > before * (1 + tolerance):
+                regressions.append(
+                    "%s %s: %.4g -> %.4g (+%.0f%%)" % (name, key, before, after, 100 * (after / before - 1))
+                )
+    return regressions
+
+
+def print_summary(summary, baseline=None):
+    print("%-34s %5s %9s %9s %12s %12s %12s" % ("view", "cases", "p50 s", "p95 s", "median JSON", "max JSON", "peak mem"))
+    for name, stats in summary.items():
+        line = "%-34s %5d %9.3f %9.3f %12d %12d %12d" % (
+            name, stats['cases'], stats['p50_seconds'], stats['p95_seconds'],
+            stats['median_json_bytes'], stats['max_json_bytes'], stats['max_peak_memory_bytes'],
+        )
+        if baseline and name in baseline:
+            line += "   (p50 %+.0f%%, JSON %+.0f%%)" % (
+                100 * (stats['p50_seconds'] / baseline[name]['p50_seconds'] - 1),
+                100 * (stats['max_json_bytes'] / baseline[name]['max_json_bytes'] - 1),
+            )
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's figure builders.")
+    parser.add_argument('--views', nargs='*', help="Only benchmark these views (default: all).")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed builds per argument set.")
+    parser.add_argument('--quick', action='store_true', help="Only the first argument set of each view.")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Save the results as a baseline.")
+    parser.add_argument('--compare', metavar='PATH', help="Compare against a saved baseline.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative regression (default 0.2).")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, builder, arguments in v.cases(args.views, args.quick):
+        measured = measure_case(builder, arguments, args.repeat)
+        results.append(dict(view = name, arguments = arguments, **measured))
+        print("%-34s %7.3f s  %9d B  %s" % (name, statistics.median(measured['times']), measured['json_bytes'], json.dumps(arguments)), file=sys.stderr)
+
+    summary = summarize(results)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['summary']
+
+    print_summary(summary, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as file:
+            json.dump({
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'python': platform.python_version(),
+                'machine': platform.node(),
+                'repeat': args.repeat,
+                'summary': summary,
+                'cases': results,
+            }, file, indent=1)
+
+    if baseline is not None:
+        regressions = compare(summary, baseline, args.tolerance)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
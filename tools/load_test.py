@@ -0,0 +1,549 @@
+"""
+Generates load against the dashboard the way a classroom of browsers would, and reports
+throughput and latency percentiles per callback.
+
+The tool starts the application under gunicorn in LOCAL_DEVELOPMENT mode (or targets a
+server that is already running), then runs a number of concurrent simulated users.  Each user
+loads the page (index, static bundles, `_dash-layout`, `_dash-dependencies` and the initial
+callback cascade, including `authorize`) and then replays a session of realistic interactions:
+navigation changes, fuel type changes and theme toggles, with think time in between.
+
+Usage
+-----
+From the repository root:
+
+>>> python -m tools.load_test --users 100 --workers 4
+>>> python -m tools.load_test --users 50 --workers 2 --threads 8 --duration 120
+>>> python -m tools.load_test --url http://127.0.0.1:8050/ --users 20
+
+Classes
+-------
+Session
+    A minimal stand-in for the Dash renderer: it tracks component properties, fires the server
+    callbacks whose inputs change (following chained outputs and newly inserted layout, as the
+    renderer does), and records the latency of every request.
+
+Functions
+---------
+start_server(workers, threads, port, extra) -> subprocess.Popen
+    Starts the application under gunicorn in LOCAL_DEVELOPMENT mode.
+
+run_user(base_url, user, args, recorder)
+    Runs the sessions of one simulated user.
+
+Notes
+-----
+- Callbacks are discovered from `_dash-dependencies`, so the tool follows changes to the
+  callback graph without edits.  Clientside callbacks run in Python stand-ins (`clientside`)
+  when they make requests or feed server callbacks, and are skipped otherwise.
+- Each user keeps an HTTP cache of ETags across its page loads, so figures it has seen are
+  revalidated (reported as `GET figure [...] 304`) like a browser would.
+- Background callbacks are polled until their result arrives; their polls and the time until
+  the result are reported separately from the request that started them.
+- LOCAL_DEVELOPMENT mode is selected by leaving `REDIS_URL` out of the server's environment, so
+  `authorize` does not need Shibboleth.  A `rieee.conf` is still needed to start the app.
+- The load generator is itself Python; for very high user counts run several copies on
+  different machines and add up the results.
+"""
+
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import urllib.parse
+import urllib.error
+import urllib.request
+from tools.benchmark_figures import percentile
+from components.utils.metrics import callback_labels
+
+# Navigation options a student visits after landing on the carbon atlas
+session_navs = [
+    'political-geography-time-series',
+    'political-geography-sunburst',
+    'source-sunburst',
+    'type-ternary',
+    'source-ternary',
+    'carbon-atlas',
+]
+
+
+class Recorder:
+    """
+    Thread-safe collection of (label, seconds, ok) request samples.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []
+
+    def add(self, label, seconds, ok):
+        with self.lock:
+            self.samples.append((label, seconds, ok))
+
+
+def walk_layout(node, parent, found):
+    # Collect the id-bearing components of a layout: id -> (parent id, props)
+    if isinstance(node, list):
+        for child in node:
+            walk_layout(child, parent, found)
+    elif isinstance(node, dict) and 'props' in node:
+        props = node['props']
+        own_id = props.get('id', parent)
+        if 'id' in props and isinstance(props['id'], str):
+            found[props['id']] = (parent, {key: value for key, value in props.items() if key != 'children'})
+        walk_layout(props.get('children'), own_id, found)
+
+
+class Session:
+    """
+    One simulated browser tab.
+
+    Parameters
+    ----------
+    base_url : str
+        The application's url (including its url prefix), ending in '/'.
+    recorder : Recorder
+        Where request latencies are recorded.
+    http_cache : dict
+        ETags of the responses the browser has cached (path -> ETag), kept across page loads.
+    """
+
+    def __init__(self, base_url, recorder, http_cache):
+        self.base_url = base_url
+        self.prefix = urllib.parse.urlparse(base_url).path
+        self.recorder = recorder
+        self.http_cache = http_cache
+        self.response_headers = {}
+        self.props = {}
+        self.parents = {}
+        self.dependencies = []
+
+    def request(self, label, path, body=None, headers=None):
+        data = None if body is None else json.dumps(body).encode('utf-8')
+        request = urllib.request.Request(
+            self.base_url + path, data = data,
+            headers = dict({'Content-Type': 'application/json'} if data else {}, **(headers or {}))
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=300) as response:
+                payload = response.read()
+                status = response.status
+                self.response_headers = dict(response.headers)
+        except urllib.error.HTTPError as error:
+            # Includes 304 Not Modified
+            payload, status = b'', error.code
+            self.response_headers = dict(error.headers)
+        except (urllib.error.URLError, OSError):
+            payload, status = b'', 0
+            self.response_headers = {}
+        if label is not None:
+            self.recorder.add(label, time.perf_counter() - start, status in [200, 204, 304])
+        return status, payload
+
+    # Layout bookkeeping ---------------------------------------------
+
+    def insert(self, node, parent):
+        found = {}
+        walk_layout(node, parent, found)
+        for component_id, (component_parent, props) in found.items():
+            self.parents[component_id] = component_parent
+            for prop, value in props.items():
+                self.props[(component_id, prop)] = value
+        return set(found)
+
+    def remove_children_of(self, component_id):
+        def inside(other):
+            while other is not None:
+                other = self.parents.get(other)
+                if other == component_id:
+                    return True
+            return False
+        for other in [other for other in self.parents if inside(other)]:
+            del self.parents[other]
+            for key in [key for key in self.props if key[0] == other]:
+                del self.props[key]
+
+    def present(self, component_id):
+        return component_id in self.parents
+
+    # Callback firing ------------------------------------------------
+
+    def can_fire(self, dependency):
+        return (
+            all(self.present(item['id']) for item in dependency['inputs'])
+            and any(self.present(output_id) for output_id, _ in dependency['outputs'])
+        )
+
+    def triggered_by(self, changed):
+        # Server callbacks with an input among the changed properties
+        return [
+            dependency for dependency in self.dependencies
+            if any((item['id'], item['property']) in changed for item in dependency['inputs'])
+        ]
+
+    def initial_for(self, new_ids):
+        # Callbacks fired because their inputs or outputs were just inserted
+        return [
+            dependency for dependency in self.dependencies
+            if not dependency['prevent_initial_call']
+            and (any(item['id'] in new_ids for item in dependency['inputs'])
+                 or any(output_id in new_ids for output_id, _ in dependency['outputs']))
+        ]
+
+    def fire(self, dependency, changed):
+        def values(items):
+            return [
+                dict(id = item['id'], property = item['property'], value = self.props.get((item['id'], item['property'])))
+                for item in items
+            ]
+
+        if 'emulate' in dependency:
+            result = dependency['emulate'](self, *[item['value'] for item in values(dependency['inputs'] + dependency['state'])])
+            if result is no_update:
+                return set(), set()
+            results = result if dependency['multi'] else [result]
+            return self.apply({
+                output_id: {prop: value} for (output_id, prop), value in zip(dependency['outputs'], results)
+            })
+
+        outputs = [dict(id = output_id, property = prop) for output_id, prop in dependency['outputs']]
+        body = {
+            'output': dependency['output'],
+            'outputs': outputs if dependency['multi'] else outputs[0],
+            'inputs': values(dependency['inputs']),
+            'changedPropIds': [
+                item['id'] + '.' + item['property'] for item in dependency['inputs']
+                if (item['id'], item['property']) in changed
+            ],
+            'state': values(dependency['state']),
+        }
+        callback, nav = callback_labels(body)
+        # Long multi-output names are shortened so the navigation option stays visible
+        label = (callback if len(callback) <= 40 else callback[:37] + "...") + (" [" + nav + "]" if nav else "")
+
+        start = time.perf_counter()
+        status, payload = self.request(label, '_dash-update-component', body)
+        if status != 200:
+            return set(), set()
+        result = json.loads(payload)
+
+        if 'cacheKey' in result:
+            # Background callback: poll for the result like the renderer does
+            query = '?' + urllib.parse.urlencode({'cacheKey': result['cacheKey'], 'job': result['job']})
+            interval = (dependency.get('long') or {}).get('interval', 1000) / 1000
+            while 'response' not in result:
+                time.sleep(interval)
+                status, payload = self.request(label + ' (poll)', '_dash-update-component' + query, body)
+                if status != 200:
+                    return set(), set()
+                result = json.loads(payload)
+            self.recorder.add(label + ' (until result)', time.perf_counter() - start, True)
+
+        return self.apply(result['response'])
+
+    def apply(self, response):
+        changed, new_ids = set(), set()
+        for component_id, props in response.items():
+            for prop, value in props.items():
+                if prop == 'children':
+                    self.remove_children_of(component_id)
+                    new_ids |= self.insert(value, component_id)
+                else:
+                    self.props[(component_id, prop)] = value
+                changed.add((component_id, prop))
+        return changed, new_ids
+
+    def settle(self, pending):
+        # Fire callbacks until the page is quiet, upstream callbacks first (like the renderer)
+        for _ in range(200):
+            pending = [dependency for dependency in pending if self.can_fire(dependency)]
+            if not pending:
+                return
+            pending_outputs = {output for dependency in pending for output in dependency['outputs']}
+            ready = [
+                dependency for dependency in pending
+                if not any((item['id'], item['property']) in pending_outputs for item in dependency['inputs'])
+            ] or pending[:1]
+            later = [dependency for dependency in pending if dependency not in ready]
+            for dependency in ready:
+                changed, new_ids = self.fire(dependency, self.last_changed)
+                self.last_changed = changed
+                # A callback is not re-triggered by its own outputs
+                later += [
+                    other for other in self.triggered_by(changed) + self.initial_for(new_ids)
+                    if other not in later and other is not dependency
+                ]
+            pending = later
+
+    # User actions ---------------------------------------------------
+
+    def load_page(self, static):
+        status, index = self.request('GET index', '')
+        if static and status == 200:
+            for asset in re.findall(r'(?:src|href)="([^"]+\.(?:js|css)[^"]*)"', index.decode('utf-8')):
+                if asset.startswith(self.prefix):
+                    self.request('GET static', asset[len(self.prefix):])
+
+        _, layout = self.request('GET _dash-layout', '_dash-layout')
+        _, dependencies = self.request('GET _dash-dependencies', '_dash-dependencies')
+
+        self.dependencies = []
+        for dependency in json.loads(dependencies):
+            if dependency.get('clientside_function'):
+                function = dependency['clientside_function']
+                emulate = clientside.get(function['namespace'] + '.' + function['function_name'])
+                if emulate is None:
+                    continue
+                dependency = dict(dependency, emulate = emulate)
+            multi = dependency['output'].startswith('..')
+            outputs = [
+                tuple(output.rsplit('.', 1))
+                for output in (dependency['output'][2:-2].split('...') if multi else [dependency['output']])
+            ]
+            self.dependencies.append(dict(
+                dependency, multi = multi,
+                outputs = [(output_id.split('@')[0], prop) for output_id, prop in outputs],
+                state = dependency.get('state', []),
+                prevent_initial_call = dependency.get('prevent_initial_call', False),
+            ))
+
+        self.props, self.parents = {}, {}
+        new_ids = self.insert(json.loads(layout), None)
+        self.props[('url', 'pathname')] = self.prefix
+        self.last_changed = set()
+        self.settle(self.initial_for(new_ids))
+
+    def set_props(self, changes):
+        changed = set()
+        for component_id, prop, value in changes:
+            self.props[(component_id, prop)] = value
+            changed.add((component_id, prop))
+        self.last_changed = changed
+        self.settle(self.triggered_by(changed))
+
+
+# Stands in for window.dash_clientside.no_update
+no_update = object()
+
+
+def fetch_figure(session, path):
+    # assets/js/figures.js: the browser revalidates figures it has cached
+    if not path:
+        return no_update
+    label = 'GET figure [' + path.split('?')[0].rsplit('/', 1)[-1] + ']'
+    # The browser asks for typed arrays
+    path = path + '&typed=1'
+    etag = session.http_cache.get(path)
+    start = time.perf_counter()
+    status, _ = session.request(None, path, headers = {'If-None-Match': etag} if etag else {})
+    session.recorder.add(label + (' 304' if status == 304 else ''), time.perf_counter() - start, status in [200, 304])
+    if status == 200 and 'ETag' in session.response_headers:
+        session.http_cache[path] = session.response_headers['ETag']
+    # Nothing depends on the figure itself, so it is not parsed
+    return True
+
+
+def apply_theme(session, n_clicks):
+    # assets/js/theme.js: the theme toggle's className feeds server callbacks
+    theme = 'light' if (n_clicks or 0) % 2 == 0 else 'dark'
+    return [theme, None, theme, None, None] + ['dropdown_' + theme] * 7
+
+
+def apply_visibility(session, nav_opt, table):
+    # assets/js/controls.js: the political geography selection feeds server callbacks
+    hidden = [nav_opt not in views for views in table['visible_for']]
+    return hidden + (table['nation_selection'].get(nav_opt) or [False, []])
+
+
+def update_source(session, nav_opt, fuel_type, value, table):
+    # assets/js/controls.js: the source feeds server callbacks
+    sheet = 'totals' if fuel_type == 'totals' else 'fuels'
+    options = table['options'][sheet]['no_stat_difference' if nav_opt in table['no_stat_difference_for'] else 'all']
+    if nav_opt not in table['shown_for']:
+        return [True, options, value]
+    if nav_opt != 'source-time-series' and value == 'Stat Difference (Supplied - Consumed)':
+        return [False, options, 'Fossil Fuel Energy (Supplied)']
+    remap = table['remap']['solids' if nav_opt == 'type-ternary' else sheet]
+    return [False, options, remap.get(value, value)]
+
+
+def settle_state(session, nav_opt, theme, source, fuel_type, nation, source_a, source_b, grouping, table, current):
+    # assets/js/controls.js: the renderer already fires this after the controls it
+    # depends on, so only the "write when something changed" half is needed here
+    state = dict(
+        nav_opt = nav_opt, theme = theme, source = source, fuel_type = fuel_type,
+        nation = nation, source_a = source_a, source_b = source_b, grouping = grouping,
+    )
+    return no_update if state == current else state
+
+
+# Python stand-ins for the clientside callbacks that make requests or feed server
+# callbacks, keyed by "namespace.function_name"
+clientside = {
+    'figures.fetch_figure': fetch_figure,
+    'theme.apply_theme': apply_theme,
+    'controls.apply_visibility': apply_visibility,
+    'controls.update_source': update_source,
+    'controls.settle_state': settle_state,
+}
+
+
+def run_user(base_url, user, args, recorder):
+    """
+    Runs the sessions of one simulated user until the duration or session count is reached.
+    """
+    rng = random.Random(args.seed + user)
+    deadline = time.monotonic() + args.duration
+    sessions = 0
+    http_cache = {}
+
+    # Spread the class's arrivals over the ramp-up period
+    time.sleep(rng.uniform(0, args.ramp_up))
+
+    while time.monotonic() < deadline and (args.sessions is None or sessions < args.sessions):
+        session = Session(base_url, recorder, http_cache)
+
+        start = time.perf_counter()
+        session.load_page(not args.no_static)
+        recorder.add('ACTION page load', time.perf_counter() - start, True)
+
+        navs = list(session_navs)
+        rng.shuffle(navs)
+        clicks = 0
+
+        for nav in navs:
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(rng.uniform(0, 2 * args.think))
+
+            start = time.perf_counter()
+            session.set_props([('navigation-dropdown-controler', 'value', nav)])
+            recorder.add('ACTION nav ' + nav, time.perf_counter() - start, True)
+
+            roll = rng.random()
+            if roll < 0.3:
+                time.sleep(rng.uniform(0, 2 * args.think))
+                start = time.perf_counter()
+                session.set_props([('fuel-type-dropdown-controler', 'value', rng.choice(['solids', 'liquids', 'gases']))])
+                recorder.add('ACTION fuel type', time.perf_counter() - start, True)
+            elif roll < 0.4:
+                time.sleep(rng.uniform(0, 2 * args.think))
+                clicks += 1
+                start = time.perf_counter()
+                session.set_props([('theme_toggle_switch', 'n_clicks', clicks)])
+                recorder.add('ACTION theme toggle', time.perf_counter() - start, True)
+
+        sessions += 1
+
+
+def start_server(workers, threads, port, extra):
+    """
+    Starts the application under gunicorn in LOCAL_DEVELOPMENT mode and waits until it answers.
+
+    Returns
+    -------
+    subprocess.Popen
+        The gunicorn process.
+    """
+    env = dict(os.environ)
+    # No REDIS_URL -> application.LOCAL_DEVELOPMENT is True
+    env.pop('REDIS_URL', None)
+
+    command = [
+        sys.executable, '-m', 'gunicorn', 'application:server',
+        '--bind', '127.0.0.1:' + str(port),
+        '--workers', str(workers),
+        '--threads', str(threads),
+        # Overrides gunicorn.conf.py, so --threads 1 measures sync workers
+        '--worker-class', 'gthread' if threads > 1 else 'sync',
+        '--timeout', '300',
+    ] + extra
+
+    server = subprocess.Popen(command, env=env)
+
+    for _ in range(300):
+        try:
+            urllib.request.urlopen('http://127.0.0.1:' + str(port) + '/', timeout=5).read()
+            return server
+        except (urllib.error.URLError, OSError):
+            if server.poll() is not None:
+                raise RuntimeError("gunicorn exited with status " + str(server.returncode))
+            time.sleep(1)
+
+    server.terminate()
+    raise RuntimeError("gunicorn did not start answering requests")
+
+
+def report(recorder, elapsed):
+    samples = recorder.samples
+    requests = [sample for sample in samples if not sample[0].startswith('ACTION')]
+
+    print("\n%d requests in %.1f s: %.1f requests/s, %d failed" % (
+        len(requests), elapsed, len(requests) / elapsed, sum(1 for sample in requests if not sample[2])
+    ))
+
+    print("\n%-64s %6s %6s %8s %8s %8s %8s" % ("request / action", "count", "fail", "p50 s", "p95 s", "p99 s", "max s"))
+    for label in sorted({sample[0] for sample in samples}):
+        times = [sample[1] for sample in samples if sample[0] == label]
+        failed = sum(1 for sample in samples if sample[0] == label and not sample[2])
+        print("%-64s %6d %6d %8.3f %8.3f %8.3f %8.3f" % (
+            label[:64], len(times), failed,
+            percentile(times, 0.50), percentile(times, 0.95), percentile(times, 0.99), max(times)
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the dashboard with simulated users.")
+    parser.add_argument('--url', help="Target a running server instead of starting one (e.g. http://127.0.0.1:8050/).")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers to start.")
+    parser.add_argument('--threads', type=int, default=1, help="gunicorn threads per worker (more than 1 uses gthread).")
+    parser.add_argument('--port', type=int, default=8051, help="Port for the started server.")
+    parser.add_argument('--gunicorn-args', default='', help="Extra arguments for gunicorn, as one string.")
+    parser.add_argument('--users', type=int, default=20, help="Concurrent simulated users.")
+    parser.add_argument('--duration', type=float, default=60, help="Seconds to run.")
+    parser.add_argument('--sessions', type=int, help="Stop each user after this many sessions.")
+    parser.add_argument('--ramp-up', type=float, default=5, help="Seconds over which users arrive.")
+    parser.add_argument('--think', type=float, default=1.0, help="Mean think time between actions, in seconds.")
+    parser.add_argument('--no-static', action='store_true', help="Do not fetch the JavaScript and CSS bundles.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for the sessions.")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = start_server(args.workers, args.threads, args.port, args.gunicorn_args.split())
+        base_url = 'http://127.0.0.1:' + str(args.port) + '/'
+    if not base_url.endswith('/'):
+        base_url += '/'
+
+    recorder = Recorder()
+    users = [
+        threading.Thread(target=run_user, args=(base_url, user, args, recorder), daemon=True)
+        for user in range(args.users)
+    ]
+
+    start = time.perf_counter()
+    try:
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+    finally:
+        elapsed = time.perf_counter() - start
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report(recorder, elapsed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Checks the serialized size of every figure view against a payload budget.
+
+Each view in `tools.views` is built over its argument grid and serialized exactly as it is sent
+to the browser.  The size of the whole payload, of the largest animation frame and of the
+largest trace (in the figure's data or any of its frames) is compared against the budget of
+the view in `tools/payload_budgets.ini`.
+
+Usage
+-----
+From the repository root:
+
+>>> python -m tools.payload_budget
+>>> python -m tools.payload_budget --views carbon-atlas source-sunburst
+>>> python -m tools.payload_budget --budgets tools/payload_budgets.ini --quick
+
+Functions
+---------
+measure_payload(result) -> dict
+    Measures the total, largest frame and largest trace bytes of a builder's result.
+
+check(measured, budget) -> list of str
+    Lists the ways a measured payload exceeds a budget.
+
+Notes
+-----
+- The budget file has one section per view with `total_bytes`, `frame_bytes` and
+  `trace_bytes` keys; a missing key (or view) is not checked.  A `[DEFAULT]` section applies
+  to every view.
+- The exit status is 1 when any view is over budget, so the check can gate a release (e.g.
+  after the annual data update adds a year to every animation).
+- Byte counts are of the UTF-8 JSON text before compression.
+"""
+
+
+import sys
+import json
+import argparse
+import configparser
+from tools import views as v
+
+
+def measure_payload(result):
+    """
+    Measures the serialized size of a builder's result.
+
+    Parameters
+    ----------
+    result : plotly.graph_objects.Figure, dict or dash component
+        What the builder returned.
+
+    Returns
+    -------
+    dict
+        'total_bytes', 'frames', 'frame_bytes' (largest frame) and 'trace_bytes' (largest
+        trace, in the data or in any frame).
+    """
+    text = v.serialize(result)
+    payload = json.loads(text)
+
+    def size(value):
+        return len(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+    # Components (the data browser table) have no traces or frames
+    frames = payload.get('frames', []) if 'data' in payload else []
+    traces = (payload.get('data', []) if 'data' in payload else []) + [
+        trace for frame in frames for trace in frame.get('data', [])
+    ]
+
+    return {
+        'total_bytes': len(text.encode('utf-8')),
+        'frames': len(frames),
+        'frame_bytes': max([size(frame) for frame in frames], default=0),
+        'trace_bytes': max([size(trace) for trace in traces], default=0),
+    }
+
+
+def check(measured, budget):
+    """
+    Compares a measured payload against a budget.
+
+    Parameters
+    ----------
+    measured : dict
+        The output of `measure_payload`.
+    budget : mapping
+        Budgeted bytes keyed like `measured` (missing keys are not checked).
+
+    Returns
+    -------
+    list of str
+        One message per exceeded budget; empty when within budget.
+    """
+    problems = []
+    for key in ['total_bytes', 'frame_bytes', 'trace_bytes']:
+        if key in budget and measured[key] > int(budget[key]):
+            problems.append("%s %d > %d" % (key, measured[key], int(budget[key])))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check figure payload sizes against a budget.")
+    parser.add_argument('--views', nargs='*', help="Only check these views (default: all).")
+    parser.add_argument('--quick', action='store_true', help="Only the first argument set of each view.")
+    parser.add_argument('--budgets', default='tools/payload_budgets.ini', help="The budget file.")
+    args = parser.parse_args(argv)
+
+    budgets = configparser.ConfigParser()
+    if not budgets.read(args.budgets):
+        parser.error("cannot read " + args.budgets)
+
+    print("%-32s %7s %11s %11s %11s  %s" % ("view", "frames", "total B", "frame B", "trace B", "arguments"))
+
+    failures = 0
+    for name, builder, arguments in v.cases(args.views, args.quick):
+        measured = measure_payload(builder(**arguments))
+        budget = budgets[name] if budgets.has_section(name) else budgets.defaults()
+        problems = check(measured, budget)
+
+        print("%-32s %7d %11d %11d %11d  %s" % (
+            name, measured['frames'], measured['total_bytes'], measured['frame_bytes'],
+            measured['trace_bytes'], json.dumps(arguments)
+        ))
+        for problem in problems:
+            print("OVER BUDGET " + name + ": " + problem)
+        failures += bool(problems)
+
+    print("\n%d over budget" % failures)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
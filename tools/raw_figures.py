@@ -0,0 +1,128 @@
+"""
+Benchmarks the figures built as dicts (`components.utils.raw_figure`) against building them
+through validation, and shows where the two differ.
+
+Every view in `raw_figure.supported_views` is built over its argument grid in `tools.views`,
+once through `go.Figure` (validated) and once as a dict.  The parsed JSON of the two must be
+equal; build and serialization times of both are reported per view.
+
+Usage
+-----
+From the repository root:
+
+>>> python -m tools.raw_figures
+>>> python -m tools.raw_figures --views source-sunburst --repeat 5
+>>> python -m tools.raw_figures --quick
+
+Functions
+---------
+differences(validated, raw, path='') -> list of str
+    Lists where two parsed figures differ.
+
+measure_case(builder, arguments, repeat) -> dict
+    Builds and serializes one case both ways and compares them.
+
+Notes
+-----
+- JSON objects are compared without regard to key order; numbers must be equal.
+- The exit status is 1 when any case differs.  tests/test_raw_figures.py asserts the stricter
+  byte-equal JSON on every test run.
+"""
+
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import plotly.io
+from tools import views as v
+from components.utils import raw_figure
+
+
+def differences(validated, raw, path=''):
+    """
+    Lists where two parsed JSON documents differ.
+
+    Returns
+    -------
+    list of str
+        One line per difference, with its path in the document.
+    """
+    if type(validated) is not type(raw):
+        return ["%s: %s != %s" % (path or '/', type(validated).__name__, type(raw).__name__)]
+
+    if isinstance(validated, dict):
+        found = []
+        for key in list(validated) + [key for key in raw if key not in validated]:
+            if key not in raw:
+                found.append("%s/%s: only validated" % (path, key))
+            elif key not in validated:
+                found.append("%s/%s: only raw" % (path, key))
+            else:
+                found += differences(validated[key], raw[key], path + '/' + key)
+        return found
+
+    if isinstance(validated, list):
+        if len(validated) != len(raw):
+            return ["%s: %d items != %d items" % (path, len(validated), len(raw))]
+        found = []
+        for index, (left, right) in enumerate(zip(validated, raw)):
+            found += differences(left, right, "%s[%d]" % (path, index))
+        return found
+
+    return [] if validated == raw else ["%s: %r != %r" % (path, validated, raw)]
+
+
+def measure_case(builder, arguments, repeat):
+    """
+    Builds and serializes one case `repeat` times each way.
+
+    Returns
+    -------
+    dict
+        'validated' and 'raw' lists of build + serialization seconds, and 'differences'.
+    """
+    seconds = {'validated': [], 'raw': []}
+    text = {}
+    for _ in range(repeat):
+        for name, validate in [('validated', True), ('raw', False)]:
+            start = time.perf_counter()
+            text[name] = plotly.io.to_json(builder(**arguments, validate = validate), validate = False)
+            seconds[name].append(time.perf_counter() - start)
+
+    return dict(seconds, differences = differences(json.loads(text['validated']), json.loads(text['raw'])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = __doc__.split('\n\n')[0])
+    parser.add_argument('--views', nargs = '+', choices = raw_figure.supported_views, help = 'views to check (default: all supported)')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'builds per case and path')
+    parser.add_argument('--quick', action = 'store_true', help = 'only the first argument set of each view')
+    args = parser.parse_args(argv)
+
+    failed = 0
+    print("%-30s %6s %12s %12s %8s" % ('view', 'cases', 'validated s', 'raw s', 'speedup'))
+    for name in args.views or raw_figure.supported_views:
+        validated, raw = [], []
+        for _, builder, arguments in v.cases([name], quick = args.quick):
+            result = measure_case(builder, arguments, args.repeat)
+            validated += result['validated']
+            raw += result['raw']
+            if result['differences']:
+                failed += 1
+                print("DIFFERS %s %s" % (name, json.dumps(arguments)))
+                for line in result['differences'][:10]:
+                    print("    " + line)
+
+        validated_median, raw_median = statistics.median(validated), statistics.median(raw)
+        print("%-30s %6d %12.3f %12.3f %7.1fx" % (
+            name, len(validated) // args.repeat, validated_median, raw_median, validated_median / raw_median
+        ))
+
+    print("\n%d case(s) differ" % failed)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
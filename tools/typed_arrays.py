@@ -0,0 +1,159 @@
+"""
+Compares the payload and parse time of every figure view sent as plain JSON and with its
+numeric arrays as base64 typed arrays (`components.utils.typed_arrays`), and checks that the
+typed arrays decode to the plain values.
+
+Sizes are of the JSON text as the figure endpoint sends it, before and after gzip.  Parse
+times are measured in node when it is installed, running the browser's decoder from
+assets/js/figures.js (`JSON.parse` of the plain text against `JSON.parse` and decoding of the
+typed text); without node, Python's `json.loads` is timed instead.
+
+Usage
+-----
+From the repository root:
+
+>>> python -m tools.typed_arrays
+>>> python -m tools.typed_arrays --views type-ternary source-ternary --quick
+
+Functions
+---------
+payloads(result) -> (str, str)
+    The plain and typed JSON of a builder's result.
+
+decoded(value) -> object
+    A parsed typed payload with its typed arrays decoded to lists.
+
+parse_seconds(plain, typed, repeat) -> (float, float, str)
+    Median seconds to parse both payloads, and what parsed them.
+
+Notes
+-----
+- The exit status is 1 when any typed payload does not decode to the plain one.
+"""
+
+
+import sys
+import gzip
+import json
+import time
+import base64
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import numpy as np
+import plotly.io
+from tools import views as v
+from components.utils import precision
+from components.utils import typed_arrays
+
+# Times JSON.parse of the plain payload against JSON.parse and decoding of the typed one
+node_script = """
+const fs = require('fs');
+const window = {atob: (text) => Buffer.from(text, 'base64').toString('latin1')};
+global.window = window;
+global.atob = window.atob;
+eval(fs.readFileSync('assets/js/figures.js', 'utf8'));
+const [plain, typed, repeat] = [fs.readFileSync(process.argv[1], 'utf8'), fs.readFileSync(process.argv[2], 'utf8'), +process.argv[3]];
+function median(parse, text) {
+    const seconds = [];
+    for (let i = 0; i < repeat; i++) {
+        const start = process.hrtime.bigint();
+        parse(text);
+        seconds.push(Number(process.hrtime.bigint() - start) / 1e9);
+    }
+    return seconds.sort((a, b) => a - b)[Math.floor(repeat / 2)];
+}
+console.log(JSON.stringify([median(JSON.parse, plain), median((text) => decodeTypedArrays(JSON.parse(text)), typed)]));
+"""
+
+
+def payloads(result):
+    """
+    Returns the plain and typed JSON of a builder's result, rounded as the figure cache
+    rounds it.
+    """
+    figure = precision.reduce(result)
+    if hasattr(figure, 'to_plotly_json') or isinstance(figure, dict):
+        encoded = typed_arrays.encode(figure)
+    else:
+        # Components (the data browser table) have no traces
+        encoded = figure
+    return plotly.io.to_json(figure, validate=False), plotly.io.to_json(encoded, validate=False)
+
+
+def decoded(value):
+    """
+    Returns a parsed typed payload with its typed arrays decoded to lists.
+    """
+    if isinstance(value, dict):
+        if set(value) == {'dtype', 'bdata'}:
+            return np.frombuffer(base64.b64decode(value['bdata']), dtype='<' + value['dtype']).tolist()
+        return {key: decoded(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decoded(item) for item in value]
+    return value
+
+
+def parse_seconds(plain, typed, repeat):
+    """
+    Returns the median seconds to parse the plain and the typed payload, and what parsed them.
+    """
+    if shutil.which('node'):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as plain_file, \
+                tempfile.NamedTemporaryFile('w', suffix='.json') as typed_file:
+            plain_file.write(plain)
+            typed_file.write(typed)
+            plain_file.flush()
+            typed_file.flush()
+            output = subprocess.run(
+                ['node', '-e', node_script, '--', plain_file.name, typed_file.name, str(repeat)],
+                capture_output=True, text=True, check=True
+            ).stdout
+        plain_seconds, typed_seconds = json.loads(output)
+        return plain_seconds, typed_seconds, 'node'
+
+    def median(text):
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            json.loads(text)
+            seconds.append(time.perf_counter() - start)
+        return statistics.median(seconds)
+
+    return median(plain), median(typed), 'python'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare plain and typed array figure payloads.")
+    parser.add_argument('--views', nargs='*', help="Only compare these views (default: all).")
+    parser.add_argument('--quick', action='store_true', help="Only the first argument set of each view.")
+    parser.add_argument('--repeat', type=int, default=9, help="Parses timed per payload.")
+    args = parser.parse_args(argv)
+
+    print("%-32s %10s %10s %9s %9s %9s %9s" % (
+        "view", "plain B", "typed B", "plain gz", "typed gz", "plain ms", "typed ms"
+    ))
+
+    failures = 0
+    parser_name = None
+    for name, builder, arguments in v.cases(args.views, args.quick):
+        plain, typed = payloads(builder(**arguments))
+        if decoded(json.loads(typed)) != json.loads(plain):
+            failures += 1
+            print("DIFFERS " + name + " " + json.dumps(arguments))
+        plain_seconds, typed_seconds, parser_name = parse_seconds(plain, typed, args.repeat)
+
+        print("%-32s %10d %10d %9d %9d %9.2f %9.2f" % (
+            name, len(plain.encode('utf-8')), len(typed.encode('utf-8')),
+            len(gzip.compress(plain.encode('utf-8'))), len(gzip.compress(typed.encode('utf-8'))),
+            plain_seconds * 1000, typed_seconds * 1000
+        ))
+
+    print("\nparsed with %s; %d payload(s) differ" % (parser_name, failures))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
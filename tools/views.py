@@ -0,0 +1,147 @@
+"""
+Defines the figure views exercised by the performance tools, and the representative argument
+grids each view is built with.
+
+Attributes
+----------
+views : dict
+    Maps each navigation option (plus "table" for the data browser) to a pair of the builder
+    function and the list of keyword argument sets it is built with.
+
+Functions
+---------
+cases(names=None, quick=False) -> list of (str, callable, dict)
+    Flattens `views` into (view name, builder, keyword arguments) cases.
+
+serialize(result) -> str
+    Serializes a builder's result to the JSON that is sent to the browser.
+
+Notes
+-----
+The grids cover every fuel type and theme, every ternary grouping, and a spread of political
+geographies (the world, regional aggregates, large and small emitters) so that the numbers are
+representative of real use without building every possible combination.
+"""
+
+
+import json
+import itertools
+import plotly.io
+import plotly.utils
+from components.utils import precision
+from components.figures.carbon_atlas import carbon_atlas
+from components.figures.country_sunburst import country_sunburst
+from components.figures.source_sunburst import source_sunburst
+from components.figures.country_timeseries import country_timeseries
+from components.figures.source_timeseries import source_timeseries
+from components.figures.type_ternary import type_ternary
+from components.figures.source_ternary import source_ternary
+from components.tables.browse import parse_contents
+
+fuel_types = ['totals', 'solids', 'liquids', 'gases']
+
+themes = ['light', 'dark']
+
+groupings = ['individual', 'region', 'annex', 'world']
+
+nations = ['WORLD', 'ASIA PACIFIC', 'UNITED STATES OF AMERICA', 'CHINA (MAINLAND)', 'INDIA', 'GERMANY', 'BRAZIL', 'ICELAND']
+
+# The headline source of each fuel type sheet
+primary_source = {
+    'totals': 'Fossil Fuel Energy and Cement Manufacture',
+    'solids': 'Fossil Fuel Energy (Supplied)',
+    'liquids': 'Fossil Fuel Energy (Supplied)',
+    'gases': 'Fossil Fuel Energy (Supplied)',
+}
+
+
+def grid(**axes):
+    # Every combination of the given argument values
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+views = {
+
+    'carbon-atlas': (carbon_atlas, [
+        dict(source = primary_source[fuel_type], fuel_type = fuel_type, theme = theme)
+        for fuel_type in fuel_types for theme in themes
+    ] + grid(source = ['Road Transport', 'Per Capita Total Emissions'], fuel_type = ['totals'], theme = ['light'])),
+
+    'political-geography-sunburst': (country_sunburst,
+        grid(nation = nations, fuel_type = fuel_types, theme = ['light'])
+        + grid(nation = ['WORLD'], fuel_type = ['totals'], theme = ['dark'])),
+
+    'source-sunburst': (source_sunburst, [
+        dict(source = primary_source[fuel_type], fuel_type = fuel_type, theme = theme)
+        for fuel_type in fuel_types for theme in themes
+    ] + grid(source = ['Electric, CHP, Heat Plants', 'Household'], fuel_type = ['totals'], theme = ['light'])),
+
+    'political-geography-time-series': (country_timeseries,
+        grid(fuel_type = fuel_types, political_geography = nations, theme = ['light'])
+        + grid(fuel_type = ['totals'], political_geography = ['WORLD'], theme = ['dark'])),
+
+    'source-time-series': (source_timeseries, [
+        dict(source = primary_source[fuel_type], fuel_type = fuel_type, nation = nation_list, theme = theme)
+        for fuel_type in fuel_types
+        for nation_list in [['WORLD'], nations]
+        for theme in themes
+    ]),
+
+    'type-ternary': (type_ternary,
+        grid(source = ['Fossil Fuel Energy (Supplied)', 'Electric, CHP, Heat Plants'], grouping = groupings, theme = ['light'])
+        + grid(source = ['Fossil Fuel Energy (Supplied)'], grouping = ['individual'], theme = ['dark'])),
+
+    'source-ternary': (source_ternary,
+        grid(source_a = ['Electric, CHP, Heat Plants'], source_b = ['Road Transport'], fuel_type = fuel_types, grouping = groupings, theme = ['light'])
+        + grid(source_a = ['Household'], source_b = ['Transport'], fuel_type = ['totals'], grouping = ['individual'], theme = ['dark'])),
+
+    'table': (parse_contents, grid(theme = themes, fuel_type = fuel_types)),
+
+}
+
+
+def cases(names=None, quick=False):
+    """
+    Flattens the view grids into individual build cases.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        Only include these views (default: every view).
+    quick : bool
+        Only include the first argument set of each view.
+
+    Returns
+    -------
+    list of (str, callable, dict)
+        The view name, its builder and the keyword arguments of each case.
+    """
+    result = []
+    for name, (builder, argument_sets) in views.items():
+        if names and name not in names:
+            continue
+        for arguments in (argument_sets[:1] if quick else argument_sets):
+            result.append((name, builder, arguments))
+    return result
+
+
+def serialize(result):
+    """
+    Serializes a builder result exactly as it would be sent to the browser (figures rounded
+    by `components.utils.precision`, as the figure cache does).
+
+    Parameters
+    ----------
+    result : plotly.graph_objects.Figure, dict or dash component
+        What the builder returned.
+
+    Returns
+    -------
+    str
+        The JSON text.
+    """
+    if hasattr(result, 'to_plotly_json') and not hasattr(result, 'to_json'):
+        # Dash components (e.g. the data browser table)
+        return json.dumps(result, cls=plotly.utils.PlotlyJSONEncoder)
+    return plotly.io.to_json(precision.reduce(result), validate=False)
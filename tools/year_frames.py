@@ -0,0 +1,121 @@
+"""
+Benchmarks building the per-year animation frames of the sunbursts serially, on threads and on
+the process pool (`components.utils.year_frames`), as the number of years grows, and checks
+that every mode gives the same frames in the same order.
+
+Each annual release adds a year to every animation, so the frame count (and the time to
+build the frames) grows with the dataset.  The benchmark builds the frames of the last 5, 10,
+... years of the data in each mode and reports the median wall-clock time.
+
+Usage
+-----
+From the repository root:
+
+>>> python -m tools.year_frames
+>>> python -m tools.year_frames --modes serial thread --repeat 5
+>>> python -m tools.year_frames --threads 8 --processes 4
+
+Functions
+---------
+frame_builders() -> dict
+    The frame function of each animated view, with representative arguments.
+
+measure(build_frame, years, mode, repeat) -> (float, str)
+    Times building the frames of `years` in one mode, and returns their JSON.
+
+Notes
+-----
+- The process pool is started (and its processes loaded with the data) before timing.
+- Timings depend on the machine, above all on its number of cores.
+- The exit status is 1 when any mode gives different frames than the serial build.
+"""
+
+
+import os
+import sys
+import time
+import argparse
+import functools
+import statistics
+import plotly.io
+from components.utils import themes
+from components.utils import year_frames
+from components.utils import process_pool
+from components.figures import country_sunburst
+from components.figures import source_sunburst
+
+# The years of the data, as animated by the sunbursts
+all_years = list(range(1995, 2021))
+
+
+def frame_builders():
+    """
+    Returns the frame function of each animated view, with representative arguments.
+    """
+    colors = dict(bg = themes.background['light'], textCol = themes.text_color['light'])
+    return {
+        'political-geography-sunburst': functools.partial(
+            country_sunburst.country_frame, nation = 'WORLD', fuel_type = 'totals', **colors
+        ),
+        'source-sunburst': functools.partial(
+            source_sunburst.source_frame, source = 'Fossil Fuel Energy (Supplied)', fuel_type = 'totals', theme = 'light'
+        ),
+    }
+
+
+def measure(build_frame, years, mode, repeat):
+    """
+    Builds the frames of `years` `repeat` times in one mode.
+
+    Returns
+    -------
+    (float, str)
+        The median seconds, and the JSON of the frames.
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frames = year_frames.map_years(build_frame, years, mode = mode)
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), plotly.io.json.to_json_plotly(frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = __doc__.split('\n\n')[0])
+    parser.add_argument('--modes', nargs = '+', choices = ['serial', 'thread', 'process'], default = ['serial', 'thread', 'process'])
+    parser.add_argument('--repeat', type = int, default = 3, help = 'builds per view, year count and mode')
+    parser.add_argument('--threads', type = int, default = year_frames.threads, help = 'threads of the frame pool')
+    parser.add_argument('--processes', type = int, default = process_pool.processes, help = 'processes of the process pool')
+    args = parser.parse_args(argv)
+
+    year_frames.threads = args.threads
+    process_pool.processes = args.processes
+
+    builders = frame_builders()
+    if 'process' in args.modes:
+        # Start the pool (and load the data in it) before timing
+        year_frames.map_years(builders['source-sunburst'], all_years[-1:], mode = 'process')
+
+    print("%d cores, %d threads, %d processes\n" % (os.cpu_count(), args.threads, args.processes))
+    print("%-30s %6s " % ('view', 'years') + " ".join("%10s" % (mode + ' s') for mode in args.modes))
+
+    failed = 0
+    for name, build_frame in builders.items():
+        for count in list(range(5, len(all_years), 5)) + [len(all_years)]:
+            years = all_years[-count:]
+            serial_json = plotly.io.json.to_json_plotly(year_frames.map_years(build_frame, years, mode = 'serial'))
+            medians = []
+            for mode in args.modes:
+                median, frames_json = measure(build_frame, years, mode, args.repeat)
+                medians.append(median)
+                if frames_json != serial_json:
+                    failed += 1
+                    print("DIFFERS %s %d years %s" % (name, count, mode))
+            print("%-30s %6d " % (name, count) + " ".join("%10.3f" % median for median in medians))
+
+    print("\n%d mode(s) differ" % failed)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())